@@ -1,8 +1,63 @@
 # backend_proj/accounts/auth_utils.py
+import copy
+import threading
+import time
+from collections import OrderedDict
+
 import jwt
 from django.conf import settings
 from accounts.models import user_cred
 
+
+class TokenUserCache:
+    """Bounded LRU of token -> user, each entry living at most `ttl` seconds"""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # token -> (user, expires_at)
+        self._lock = threading.Lock()
+
+    def get(self, token):
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            user, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+        # Hand out a copy so one request can't mutate another's user
+        return copy.copy(user)
+
+    def set(self, token, user, token_exp=None):
+        expires_at = time.time() + self.ttl
+        if token_exp is not None:
+            expires_at = min(expires_at, token_exp)
+        with self._lock:
+            self._entries[token] = (copy.copy(user), expires_at)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def evict_user(self, user_id):
+        with self._lock:
+            stale = [t for t, (user, _) in self._entries.items() if user.id == user_id]
+            for token in stale:
+                del self._entries[token]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+token_cache = TokenUserCache(
+    maxsize=getattr(settings, 'JWT_USER_CACHE_SIZE', 1024),
+    ttl=getattr(settings, 'JWT_USER_CACHE_TTL', 60),
+)
+
+
 def get_token_from_request(request):
     auth = request.META.get('HTTP_AUTHORIZATION') or request.headers.get('Authorization')
     if not auth:
@@ -11,18 +66,71 @@ def get_token_from_request(request):
         return auth.split(' ', 1)[1].strip()
     return auth.strip()
 
-def get_user_from_token(request):
-    token = get_token_from_request(request)
-    if not token:
-        return None
-    try:
-        payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=['HS256'])  # ✅ fixed
-    except Exception:
-        return None
+
+def resolve_token_user(token):
+    """
+    Decode `token` and load its user, going through the shared cache.
+
+    Raises jwt.InvalidTokenError (incl. ExpiredSignatureError), KeyError for a
+    payload without user_id, or user_cred.DoesNotExist.
+    """
+    user = token_cache.get(token)
+    if user is not None:
+        return user
+    payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=['HS256'])
     user_id = payload.get('user_id')
     if not user_id:
-        return None
-    try:
-        return user_cred.objects.get(id=user_id)  # ✅ custom user model
-    except user_cred.DoesNotExist:
-        return None
+        raise KeyError('user_id')
+    user = user_cred.objects.get(id=user_id)
+    token_cache.set(token, user, payload.get('exp'))
+    return user
+
+
+async def aresolve_token_user(token):
+    """Async twin of resolve_token_user (cache first, then ``aget``)"""
+    user = token_cache.get(token)
+    if user is not None:
+        return user
+    payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=['HS256'])
+    user_id = payload.get('user_id')
+    if not user_id:
+        raise KeyError('user_id')
+    user = await user_cred.objects.aget(id=user_id)
+    token_cache.set(token, user, payload.get('exp'))
+    return user
+
+
+def remember_request_user(request, user):
+    # Stored on the Django HttpRequest so DRF's Request wrapper sees it too
+    getattr(request, '_request', request)._jwt_user = user
+
+
+def get_user_from_token(request):
+    http_request = getattr(request, '_request', request)
+    if hasattr(http_request, '_jwt_user'):
+        return http_request._jwt_user
+
+    user = None
+    token = get_token_from_request(request)
+    if token:
+        try:
+            user = resolve_token_user(token)
+        except Exception:
+            user = None
+    remember_request_user(request, user)
+    return user
+
+
+async def aget_user_from_token(request):
+    if hasattr(request, '_jwt_user'):
+        return request._jwt_user
+
+    user = None
+    token = get_token_from_request(request)
+    if token:
+        try:
+            user = await aresolve_token_user(token)
+        except Exception:
+            user = None
+    remember_request_user(request, user)
+    return user
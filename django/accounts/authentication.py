@@ -1,37 +1,68 @@
 # accounts/authentication.py
 import jwt
-from django.conf import settings
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
+from accounts.auth_utils import aresolve_token_user, remember_request_user, resolve_token_user
 from accounts.models import user_cred  # ✅ use your custom model
 
+# Checked in order: ExpiredSignatureError is an InvalidTokenError
+TOKEN_ERRORS = (
+    (jwt.ExpiredSignatureError, "Token has expired"),
+    (jwt.InvalidTokenError, "Invalid token"),
+    (KeyError, "Invalid token payload"),
+    (user_cred.DoesNotExist, "User not found"),
+)
+_TOKEN_EXCEPTIONS = tuple(exc for exc, _ in TOKEN_ERRORS)
+
+
+def token_error_detail(exc):
+    return next(detail for cls, detail in TOKEN_ERRORS if isinstance(exc, cls))
+
+
+def bearer_token(request):
+    auth_header = request.headers.get("Authorization")
+    if not auth_header or not auth_header.startswith("Bearer "):
+        return None
+    return auth_header.split(" ")[1]
+
+
 class JWTAuthentication(BaseAuthentication):
     def authenticate(self, request):
-        auth_header = request.headers.get("Authorization")
-
-        if not auth_header or not auth_header.startswith("Bearer "):
+        token = bearer_token(request)
+        if token is None:
             return None  # No auth, DRF will try the next class
 
-        token = auth_header.split(" ")[1]
-
-        try:
-            payload = jwt.decode(
-                token,
-                settings.JWT_SECRET_KEY,   # ✅ consistent key
-                algorithms=["HS256"]
-            )
-        except jwt.ExpiredSignatureError:
-            raise AuthenticationFailed("Token has expired")
-        except jwt.InvalidTokenError:
-            raise AuthenticationFailed("Invalid token")
-
-        user_id = payload.get("user_id")
-        if not user_id:
-            raise AuthenticationFailed("Invalid token payload")
+        # Already resolved for this request (e.g. a batch item sharing its batch's user)
+        user = getattr(request._request, '_jwt_user', None)
+        if user is not None:
+            return (user, None)
 
         try:
-            user = user_cred.objects.get(id=user_id)  # ✅ use custom user table
-        except user_cred.DoesNotExist:
-            raise AuthenticationFailed("User not found")
+            user = resolve_token_user(token)  # ✅ cached decode + user lookup
+        except _TOKEN_EXCEPTIONS as exc:
+            raise AuthenticationFailed(token_error_detail(exc))
 
+        # Core views call get_user_from_token() again; let them reuse this
+        remember_request_user(request, user)
         return (user, None)
+
+
+async def aauthenticate(request):
+    """
+    JWTAuthentication for plain async views: ``(user, error detail)``.
+
+    No Bearer header gives ``(None, None)``; a bad token gives the message
+    DRF would have rejected it with.
+    """
+    token = bearer_token(request)
+    if token is None:
+        return None, None
+    user = getattr(request, '_jwt_user', None)
+    if user is not None:
+        return user, None
+    try:
+        user = await aresolve_token_user(token)
+    except _TOKEN_EXCEPTIONS as exc:
+        return None, token_error_detail(exc)
+    remember_request_user(request, user)
+    return user, None
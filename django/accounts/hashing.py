@@ -0,0 +1,82 @@
+# accounts/hashing.py
+"""Bounded pool for password hashing.
+
+PBKDF2 is deliberately slow (~0.5s per hash), so running it inline lets a
+burst of logins tie up every request worker. Hashes run on a small thread
+pool instead (hashlib releases the GIL, so threads hash in parallel), and
+once ``PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE`` hashes are in flight new
+ones fail fast with ``HashingBusy`` rather than queueing without limit.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class HashingBusy(Exception):
+    """Raised when the pool is full; callers should answer 503"""
+
+
+class HashingPool:
+    def __init__(self, max_workers, max_pending):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='password-hash')
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+
+    def run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HashingBusy
+
+        def job():
+            try:
+                return fn(*args)
+            finally:
+                self._slots.release()
+
+        try:
+            future = self._executor.submit(job)
+        except BaseException:
+            self._slots.release()
+            raise
+        return future.result()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = HashingPool(
+                    max_workers=getattr(settings, 'PASSWORD_HASH_WORKERS', None) or os.cpu_count() or 1,
+                    max_pending=getattr(settings, 'PASSWORD_HASH_QUEUE', 32),
+                )
+    return _pool
+
+
+def _verify(password, encoded):
+    upgraded = []
+    valid = hashers.check_password(password, encoded, setter=lambda raw: upgraded.append(hashers.make_password(raw)))
+    return valid, (upgraded[0] if upgraded else None)
+
+
+def verify_password(password, encoded):
+    """
+    Check ``password`` on the pool; returns ``(valid, new_hash)``.
+
+    ``new_hash`` is set when ``encoded`` was made with an outdated hasher or
+    iteration count and should replace it. Raises HashingBusy.
+    """
+    return get_pool().run(_verify, password, encoded)
+
+
+def hash_password(password):
+    """``make_password`` on the pool. Raises HashingBusy."""
+    return get_pool().run(hashers.make_password, password)
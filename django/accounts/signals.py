@@ -0,0 +1,12 @@
+# accounts/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.auth_utils import token_cache
+from accounts.models import user_cred
+
+
+@receiver(post_save, sender=user_cred)
+@receiver(post_delete, sender=user_cred)
+def evict_cached_user(sender, instance, **kwargs):
+    token_cache.evict_user(instance.id)
@@ -1,3 +1,86 @@
+import threading
+from unittest import mock
+
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, check_password, make_password
 from django.test import TestCase
+from django.urls import reverse
+
+from accounts import hashing
+from accounts.auth_utils import token_cache
+from accounts.models import user_cred
+from accounts.views import generate_jwt_token
+
+
+class JWTUserResolutionTests(TestCase):
+    def setUp(self):
+        token_cache.clear()
+        self.addCleanup(token_cache.clear)
+        self.user = user_cred.objects.create(username="meera", password="x")
+        self.auth = {'HTTP_AUTHORIZATION': f"Bearer {generate_jwt_token(self.user)}"}
+
+    def test_one_lookup_per_request_then_none(self):
+        # DRF authentication and get_user_from_token share the first lookup...
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(reverse('verify_token'), **self.auth).status_code, 200)
+        # ...and later requests with the same token hit the cache
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(reverse('verify_token'), **self.auth).status_code, 200)
+
+    def test_deleted_user_is_evicted(self):
+        self.client.get(reverse('verify_token'), **self.auth)
+        self.user.delete()
+        response = self.client.get(reverse('verify_token'), **self.auth)
+        self.assertEqual(response.status_code, 403)
+
+    def test_renamed_user_is_reloaded(self):
+        self.client.get(reverse('verify_token'), **self.auth)
+        self.user.username = "meera_k"
+        self.user.save()
+        self.assertEqual(self.client.get(reverse('verify_token'), **self.auth).json()['username'], "meera_k")
+
+    def test_invalid_token(self):
+        response = self.client.get(reverse('verify_token'), HTTP_AUTHORIZATION="Bearer nope")
+        self.assertEqual(response.status_code, 403)
+
+    def test_cache_is_bounded(self):
+        for i in range(token_cache.maxsize + 5):
+            token_cache.set(f"t{i}", self.user)
+        self.assertEqual(len(token_cache._entries), token_cache.maxsize)
+        self.assertIsNone(token_cache.get("t0"))
+
+
+class PasswordHashingTests(TestCase):
+    def login(self, password):
+        return self.client.post(reverse('login'), {'username': "arjun", 'password': password}, content_type='application/json')
+
+    def test_outdated_hash_is_upgraded_on_login(self):
+        old = PBKDF2PasswordHasher().encode("secret123", "saltsalt", iterations=1000)
+        user = user_cred.objects.create(username="arjun", password=old)
+        self.assertEqual(self.login("secret123").status_code, 200)
+        user.refresh_from_db()
+        self.assertEqual(user.password.split('$')[1], str(PBKDF2PasswordHasher.iterations))
+        self.assertTrue(check_password("secret123", user.password))
+        # Wrong password never rewrites the hash
+        self.assertEqual(self.login("nope").status_code, 401)
+        self.assertEqual(user_cred.objects.get(pk=user.pk).password, user.password)
+
+    def test_full_pool_answers_503(self):
+        user_cred.objects.create(username="arjun", password=make_password("secret123"))
+        pool = hashing.HashingPool(max_workers=1, max_pending=0)
+        self.addCleanup(pool.shutdown)
+        started, release = threading.Event(), threading.Event()
+
+        def hold_the_worker():
+            started.set()
+            release.wait()
 
-# Create your tests here.
+        busy = threading.Thread(target=pool.run, args=(hold_the_worker,))
+        busy.start()
+        started.wait()
+        with mock.patch.object(hashing, 'get_pool', return_value=pool):
+            response = self.login("secret123")
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(response['Retry-After'], "1")
+            release.set()
+            busy.join()
+            self.assertEqual(self.login("secret123").status_code, 200)
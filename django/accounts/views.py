@@ -1,6 +1,6 @@
-from django.contrib.auth.hashers import make_password, check_password
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
+from accounts.hashing import HashingBusy, hash_password, verify_password
 from accounts.models import user_cred
 from django.db import IntegrityError
 import jwt
@@ -19,6 +19,12 @@ def generate_jwt_token(user):
     return jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm='HS256')
 
 
+def hashing_busy():
+    response = Response({'message': 'Server busy, please retry'}, status=503)
+    response['Retry-After'] = str(getattr(settings, 'PASSWORD_HASH_RETRY_AFTER', 1))
+    return response
+
+
 @api_view(['POST'])
 def login(request, format=None):
     username = request.data.get('username')
@@ -32,7 +38,15 @@ def login(request, format=None):
     except user_cred.DoesNotExist:
         return Response({'message': 'User does not exist'}, status=404)
 
-    if check_password(password, user_get.password):
+    try:
+        valid, new_hash = verify_password(password, user_get.password)
+    except HashingBusy:
+        return hashing_busy()
+
+    if valid:
+        if new_hash:
+            # ✅ Hasher settings changed since this hash was made: upgrade it
+            user_cred.objects.filter(pk=user_get.pk).update(password=new_hash)
         token = generate_jwt_token(user_get)
         return Response({
             'message': 'Successfully logged in',
@@ -56,7 +70,11 @@ def create_user(request, format=None):
         return Response({'message': 'Password must be at least 6 characters long'}, status=400)
 
     try:
-        enc_pass = make_password(password)
+        enc_pass = hash_password(password)
+    except HashingBusy:
+        return hashing_busy()
+
+    try:
         obj = user_cred(username=username, password=enc_pass)
         obj.save()
 
@@ -44,6 +44,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.RequestTimingMiddleware',  # no-op unless REQUEST_TIMING_ENABLED
+    'core.middleware.CompressionMiddleware',  # gzip/br above COMPRESSION_MIN_SIZE
+    'core.middleware.ASGIURLConfMiddleware',  # async views for ASGI requests
+    'core.middleware.PrimaryAfterWriteMiddleware',  # no-op unless DATABASE_REPLICAS
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.security.SecurityMiddleware',
@@ -56,6 +60,8 @@ MIDDLEWARE = [
 ]
 
 ROOT_URLCONF = 'backend_proj.urls'
+# Under ASGI the read endpoints resolve to native async views (core.async_views)
+ASGI_ROOT_URLCONF = 'backend_proj.urls_asgi'
 
 TEMPLATES = [
     {
@@ -82,9 +88,45 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
-    }
+        # Reuse connections instead of reopening SQLite (and re-running the
+        # PRAGMAs below) on every request
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            # Wait up to 20s for the write lock rather than failing with
+            # "database is locked"
+            'timeout': 20,
+            # Take the write lock at BEGIN: a deferred transaction that reads
+            # and then writes can't wait for the lock and fails immediately
+            'transaction_mode': 'IMMEDIATE',
+            # WAL lets readers carry on while one writer commits
+            'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL',
+        },
+        # A file, not shared-cache memory, so threaded tests get real
+        # connections that wait on the write lock instead of failing
+        'TEST': {'NAME': BASE_DIR / 'db.test.sqlite3'},
+    },
+    # Stand-in read replica for local use: a copy of db.sqlite3, refreshed
+    # with `manage.py sync_replica`. Only used once listed in DATABASE_REPLICAS.
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.replica.sqlite3',
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {'timeout': 20},
+    },
 }
 
+# Read-only catalogue/history views (@replica_reads) read core models from one
+# of these aliases; a user is kept on the primary for REPLICA_STICKY_SECONDS
+# after their own write
+DATABASE_ROUTERS = ['core.db_routing.ReplicaRouter']
+DATABASE_REPLICAS = []  # e.g. ['replica']
+REPLICA_STICKY_SECONDS = 5
+# Where that pin is kept: must be shared by every worker, so not the per-process
+# 'default' LocMemCache (check core.W001)
+REPLICA_PIN_CACHE_ALIAS = 'responses'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -153,3 +195,74 @@ REST_FRAMEWORK = {
         # 'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
 }
+
+# College search: swap for another core.search.BaseSearchBackend subclass
+# (falls back to plain icontains lookups on non-SQLite databases)
+COLLEGE_SEARCH_BACKEND = 'core.search.SQLiteFTS5Backend'
+# Best hits returned by a search without `limit`/`cursor` (the frontend's plain list)
+COLLEGE_SEARCH_MAX_RESULTS = 100
+
+# Decoded JWT -> user cache (per process); entries also drop when the user changes
+JWT_USER_CACHE_SIZE = 1024
+JWT_USER_CACHE_TTL = 60  # seconds
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Shared tier of core.response_cache and the replica pin; point at Redis
+    # when running several hosts
+    'responses': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / '.cache' / 'responses',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+}
+
+# Tiered response cache (per-process LRU in front of CACHES[RESPONSE_CACHE_ALIAS]).
+# Keys include the data version, so TTLs bound memory, not staleness of catalogue data.
+RESPONSE_CACHE_ALIAS = 'responses'
+RESPONSE_CACHE_LOCAL_SIZE = 256  # entries per process
+RESPONSE_CACHE_POLICIES = {  # seconds fresh, then seconds served stale while one worker rebuilds
+    'colleges-search': {'ttl': 300, 'stale': 60},
+    'careers-list': {'ttl': 120, 'stale': 30},
+}
+
+# Per-process LRU of career recommendations, keyed by normalized score vector
+CAREER_RECOMMENDATION_CACHE_SIZE = 512
+
+# Published quiz snapshot (core.question_bank), per process: edits elsewhere
+# are picked up within this many seconds
+QUESTION_SET_RECHECK_SECONDS = 5
+
+# Password hashing runs on a bounded pool; beyond workers + queue, login/createu answer 503
+PASSWORD_HASH_WORKERS = None  # None = os.cpu_count()
+PASSWORD_HASH_QUEUE = 32
+PASSWORD_HASH_RETRY_AFTER = 1  # seconds, sent as Retry-After
+
+# POST api/core/batch/ runs up to this many GET API requests in one round trip
+BATCH_MAX_REQUESTS = 20
+
+# Response compression (core.compression): smaller bodies go out as-is, and
+# @precompressed catalogue views keep up to PRECOMPRESSED_CACHE_BYTES of
+# compressed bodies per process, keyed by data version
+COMPRESSION_MIN_SIZE = 1024  # bytes
+PRECOMPRESSED_CACHE_BYTES = 32 * 1024 * 1024
+
+# Browser/proxy caching of catalogue and quiz GETs (revalidated via ETag)
+CATALOGUE_CACHE_MAX_AGE = 60  # seconds
+
+# Per-request DB/serializer timing (Server-Timing header + core.request_timing log)
+REQUEST_TIMING_ENABLED = False
+REQUEST_TIMING_N_PLUS_ONE_THRESHOLD = 5  # same SQL more often than this is flagged
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'core.request_timing': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
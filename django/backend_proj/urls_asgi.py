@@ -0,0 +1,14 @@
+"""
+URL configuration used for ASGI requests (see ASGI_ROOT_URLCONF).
+
+Identical to backend_proj.urls except that the core read endpoints resolve
+to the native async views in core.async_views.
+"""
+from django.contrib import admin
+from django.urls import path, include
+
+urlpatterns = [
+    path('admin/', admin.site.urls),
+    path('api/accounts/', include('accounts.urls')),
+    path('api/core/', include('core.urls_async')),
+]
@@ -1,5 +1,17 @@
 from django.contrib import admin
-from .models import Career, College, QuizQuestion, QuizResult, UserProfile
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ChangeList
+from django.core.exceptions import PermissionDenied
+from django.core.paginator import Paginator
+from django.db import connections, router
+from django.db.models import Max
+from django.urls import path
+from django.utils.functional import cached_property
+
+from accounts.models import user_cred
+
+from . import exports
+from .models import Career, College, QuestionSet, QuizQuestion, QuizResult, QuizRollup, UserProfile
 
 @admin.register(Career)
 class CareerAdmin(admin.ModelAdmin):
@@ -11,7 +23,8 @@ class CareerAdmin(admin.ModelAdmin):
 class CollegeAdmin(admin.ModelAdmin):
     list_display = ("name", "location", "college_type")
     search_fields = ("name", "location")
-    list_filter = ("college_type",)
+    list_filter = ("college_type", "state")
+    readonly_fields = ("city", "state")
 
 @admin.register(QuizQuestion)
 class QuizQuestionAdmin(admin.ModelAdmin):
@@ -19,14 +32,156 @@ class QuizQuestionAdmin(admin.ModelAdmin):
     search_fields = ("question",)
     list_filter = ("category", "subject")
 
+@admin.register(QuestionSet)
+class QuestionSetAdmin(admin.ModelAdmin):
+    list_display = ("version", "created_at")
+    readonly_fields = ("version", "question_ids", "created_at")
+
+class StreamingExportMixin:
+    """Adds ``<changelist>/export/``: a streamed CSV/NDJSON download (see core.exports)"""
+    export_dataset = None
+
+    def get_urls(self):
+        info = self.model._meta.app_label, self.model._meta.model_name
+        export = path('export/', self.admin_site.admin_view(self.export_view), name='%s_%s_export' % info)
+        return [export] + super().get_urls()
+
+    def export_view(self, request):
+        # admin_view() only checks is_staff; the rows need the model's view permission
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        return exports.export_response(self.export_dataset, request.GET)
+
+CURSOR_VAR = 'cursor'
+COUNT_LIMIT = 10000  # filtered changelists count at most this many rows
+
+
+def estimated_count(model):
+    """Whole-table row estimate: planner statistics on PostgreSQL, else the highest id"""
+    connection = connections[router.db_for_read(model)]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [model._meta.db_table])
+            row = cursor.fetchone()
+        if row and row[0] > 0:
+            return row[0]
+    # One index lookup; overestimates by the rows deleted since
+    return model.objects.aggregate(n=Max('pk'))['n'] or 0
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that is told its count instead of running SELECT COUNT(*)"""
+
+    def __init__(self, object_list, per_page, count=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self._count = count
+
+    @cached_property
+    def count(self):
+        return self._count if self._count is not None else super().count
+
+
+class CursorChangeList(ChangeList):
+    """
+    Changelist paged by ``?cursor=<id>`` (newest first) instead of page numbers.
+
+    Each page is ``WHERE id < cursor ORDER BY id DESC LIMIT n+1``, so deep
+    pages cost the same as the first. The unfiltered total is estimated; a
+    filtered one is counted up to ``COUNT_LIMIT``.
+    """
+    cursor_paging = True  # read by admin/core/pagination.html
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(CURSOR_VAR, None)
+        return lookup_params
+
+    def get_results(self, request):
+        self.params.pop(CURSOR_VAR, None)  # filter/search links start from the top again
+        try:
+            self.cursor = int(request.GET[CURSOR_VAR]) if request.GET.get(CURSOR_VAR) else None
+        except ValueError:
+            raise IncorrectLookupParameters
+        queryset = self.queryset.order_by('-pk')
+        if self.cursor is not None:
+            queryset = queryset.filter(pk__lt=self.cursor)
+        rows = list(queryset[:self.list_per_page + 1])
+        self.result_list = rows[:self.list_per_page]
+        self.next_cursor = self.result_list[-1].pk if len(rows) > self.list_per_page else None
+
+        self.filtered = bool(self.query or self.get_filters_params())
+        if self.filtered:
+            self.result_count = self.queryset.order_by()[:COUNT_LIMIT].count()
+            self.count_capped = self.result_count >= COUNT_LIMIT
+        else:
+            self.result_count = estimated_count(self.model)
+            self.count_capped = False
+        self.show_full_result_count = False
+        self.full_result_count = None
+        self.show_admin_actions = True
+        self.can_show_all = False
+        self.multi_page = self.cursor is not None or self.next_cursor is not None
+        self.paginator = EstimatedCountPaginator(self.queryset, self.list_per_page, count=self.result_count)
+
+    def next_url(self):
+        return self.get_query_string({CURSOR_VAR: self.next_cursor}) if self.next_cursor is not None else None
+
+    def first_url(self):
+        return self.get_query_string() if self.cursor is not None else None
+
+
+class StreamListFilter(admin.AllValuesFieldListFilter):
+    """Stream choices from the small QuizRollup table, not SELECT DISTINCT over every row"""
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        super().__init__(field, request, params, model, model_admin, field_path)
+        self.lookup_choices = QuizRollup.objects.order_by('stream').values_list('stream', flat=True).distinct()
+
+
+class LargeTableAdminMixin:
+    """
+    Changelist settings for tables with millions of rows keyed to a user.
+
+    Pages by cursor with estimated counts, joins the user in the page query,
+    and searches usernames by prefix through their unique index rather than
+    ``LIKE '%term%'`` across the join.
+    """
+    list_select_related = ("user",)
+    ordering = ("-id",)
+    sortable_by = ()  # cursor paging is newest first
+    show_full_result_count = False
+    search_fields = ("user__username",)
+    search_help_text = "Username, or its first letters (case-sensitive)"
+    paginator = EstimatedCountPaginator
+
+    def get_changelist(self, request, **kwargs):
+        return CursorChangeList
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        # A range on username is an index seek; istartswith would scan
+        users = user_cred.objects.filter(username__gte=term, username__lt=term + '\U0010ffff').values('id')
+        return queryset.filter(user__in=users), False
+
+
 @admin.register(QuizResult)
-class QuizResultAdmin(admin.ModelAdmin):
+class QuizResultAdmin(LargeTableAdminMixin, StreamingExportMixin, admin.ModelAdmin):
+    export_dataset = "quiz-results"
     list_display = ("user", "recommended_stream", "created_at")
-    search_fields = ("user__username",)
-    list_filter = ("recommended_stream", "created_at")
+    list_filter = (("recommended_stream", StreamListFilter), "created_at")
+    raw_id_fields = ("user",)
+
+@admin.register(QuizRollup)
+class QuizRollupAdmin(admin.ModelAdmin):
+    list_display = ("day", "stream", "results")
+    list_filter = ("stream",)
+    readonly_fields = ("day", "stream", "results", "score_sums", "score_counts")
 
 @admin.register(UserProfile)
-class UserProfileAdmin(admin.ModelAdmin):
+class UserProfileAdmin(LargeTableAdminMixin, StreamingExportMixin, admin.ModelAdmin):
+    export_dataset = "profiles"
     list_display = ("user", "preferred_stream", "completed_quizzes", "created_at")
-    search_fields = ("user__username",)
-    list_filter = ("preferred_stream", "created_at")
\ No newline at end of file
+    list_filter = (("preferred_stream", StreamListFilter), "created_at")
+    raw_id_fields = ("user",)
@@ -0,0 +1,105 @@
+# core/analytics.py
+"""Quiz analytics served from ``QuizRollup`` instead of scanning ``QuizResult``.
+
+``record()`` folds each new result into its day x stream row as it is saved.
+``rebuild()`` recomputes every row from history in id-ordered chunks. Reports
+only read rollup rows, so their cost depends on the number of days, not the
+number of results.
+"""
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import QuizResult, QuizRollup
+
+
+def record(result):
+    """Add a saved ``QuizResult`` to its rollup row"""
+    key = {'day': timezone.localdate(result.created_at), 'stream': result.recommended_stream}
+    with transaction.atomic():
+        # Write first so the row is locked before its JSON sums are read
+        if not QuizRollup.objects.filter(**key).update(results=F('results')):
+            QuizRollup.objects.get_or_create(**key)
+        rollup = QuizRollup.objects.get(**key)
+        rollup.add(result.scores)
+        rollup.save(update_fields=['results', 'score_sums', 'score_counts'])
+
+
+def _fold(rollups, rows):
+    for created_at, stream, scores in rows:
+        key = (timezone.localdate(created_at), stream)
+        rollup = rollups.get(key)
+        if rollup is None:
+            rollup = rollups[key] = QuizRollup(day=key[0], stream=stream, score_sums={}, score_counts={})
+        rollup.add(scores or {})
+
+
+def _chunks(after_id, chunk_size):
+    while True:
+        chunk = list(
+            QuizResult.objects.filter(id__gt=after_id).order_by('id')
+            .values_list('id', 'created_at', 'recommended_stream', 'scores')[:chunk_size]
+        )
+        if not chunk:
+            return
+        after_id = chunk[-1][0]
+        yield after_id, [row[1:] for row in chunk]
+
+
+def rebuild(chunk_size=5000, progress=None):
+    """
+    Recompute all rollups from ``QuizResult``; returns the number of results read.
+
+    History is folded in memory (one object per day x stream) outside any
+    transaction; the tail that arrived meanwhile is folded and the table
+    swapped inside one, so concurrent submissions are neither lost nor counted twice.
+    """
+    rollups, last_id, seen = {}, 0, 0
+    for last_id, rows in _chunks(last_id, chunk_size):
+        _fold(rollups, rows)
+        seen += len(rows)
+        if progress:
+            progress(seen)
+
+    with transaction.atomic():
+        for last_id, rows in _chunks(last_id, chunk_size):
+            _fold(rollups, rows)
+            seen += len(rows)
+        QuizRollup.objects.all().delete()
+        QuizRollup.objects.bulk_create(rollups.values(), batch_size=1000)
+    return seen
+
+
+def report(start=None, end=None, stream=None):
+    """Results per day x stream and mean score per category over the range"""
+    rollups = QuizRollup.objects.order_by('day', 'stream')
+    if start:
+        rollups = rollups.filter(day__gte=start)
+    if end:
+        rollups = rollups.filter(day__lte=end)
+    if stream:
+        rollups = rollups.filter(stream__iexact=stream)
+
+    days, streams, sums, counts = [], {}, {}, {}
+    for rollup in rollups:
+        days.append({
+            'day': rollup.day.isoformat(),
+            'stream': rollup.stream,
+            'results': rollup.results,
+            'mean_scores': _means(rollup.score_sums, rollup.score_counts),
+        })
+        streams[rollup.stream] = streams.get(rollup.stream, 0) + rollup.results
+        for category, total in rollup.score_sums.items():
+            sums[category] = sums.get(category, 0) + total
+            counts[category] = counts.get(category, 0) + rollup.score_counts.get(category, 0)
+
+    return {
+        'total_results': sum(streams.values()),
+        'streams': streams,
+        'mean_scores': _means(sums, counts),
+        'days': days,
+    }
+
+
+def _means(sums, counts):
+    return {c: round(total / counts[c], 4) for c, total in sums.items() if counts.get(c)}
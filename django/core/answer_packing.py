@@ -0,0 +1,82 @@
+# core/answer_packing.py
+"""Compact storage for ``QuizResult`` answers.
+
+A submission is stored as one byte per question of the question set it was
+answered against (``QuizResult.question_set_version``), in question order,
+with 0 meaning "not answered". 25 Likert answers take 25 bytes instead of
+~1.5KB of client JSON. Submissions that don't fit (unknown questions,
+non-integer or out-of-range values, no published question set) keep the
+JSON ``answers`` column as before.
+"""
+from . import question_bank
+from .scoring import answer_pairs
+
+UNANSWERED = 0
+MAX_VALUE = 255
+
+
+def pack(question_ids, answers):
+    """``bytes`` for ``answers`` against ``question_ids``, or None if they can't be packed"""
+    column = {qid: i for i, qid in enumerate(question_ids)}
+    if not isinstance(answers, dict) and not all(isinstance(a, dict) for a in answers):
+        return None
+    packed = bytearray(len(question_ids))
+    for question_id, value in answer_pairs(answers):
+        try:
+            index = column.get(int(question_id))
+            value = float(value)
+        except (TypeError, ValueError):
+            return None
+        if index is None or not value.is_integer() or not UNANSWERED < value <= MAX_VALUE:
+            return None
+        packed[index] = int(value)
+    return bytes(packed)
+
+
+def unpack(question_ids, packed):
+    """``{question_id: value}`` for the answered questions"""
+    return {qid: value for qid, value in zip(question_ids, bytes(packed)) if value != UNANSWERED}
+
+
+def decode(answers, packed, version, snapshot=None):
+    """Answers from the three stored columns, in a form ``ScoringEngine.vectorize`` accepts"""
+    if packed is None:
+        return answers
+    ids = question_bank.question_ids(version, snapshot)
+    return unpack(ids, packed) if ids else {}
+
+
+def answer_values(result, snapshot=None):
+    return decode(result.answers, result.packed_answers, result.question_set_version, snapshot)
+
+
+def expand(result, snapshot=None):
+    """
+    A result's answers as the frontend submitted them (``questionId``/``answer``/``category``).
+
+    Reads the question snapshot (and older versions' ids) through the ORM
+    unless ``snapshot`` comes from ``aprepare()``.
+    """
+    if result.packed_answers is None:
+        return result.answers
+    snapshot = snapshot or question_bank.get_snapshot()
+    expanded = []
+    for question_id, value in answer_values(result, snapshot).items():
+        item = {'questionId': question_id, 'answer': value}
+        if question_id in snapshot.categories:
+            item['category'] = snapshot.categories[question_id]
+        expanded.append(item)
+    return expanded
+
+
+async def aprepare(results):
+    """
+    Serializer context for expanding ``results`` in an async view.
+
+    Loads the snapshot and the question ids of every older version the
+    results were packed against, so serializing them runs no queries.
+    """
+    snapshot = await question_bank.aget_snapshot()
+    for version in {r.question_set_version for r in results if r.packed_answers is not None}:
+        await question_bank.aquestion_ids(version, snapshot)  # warms _published_ids
+    return {'question_snapshot': snapshot}
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from django.core import checks
+
+        from . import db_routing, signals  # noqa: F401
+
+        checks.register(db_routing.check_pin_cache, checks.Tags.caches)
@@ -0,0 +1,196 @@
+# core/async_views.py
+"""Native async versions of the read-heavy endpoints for ASGI deployments.
+
+These are plain Django async views (DRF views are sync-only). They return the
+same JSON as their ``core.views`` twins, using the async ORM so a request
+never hops to a worker thread except for the FTS query and response cache
+misses. They carry the same validators, Cache-Control and response caching
+as the sync views, and reject a bad Bearer token with the same 403 DRF's
+``JWTAuthentication`` gives them. ``ASGI_ROOT_URLCONF`` routes ASGI traffic here; WSGI keeps
+using ``core.views``.
+"""
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, JsonResponse
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import ParseError
+
+from accounts.auth_utils import aget_user_from_token
+from accounts.authentication import aauthenticate
+
+from . import answer_packing, question_bank
+from .compression import precompressed
+from .conditional import versioned
+from .db_routing import replica_reads
+from .models import CatalogueCounter, Career, College, QuizResult, UserProfile
+from .pagination import akeyset_page_body, page_body, wants_page
+from .renderers import FastJSONRenderer
+from .response_cache import acached_response
+from .search import get_search_backend
+from .serializers import CareerSerializer, CollegeSerializer, QuizResultSerializer, aserialize_values
+from .views import filter_facets, hit_chunks, quiz_home_data, search_params
+
+_renderer = FastJSONRenderer()
+
+
+def _json(data, status=200):
+    return HttpResponse(_renderer.render(data), content_type='application/json', status=status)
+
+
+def _auth_required():
+    return JsonResponse({'detail': 'Authentication required'}, status=401)
+
+
+def _authenticated(view):
+    # Innermost like DRF's authentication, so 304s and cached bodies skip it
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        _, error = await aauthenticate(request)
+        if error:
+            return JsonResponse({'detail': error}, status=403)
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+async def _cached(request, name, tables, view, *args):
+    data, outcome = await acached_response(request, name, tables, view, *args)
+    response = _json(data)
+    if outcome:
+        response['X-Cache'] = outcome
+    return response
+
+
+@require_GET
+@versioned('quiz')
+@_authenticated
+async def quiz_home(request):
+    snapshot = await question_bank.aget_snapshot()
+    return _json(quiz_home_data(len(snapshot.question_ids)))
+
+
+@require_GET
+@replica_reads
+@precompressed('quiz')
+@versioned('quiz')
+@_authenticated
+async def quiz_questions(request):
+    snapshot = await question_bank.aget_snapshot()
+    return HttpResponse(snapshot.payload, content_type='application/json')
+
+
+async def _list_data(request, queryset, serializer_class):
+    if wants_page(request):
+        return await akeyset_page_body(request, queryset, ('id',), serializer_class, fast=True)
+    return await aserialize_values(queryset, serializer_class)
+
+
+@require_GET
+@replica_reads
+@precompressed('colleges')
+@versioned('colleges')
+@_authenticated
+async def colleges_list(request):
+    college_type = request.GET.get('type')
+    search = request.GET.get('search')
+    try:
+        if search:
+            return await _cached(request, 'colleges-search', ('colleges',),
+                                 _search_colleges, request, search, college_type)
+        colleges = filter_facets(request, College.objects.all())
+        if college_type:
+            colleges = colleges.of_type(college_type)
+        return _json(await _list_data(request, colleges, CollegeSerializer))
+    except ParseError as exc:
+        return JsonResponse({'detail': str(exc.detail)}, status=400)
+
+
+async def _search_colleges(request, search, college_type):
+    paged, limit, after = search_params(request)
+
+    # Raw FTS SQL has no async cursor; this is the one thread hop
+    hits = await sync_to_async(get_search_backend().search)(
+        search, college_type=college_type, limit=limit + 1 if paged else limit, after=after
+    )
+    next_position = None
+    if paged and len(hits) > limit:
+        hits = hits[:limit]
+        next_position = list(hits[-1])
+
+    by_id = {}
+    for ids in hit_chunks(hits):
+        colleges = filter_facets(request, College.objects.filter(id__in=ids))
+        by_id.update((row['id'], row) for row in await aserialize_values(colleges, CollegeSerializer))
+    data = [by_id[pk] for pk, _ in hits if pk in by_id]
+    return page_body(request, data, next_position) if paged else data
+
+
+@require_GET
+@replica_reads
+@precompressed('careers')
+@versioned('careers')
+@_authenticated
+async def careers_list(request):
+    careers = Career.objects.all()
+    category = request.GET.get('category')
+    if category:
+        careers = careers.filter(title__icontains=category)
+    try:
+        return await _cached(request, 'careers-list', ('careers',), _list_data, request, careers, CareerSerializer)
+    except ParseError as exc:
+        return JsonResponse({'detail': str(exc.detail)}, status=400)
+
+
+@require_GET
+@replica_reads
+@_authenticated
+async def my_results(request):
+    user = await aget_user_from_token(request)
+    if not user:
+        return _auth_required()
+
+    results = QuizResult.objects.filter(user=user).select_related('user').order_by('-created_at')
+    try:
+        if wants_page(request):
+            return _json(await akeyset_page_body(request, results, ('-created_at', '-id'), QuizResultSerializer,
+                                                 prepare=answer_packing.aprepare))
+    except ParseError as exc:
+        return JsonResponse({'detail': str(exc.detail)}, status=400)
+    rows = [result async for result in results]
+    return _json(QuizResultSerializer(rows, many=True, context=await answer_packing.aprepare(rows)).data)
+
+
+@require_GET
+@_authenticated
+async def user_dashboard(request):
+    user = await aget_user_from_token(request)
+    if not user:
+        return _auth_required()
+
+    profile, created = await UserProfile.objects.only(
+        'preferred_stream', 'completed_quizzes', 'interests'
+    ).aget_or_create(user=user)
+    recent_results = [
+        result async for result in
+        QuizResult.objects.filter(user=user)
+        .select_related('user')
+        .only('id', 'scores', 'answers', 'packed_answers', 'question_set_version', 'recommended_stream',
+              'created_at', 'user__username')
+        .order_by('-created_at')[:3]
+    ]
+    totals = await CatalogueCounter.atotals()
+    context = await answer_packing.aprepare(recent_results)
+
+    return _json({
+        'username': user.username,
+        'profile': {
+            'preferred_stream': profile.preferred_stream,
+            'completed_quizzes': profile.completed_quizzes,
+            'interests': profile.interests,
+        },
+        'recent_results': QuizResultSerializer(recent_results, many=True, context=context).data,
+        'recommendations': {
+            'colleges_count': totals['colleges'],
+            'careers_count': totals['careers'],
+        },
+    })
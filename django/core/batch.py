@@ -0,0 +1,109 @@
+# core/batch.py
+"""Run several GET API requests in one HTTP round trip.
+
+Each sub-request is resolved against ``ROOT_URLCONF`` and its view called
+in-process, so they all share the batch request's thread, DB connection and
+already-authenticated user (the JWT is decoded once, not once per item).
+Sub-responses are JSON already; their bytes are spliced into the combined
+body rather than parsed and re-encoded.
+"""
+import io
+import json
+import logging
+from urllib.parse import urlencode, urlsplit
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.urls import Resolver404, resolve
+
+from accounts.auth_utils import get_user_from_token, remember_request_user
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = '/api/'
+# Headers that belong to the batch request itself, not its items. Items must
+# come back as plain JSON to be spliced in; the combined body is compressed
+# once by CompressionMiddleware instead.
+_DROPPED_HEADERS = (
+    'CONTENT_TYPE', 'CONTENT_LENGTH', 'HTTP_IF_NONE_MATCH', 'HTTP_IF_MODIFIED_SINCE', 'HTTP_ACCEPT_ENCODING',
+)
+
+
+class BatchError(ValueError):
+    """The batch body itself is malformed (answered with 400)"""
+
+
+def parse(data):
+    """Validate ``{"requests": [{"path", "method"?, "params"?, "id"?}, ...]}``"""
+    items = data.get('requests') if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        raise BatchError("'requests' must be a non-empty list")
+    limit = getattr(settings, 'BATCH_MAX_REQUESTS', 20)
+    if len(items) > limit:
+        raise BatchError(f"At most {limit} requests per batch")
+    for item in items:
+        if not isinstance(item, dict) or not isinstance(item.get('path'), str):
+            raise BatchError("Every request needs a 'path'")
+        if not isinstance(item.get('params', {}), dict):
+            raise BatchError("'params' must be an object")
+    return items
+
+
+def _sub_request(request, user, path, query):
+    request = getattr(request, '_request', request)
+    environ = {k: v for k, v in request.META.items() if k not in _DROPPED_HEADERS}
+    environ.update({
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': path,
+        'QUERY_STRING': query,
+        'HTTP_ACCEPT': 'application/json',
+        'wsgi.input': io.BytesIO(),
+        'wsgi.url_scheme': request.scheme,
+    })
+    sub = WSGIRequest(environ)
+    remember_request_user(sub, user)
+    return sub
+
+
+def _run(request, user, item):
+    """``(status, json_bytes)`` for one item"""
+    method = str(item.get('method', 'GET')).upper()
+    parts = urlsplit(item['path'])
+    path = parts.path
+    query = '&'.join(q for q in (parts.query, urlencode(item.get('params', {}), doseq=True)) if q)
+
+    if not path.startswith(API_PREFIX):
+        return 404, json.dumps({'detail': 'Not found'}).encode()
+    if method != 'GET':
+        return 405, json.dumps({'detail': 'Only GET requests can be batched'}).encode()
+    try:
+        match = resolve(path, urlconf=settings.ROOT_URLCONF)
+    except Resolver404:
+        return 404, json.dumps({'detail': 'Not found'}).encode()
+    if match.url_name == 'batch':
+        return 400, json.dumps({'detail': 'Batches cannot be nested'}).encode()
+
+    try:
+        response = match.func(_sub_request(request, user, path, query), *match.args, **match.kwargs)
+        if hasattr(response, 'render') and not response.is_rendered:
+            response.render()
+    except Exception:
+        logger.exception("Batch item %s failed", path)
+        return 500, json.dumps({'detail': 'Internal server error'}).encode()
+
+    if getattr(response, 'streaming', False) or not response.content:
+        return response.status_code, b'null'
+    if not response.get('Content-Type', '').startswith('application/json'):
+        return response.status_code, json.dumps(response.content.decode(response.charset, 'replace')).encode()
+    return response.status_code, response.content
+
+
+def execute(request, items):
+    """Run ``items`` for ``request``'s user; returns the combined JSON body"""
+    user = get_user_from_token(request)  # once, shared by every item
+    parts = []
+    for index, item in enumerate(items):
+        status, body = _run(request, user, item)
+        head = json.dumps({'id': item.get('id', index), 'status': status})
+        parts.append(head[:-1].encode() + b', "body": ' + body + b'}')
+    return b'{"responses": [' + b', '.join(parts) + b']}'
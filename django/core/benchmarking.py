@@ -0,0 +1,161 @@
+# core/benchmarking.py
+"""Helpers shared by the ``bench_*`` management commands."""
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+
+from accounts.models import user_cred
+
+from . import analytics, answer_packing, question_bank
+from .models import CatalogueCounter, Career, College, CollegeFacet, CollegeFacility, DataVersion, QuizResult, UserProfile
+from .search import get_search_backend
+
+CITIES = ['Chennai', 'Madurai', 'Coimbatore', 'Mumbai', 'Pune', 'Delhi', 'Kolkata', 'Bengaluru', 'Hyderabad', 'Jaipur']
+STATES = ['Tamil Nadu', 'Maharashtra', 'Delhi', 'West Bengal', 'Karnataka', 'Telangana', 'Rajasthan']
+TYPES = ['Government', 'Private', 'Engineering', 'Medical', 'Arts', 'University']
+WORDS = ['Institute', 'College', 'Technology', 'Science', 'Medical', 'Arts', 'Commerce', 'National', 'Regional', 'Memorial']
+FACILITIES = ['Library', 'Hostel', 'Labs', 'Sports Complex', 'Wi-Fi Campus', 'Cafeteria', 'Auditorium', 'Hospital']
+CAREERS = ['Engineer', 'Doctor', 'Designer', 'Accountant', 'Analyst', 'Developer', 'Lawyer', 'Teacher', 'Architect']
+STREAMS = ['engineering', 'medical', 'technology', 'arts', 'commerce']
+SKILLS = ['Mathematics', 'Biology', 'Communication', 'Programming', 'Statistics', 'Drawing', 'Finance', 'Research']
+
+
+@contextmanager
+def scratch_database(verbosity=0, name=None):
+    """
+    Run the body against a freshly migrated throwaway database.
+
+    SQLite scratch databases live in memory unless ``name`` gives a file path;
+    use one for anything multi-threaded, as shared in-memory databases lock
+    whole tables instead of honouring the busy timeout.
+    """
+    test_settings = connection.settings_dict.setdefault('TEST', {})
+    previous = test_settings.get('NAME')
+    if name:
+        test_settings['NAME'] = str(name)
+    try:
+        old_name = connection.creation.create_test_db(verbosity=verbosity, autoclobber=True, serialize=False)
+        try:
+            yield
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=verbosity)
+    finally:
+        test_settings['NAME'] = previous
+
+
+def time_calls(fn, repeat):
+    """Call ``fn`` ``repeat`` times and return per-call latencies in ms"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    return {
+        'p50_ms': round(statistics.median(ordered), 3),
+        'p99_ms': round(percentile(ordered, 0.99), 3),
+        'mean_ms': round(statistics.fmean(ordered), 3),
+    }
+
+
+def code(i):
+    """Unique, searchable token per synthetic row, e.g. ``kx1f``"""
+    return 'k' + format(i, 'x')
+
+
+def make_colleges(rng, start, stop):
+    return [
+        College(
+            name=f"{rng.choice(WORDS)} {rng.choice(WORDS)} College {code(i)}",
+            location=f"{rng.choice(CITIES)}, {rng.choice(STATES)}",
+            website=f"https://{code(i)}.example.edu",
+            college_type=rng.choice(TYPES),
+            fees=f"{rng.randrange(20, 300)},000 per year",
+            facilities=rng.sample(FACILITIES, rng.randrange(2, 6)),
+            cutoff_marks=str(rng.randrange(120, 200)),
+        )
+        for i in range(start, stop)
+    ]
+
+
+def make_careers(rng, start, stop):
+    return [
+        Career(
+            title=f"{rng.choice(WORDS)} {rng.choice(CAREERS)} {code(i)}",
+            description="Synthetic career used for benchmarking. " * 3,
+            demand=rng.randrange(0, 100),
+            skills_required=rng.sample(SKILLS, 3),
+            streams=rng.sample(STREAMS, rng.randint(1, 2)),
+            salary_range=f"{rng.randrange(3, 10)}-{rng.randrange(10, 40)} LPA",
+            growth_prospects="Steady growth expected.",
+        )
+        for i in range(start, stop)
+    ]
+
+
+BENCH_PASSWORD = 'bench-password'
+
+
+def _batched(make, total, batch_size):
+    for start in range(0, total, batch_size):
+        yield make(start, min(start + batch_size, total))
+
+
+def populate(rng, colleges=0, careers=0, users=0, results=0, batch_size=5000, log=None):
+    """
+    Fill the (scratch) database with synthetic catalogue, users and quiz history.
+
+    Users are ``bench<N>`` with password ``BENCH_PASSWORD``; quiz results are
+    spread over the users and scored by the real scoring engine.
+    """
+    log = log or (lambda message: None)
+
+    for batch in _batched(lambda a, b: make_colleges(rng, a, b), colleges, batch_size):
+        for college in batch:
+            college.city, college.state = College.split_location(college.location)
+        CollegeFacility.sync(College.objects.bulk_create(batch))
+    get_search_backend().rebuild()
+    CollegeFacet.rebuild()
+    log(f"{colleges} colleges")
+    for batch in _batched(lambda a, b: make_careers(rng, a, b), careers, batch_size):
+        Career.objects.bulk_create(batch)
+    log(f"{careers} careers")
+    CatalogueCounter.recount()
+    DataVersion.bump('colleges')
+    DataVersion.bump('careers')
+
+    password = make_password(BENCH_PASSWORD)  # hash once, PBKDF2 is the slow part
+    for batch in _batched(lambda a, b: [user_cred(username=f"bench{i}", password=password) for i in range(a, b)],
+                          users, batch_size):
+        created = user_cred.objects.bulk_create(batch)
+        UserProfile.objects.bulk_create(UserProfile(user=u) for u in created)
+    log(f"{users} users")
+
+    if results and users:
+        snapshot = question_bank.get_snapshot()
+        engine = snapshot.engine
+        user_ids = list(user_cred.objects.order_by('id').values_list('id', flat=True)[:users])
+        for start in range(0, results, batch_size):
+            stop = min(start + batch_size, results)
+            answers = [[{'questionId': qid, 'answer': rng.randint(1, 5)} for qid in engine.question_ids]
+                       for _ in range(start, stop)]
+            scores = engine.score_many(answers)
+            QuizResult.objects.bulk_create(
+                QuizResult(user_id=rng.choice(user_ids), scores=s, recommended_stream=engine.recommend(s),
+                           packed_answers=answer_packing.pack(snapshot.question_ids, a),
+                           question_set_version=snapshot.version)
+                for a, s in zip(answers, scores)
+            )
+        analytics.rebuild(batch_size)
+        log(f"{results} quiz results")
@@ -0,0 +1,182 @@
+# core/catalogue_import.py
+"""Streaming readers and batched upserts for college/career feeds.
+
+Records are read one at a time (JSON arrays are decoded incrementally, not
+loaded whole) and written with ``bulk_create(update_conflicts=True)`` on the
+model's natural key, so memory stays flat however large the feed is. Only
+the columns a record carries are overwritten on conflict; the rest keep
+their stored values.
+"""
+import csv
+import io
+import json
+import sys
+import time
+
+from django.db import transaction
+
+from .models import CatalogueCounter, Career, College, CollegeFacet, CollegeFacility, DataVersion
+from .search import get_search_backend
+
+# model, natural key, list-valued fields, counter/data-version name
+TARGETS = {
+    'college': (College, ('name', 'location'), ('facilities',), 'colleges'),
+    'career': (Career, ('title',), ('skills_required', 'streams'), 'careers'),
+}
+
+_WHITESPACE = ' \t\r\n'
+
+
+def iter_json_array(stream, chunk_size=1 << 16):
+    """Yield the items of a top-level JSON array without reading it all"""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    started = False
+    eof = False
+    while True:
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE + ',':
+                pos += 1
+            if not started and pos < len(buffer):
+                if buffer[pos] != '[':
+                    raise ValueError("Expected a JSON array")
+                started = True
+                pos += 1
+                continue
+            if pos < len(buffer) and buffer[pos] == ']':
+                return
+            try:
+                item, pos = decoder.raw_decode(buffer, pos)
+            except ValueError:
+                if eof:
+                    raise
+                break  # object cut off at the chunk boundary; read more
+            yield item
+        buffer = buffer[pos:]
+        if eof:
+            if buffer.strip(_WHITESPACE):
+                raise ValueError("Unterminated JSON array")
+            return
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        buffer += chunk
+
+
+def iter_ndjson(stream):
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def iter_csv(stream):
+    yield from csv.DictReader(stream)
+
+
+READERS = {'json': iter_json_array, 'ndjson': iter_ndjson, 'jsonl': iter_ndjson, 'csv': iter_csv}
+
+
+def _as_list(value):
+    if isinstance(value, list):
+        return value
+    if not value:
+        return []
+    value = value.strip()
+    if value.startswith('['):
+        return json.loads(value)
+    return [part.strip() for part in value.split(';') if part.strip()]
+
+
+class CatalogueImporter:
+    def __init__(self, target, batch_size=2000, progress=None):
+        self.model, self.key, self.list_fields, self.name = TARGETS[target]
+        self.batch_size = batch_size
+        self.progress = progress
+        self.fields = [
+            f.name for f in self.model._meta.concrete_fields if not f.primary_key
+        ]
+        self.update_fields = [f for f in self.fields if f not in self.key]
+        self.read = self.written = self.skipped = 0
+
+    def build(self, record):
+        """``(instance, columns to overwrite on conflict)`` for ``record``, or None to skip it"""
+        # Django fixtures wrap the columns in "fields"
+        record = record.get('fields', record)
+        values = {f: record[f] for f in self.fields if f in record and record[f] is not None}
+        if not all(values.get(k) for k in self.key):
+            return None
+        for field in self.list_fields:
+            if field in values:
+                values[field] = _as_list(values[field])
+        if self.model is College:
+            values['city'], values['state'] = College.split_location(values['location'])
+        provided = tuple(f for f in self.update_fields if f in values)
+        return self.model(**values), provided
+
+    def run(self, records):
+        started = time.perf_counter()
+        batch = {}
+        try:
+            for record in records:
+                self.read += 1
+                built = self.build(record) if isinstance(record, dict) else None
+                if built is None:
+                    self.skipped += 1
+                    continue
+                obj, _ = built
+                # Last record wins when a key repeats inside one batch
+                batch[tuple(getattr(obj, k) for k in self.key)] = built
+                if len(batch) >= self.batch_size:
+                    self.flush(batch.values(), started)
+                    batch = {}
+            if batch:
+                self.flush(batch.values(), started)
+        finally:
+            # bulk_create skips signals: resync what they normally maintain,
+            # also for the batches committed before a bad record stopped the feed
+            if self.written:
+                CatalogueCounter.recount(self.name)
+                if self.model is College:
+                    CollegeFacet.rebuild()
+                DataVersion.bump(self.name)
+        return time.perf_counter() - started
+
+    def flush(self, built, started):
+        # One upsert per set of columns the records carry
+        groups = {}
+        for obj, provided in built:
+            groups.setdefault(provided, []).append(obj)
+        with transaction.atomic():
+            saved = []
+            for provided, objs in groups.items():
+                saved += self.model.objects.bulk_create(
+                    objs,
+                    update_conflicts=True,
+                    unique_fields=list(self.key),
+                    # A no-op update still returns the existing row's pk
+                    update_fields=list(provided or self.key),
+                )
+            if self.model is College:
+                if any(provided != tuple(self.update_fields) for provided in groups):
+                    # Columns the feed left out hold stored values, not the defaults in memory
+                    saved = list(College.objects.filter(pk__in=[c.pk for c in saved]))
+                get_search_backend().index(saved)
+                CollegeFacility.sync(saved)
+        self.written += sum(len(objs) for objs in groups.values())
+        if self.progress:
+            elapsed = time.perf_counter() - started
+            self.progress(self.read, self.written, elapsed)
+
+
+def open_feed(path, fmt=None):
+    """Return ``(text stream, reader)`` for ``path`` ('-' for stdin)"""
+    if fmt is None:
+        fmt = path.rsplit('.', 1)[-1].lower() if '.' in path else 'ndjson'
+    if fmt not in READERS:
+        raise ValueError(f"Unknown feed format '{fmt}'")
+    if path == '-':
+        stream = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8', newline='')
+    else:
+        stream = open(path, encoding='utf-8', newline='')
+    return stream, READERS[fmt]
@@ -0,0 +1,199 @@
+# core/compression.py
+"""gzip/brotli compression of API responses.
+
+``CompressionMiddleware`` (core.middleware) compresses any large enough
+JSON/text response on the fly at a cheap level. Versioned catalogue views
+add ``@precompressed(...)``: their compressed bytes are kept per data version
+and URL, at the best level, and served again without running the view until
+the data changes. Brotli is used when the optional ``brotli`` package is
+installed and the client accepts it; gzip otherwise.
+"""
+import gzip
+import threading
+from collections import OrderedDict, namedtuple
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+
+from .conditional import atable_versions, table_versions
+
+try:
+    import brotli
+except ImportError:  # optional dependency; gzip only
+    brotli = None
+
+COMPRESSIBLE_TYPES = ('application/json', 'application/javascript', 'application/x-ndjson', 'text/')
+DYNAMIC_LEVELS = {'br': 4, 'gzip': 6}  # per request: fast
+STATIC_LEVELS = {'br': 11, 'gzip': 9}  # once per data version: small
+# Set per response, so never stored or replayed from the precompressed cache
+_VOLATILE_HEADERS = {'content-length', 'content-encoding', 'x-cache', 'set-cookie', 'server-timing'}
+
+
+def negotiate(request):
+    """Best encoding ``request`` accepts: ``'br'``, ``'gzip'`` or None"""
+    accepted = {}
+    for part in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        coding, _, params = part.strip().partition(';')
+        q = 1.0
+        if params.strip().startswith('q='):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    for coding in ('br', 'gzip'):
+        if coding == 'br' and brotli is None:
+            continue
+        if accepted.get(coding, accepted.get('*', 0)) > 0:
+            return coding
+    return None
+
+
+def compress(data, coding, level):
+    if coding == 'br':
+        return brotli.compress(data, quality=level)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def compressible(response):
+    """Whether ``response`` is a complete, unencoded, large enough text/JSON 200"""
+    if response.status_code != 200 or getattr(response, 'streaming', False) or response.has_header('Content-Encoding'):
+        return False
+    if not response.get('Content-Type', '').startswith(COMPRESSIBLE_TYPES):
+        return False
+    return len(response.content) >= getattr(settings, 'COMPRESSION_MIN_SIZE', 1024)
+
+
+def encode(response, body, coding):
+    """Swap in the ``coding``-compressed ``body`` and fix up the headers"""
+    patch_vary_headers(response, ('Accept-Encoding',))
+    response.content = body
+    response['Content-Encoding'] = coding
+    response['Content-Length'] = str(len(body))
+    # The compressed bytes are a different representation of the same data
+    etag = response.get('ETag')
+    if etag and etag.startswith('"'):
+        response['ETag'] = 'W/' + etag
+    return response
+
+
+Entry = namedtuple('Entry', 'body headers')
+
+
+class PrecompressedCache:
+    """Per-process LRU of compressed bodies, bounded by total bytes"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        if len(entry.body) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old.body)
+            self._entries[key] = entry
+            self.size += len(entry.body)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted.body)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+precompressed_cache = PrecompressedCache(getattr(settings, 'PRECOMPRESSED_CACHE_BYTES', 32 * 1024 * 1024))
+
+
+def _vary(response):
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
+
+
+def _conditional(request):
+    return 'HTTP_IF_NONE_MATCH' in request.META or 'HTTP_IF_MODIFIED_SINCE' in request.META
+
+
+def precompressed(*tables):
+    """
+    Keep the compressed body of a GET view per data version of ``tables``.
+
+    Unconditional requests for a cached URL + encoding are answered straight
+    from the cache; conditional ones still run the view so ``@versioned`` can
+    answer 304. Place it outside ``@versioned`` so the cached headers include
+    the validators.
+    """
+
+    def cache_key(request, coding):
+        versions, changed = table_versions(request, tables)
+        query = tuple(sorted(request.GET.lists()))
+        stamp = changed.timestamp() if changed else 0
+        # Accept too: DRF negotiates the renderer (JSON vs the browsable API) from it
+        accept = request.META.get('HTTP_ACCEPT', '')
+        return (tuple(versions), stamp, coding, accept, request.scheme, request.get_host(), request.path, query)
+
+    def hit(request, key):
+        if _conditional(request):
+            return None
+        entry = precompressed_cache.get(key)
+        if entry is None:
+            return None
+        response = HttpResponse(entry.body, headers=entry.headers)
+        response['Content-Length'] = str(len(entry.body))
+        return response
+
+    def store(response, key, coding):
+        if hasattr(response, 'render') and not response.is_rendered:
+            response.render()
+        # JSON only: the browsable API's HTML carries the user and a CSRF token
+        if not compressible(_vary(response)) or not response['Content-Type'].startswith('application/json'):
+            return response
+        encode(response, compress(response.content, coding, STATIC_LEVELS[coding]), coding)
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in _VOLATILE_HEADERS}
+        precompressed_cache.set(key, Entry(response.content, headers))
+        return response
+
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                coding = negotiate(request)
+                if coding is None or request.method != 'GET':
+                    return _vary(await view(request, *args, **kwargs))
+                await atable_versions(request, tables)
+                key = cache_key(request, coding)
+                cached = hit(request, key)
+                if cached is not None:
+                    return cached
+                return store(await view(request, *args, **kwargs), key, coding)
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            coding = negotiate(request)
+            if coding is None or request.method != 'GET':
+                return _vary(view(request, *args, **kwargs))
+            key = cache_key(request, coding)
+            cached = hit(request, key)
+            if cached is not None:
+                return cached
+            return store(view(request, *args, **kwargs), key, coding)
+        return wrapper
+
+    return decorator
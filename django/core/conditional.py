@@ -0,0 +1,73 @@
+# core/conditional.py
+"""ETag / Last-Modified / Cache-Control for read-mostly endpoints.
+
+Validators come from a per-table change version (``DataVersion``, or the
+published ``QuestionSet`` for the quiz), so a matching ``If-None-Match`` is
+answered with 304 before DRF, the view, its queryset or serializer run.
+Async views get the same headers; their versions are read with the async ORM.
+"""
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+
+from . import question_bank
+from .models import DataVersion
+
+
+def table_versions(request, tables):
+    # condition() asks for the ETag and Last-Modified separately; look once
+    memo = request.__dict__.setdefault('_data_versions', {})
+    key = tuple(tables)
+    if key not in memo:
+        if tables == ('quiz',):
+            snapshot = question_bank.get_snapshot()
+            memo[key] = ([snapshot.version], snapshot.published_at)
+        else:
+            rows = [DataVersion.current(name) for name in tables]
+            memo[key] = ([version for version, _ in rows], max(changed for _, changed in rows))
+    return memo[key]
+
+
+async def atable_versions(request, tables):
+    """table_versions() for async views; later sync calls hit the memo"""
+    memo = request.__dict__.setdefault('_data_versions', {})
+    key = tuple(tables)
+    if key not in memo:
+        if tables == ('quiz',):
+            snapshot = await question_bank.aget_snapshot()
+            memo[key] = ([snapshot.version], snapshot.published_at)
+        else:
+            rows = [await DataVersion.acurrent(name) for name in tables]
+            memo[key] = ([version for version, _ in rows], max(changed for _, changed in rows))
+    return memo[key]
+
+
+def versioned(*tables, max_age=None):
+    """Make a GET view conditional on the change version of ``tables``"""
+    if max_age is None:
+        max_age = getattr(settings, 'CATALOGUE_CACHE_MAX_AGE', 60)
+
+    def etag(request, *args, **kwargs):
+        versions, _ = table_versions(request, tables)
+        return '"%s"' % '.'.join(f'{name}-{v}' for name, v in zip(tables, versions))
+
+    def last_modified(request, *args, **kwargs):
+        return table_versions(request, tables)[1]
+
+    def decorator(view):
+        conditional = condition(etag_func=etag, last_modified_func=last_modified)(view)
+        conditional = cache_control(public=True, max_age=max_age, must_revalidate=True)(conditional)
+        if not iscoroutinefunction(view):
+            return conditional
+
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            # condition() calls etag/last_modified synchronously; fill the memo first
+            await atable_versions(request, tables)
+            return await conditional(request, *args, **kwargs)
+        return async_wrapper
+
+    return decorator
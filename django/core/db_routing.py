@@ -0,0 +1,117 @@
+# core/db_routing.py
+"""Send read-only catalogue and history reads to replica databases.
+
+Views opt in with ``@replica_reads``; while one runs, reads of ``core``
+models go to one of ``DATABASE_REPLICAS`` (chosen per request). Everything
+else — writes, auth lookups, views that don't opt in — stays on ``default``.
+
+Replicas lag, so a user who has just written is pinned to the primary for
+``REPLICA_STICKY_SECONDS``: ``core.middleware.PrimaryAfterWriteMiddleware``
+marks them after a successful unsafe request, and ``@replica_reads`` skips
+the replica while the mark lasts. The mark lives in the
+``REPLICA_PIN_CACHE_ALIAS`` cache, which every worker must share; the
+``core.W001`` system check warns when it is per-process.
+"""
+import random
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+
+from accounts.auth_utils import aget_user_from_token, get_user_from_token
+
+REPLICATED_APPS = {'core'}
+
+_replica = ContextVar('replica_alias', default=None)
+
+
+def replicas():
+    return list(getattr(settings, 'DATABASE_REPLICAS', ()))
+
+
+def _pin_key(user_id):
+    return f'db-primary:{user_id}'
+
+
+def _pin_cache_alias():
+    return getattr(settings, 'REPLICA_PIN_CACHE_ALIAS', 'default')
+
+
+def pin_to_primary(user):
+    """Read ``user``'s requests from the primary for the next few seconds"""
+    timeout = getattr(settings, 'REPLICA_STICKY_SECONDS', 5)
+    caches[_pin_cache_alias()].set(_pin_key(user.id), 1, timeout=timeout)
+
+
+def is_pinned(user):
+    return user is not None and caches[_pin_cache_alias()].get(_pin_key(user.id)) is not None
+
+
+def _choose(user):
+    aliases = replicas()
+    if not aliases or is_pinned(user):
+        return None
+    return random.choice(aliases)
+
+
+def replica_reads(view):
+    """Serve ``view``'s reads from a replica unless the caller is pinned to the primary"""
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            if not replicas():  # no token decode or user lookup for nothing
+                return await view(request, *args, **kwargs)
+            token = _replica.set(_choose(await aget_user_from_token(request)))
+            try:
+                return await view(request, *args, **kwargs)
+            finally:
+                _replica.reset(token)
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not replicas():
+            return view(request, *args, **kwargs)
+        token = _replica.set(_choose(get_user_from_token(request)))
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _replica.reset(token)
+    return wrapper
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        alias = _replica.get()
+        if alias and model._meta.app_label in REPLICATED_APPS:
+            return alias
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        known = {DEFAULT_DB_ALIAS, *replicas()}
+        if obj1._state.db in known and obj2._state.db in known:
+            return True
+        return None
+
+
+def check_pin_cache(app_configs=None, **kwargs):
+    """System check: with replicas, the primary pin must be visible to every worker"""
+    alias = _pin_cache_alias()
+    if not replicas():
+        return []
+    if alias not in settings.CACHES:
+        return [checks.Error(f"REPLICA_PIN_CACHE_ALIAS '{alias}' is not in CACHES", id='core.E001')]
+    backend = settings.CACHES[alias].get('BACKEND', '').rsplit('.', 1)[-1]
+    if backend in ('LocMemCache', 'DummyCache'):
+        return [checks.Warning(
+            f"REPLICA_PIN_CACHE_ALIAS '{alias}' uses {backend}, which other worker processes can't see",
+            hint="Point it at a shared cache (file-based on one host, Redis or Memcached across hosts), "
+                 "or a user's next read may come from a replica that hasn't caught up with their write.",
+            id='core.W001',
+        )]
+    return []
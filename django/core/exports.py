@@ -0,0 +1,156 @@
+# core/exports.py
+"""Streaming CSV/NDJSON exports of quiz results and user profiles.
+
+Rows come straight from ``values_list(...).iterator(chunk_size=...)`` and are
+encoded into ~64KB chunks (optionally gzipped) as they are read, so memory
+stays flat however many rows match. Served by the admin export views and the
+``export_quiz_data`` command.
+"""
+import csv
+import io
+import json
+import zlib
+from datetime import datetime, time, timedelta
+
+from django.http import HttpResponseBadRequest, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from . import answer_packing
+from .models import QuizResult, UserProfile
+
+CHUNK_SIZE = 2000
+BUFFER_SIZE = 1 << 16
+FORMATS = ('csv', 'ndjson')
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _filter_range(queryset, start, end):
+    # Half-open datetime range so the created_at indexes apply
+    if start:
+        queryset = queryset.filter(created_at__gte=_day_start(start))
+    if end:
+        queryset = queryset.filter(created_at__lt=_day_start(end + timedelta(days=1)))
+    return queryset
+
+
+def quiz_results(start=None, end=None, stream=None, chunk_size=CHUNK_SIZE):
+    """``(columns, rows)`` for quiz results, answers decoded to ``{question_id: value}``"""
+    columns = ('id', 'user_id', 'username', 'created_at', 'recommended_stream', 'scores', 'answers')
+    queryset = _filter_range(QuizResult.objects.order_by('id'), start, end)
+    if stream:
+        queryset = queryset.filter(recommended_stream__iexact=stream)
+    values = queryset.values_list(
+        'id', 'user_id', 'user__username', 'created_at', 'recommended_stream', 'scores',
+        'answers', 'packed_answers', 'question_set_version',
+    )
+
+    def rows():
+        for *head, scores, answers, packed, version in values.iterator(chunk_size=chunk_size):
+            yield (*head, scores, answer_packing.decode(answers, packed, version))
+    return columns, rows()
+
+
+def profiles(start=None, end=None, stream=None, chunk_size=CHUNK_SIZE):
+    columns = ('id', 'user_id', 'username', 'preferred_stream', 'completed_quizzes', 'interests', 'created_at')
+    queryset = _filter_range(UserProfile.objects.order_by('id'), start, end)
+    if stream:
+        queryset = queryset.filter(preferred_stream__iexact=stream)
+    values = queryset.values_list(
+        'id', 'user_id', 'user__username', 'preferred_stream', 'completed_quizzes', 'interests', 'created_at',
+    )
+    return columns, values.iterator(chunk_size=chunk_size)
+
+
+DATASETS = {'quiz-results': quiz_results, 'profiles': profiles}
+
+
+def _plain(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _cell(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(',', ':'))
+    return _plain(value)
+
+
+def csv_chunks(columns, rows, buffer_size=BUFFER_SIZE):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow([_cell(v) for v in row])
+        if buffer.tell() >= buffer_size:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode()
+
+
+def ndjson_chunks(columns, rows, buffer_size=BUFFER_SIZE):
+    lines, size = [], 0
+    for row in rows:
+        line = json.dumps({c: _plain(v) for c, v in zip(columns, row)}, separators=(',', ':')).encode() + b'\n'
+        lines.append(line)
+        size += len(line)
+        if size >= buffer_size:
+            yield b''.join(lines)
+            lines, size = [], 0
+    yield b''.join(lines)
+
+
+def gzip_chunks(chunks, level=6):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_chunks(dataset, fmt='csv', start=None, end=None, stream=None, gzip=False):
+    """Encoded (and optionally gzipped) byte chunks of ``dataset``"""
+    columns, rows = DATASETS[dataset](start, end, stream)
+    chunks = (csv_chunks if fmt == 'csv' else ndjson_chunks)(columns, rows)
+    return gzip_chunks(chunks) if gzip else chunks
+
+
+def parse_day(params, key):
+    """Optional ``YYYY-MM-DD`` parameter; raises ValueError if malformed"""
+    value = params.get(key)
+    if not value:
+        return None
+    try:
+        day = parse_date(value)
+    except ValueError:
+        day = None
+    if day is None:
+        raise ValueError(f"'{key}' must be a YYYY-MM-DD date")
+    return day
+
+
+def export_response(dataset, params):
+    """``StreamingHttpResponse`` for query params ``format``, ``from``, ``to``, ``stream``, ``gzip``"""
+    fmt = params.get('format', 'csv')
+    if fmt not in FORMATS:
+        return HttpResponseBadRequest(f"format must be one of {', '.join(FORMATS)}")
+    try:
+        start, end = parse_day(params, 'from'), parse_day(params, 'to')
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+    gzip = params.get('gzip') in ('1', 'true', 'yes')
+
+    if gzip:
+        content_type = 'application/gzip'  # a .gz download, not Content-Encoding
+    else:
+        content_type = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+    response = StreamingHttpResponse(
+        export_chunks(dataset, fmt, start, end, params.get('stream'), gzip), content_type=content_type,
+    )
+    filename = f"{dataset}.{fmt}" + ('.gz' if gzip else '')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
@@ -0,0 +1,81 @@
+# core/instrumentation.py
+"""Per-request timing collected by ``core.middleware.RequestTimingMiddleware``.
+
+Everything here checks a context variable first, so when the middleware is
+not installed ``measure()`` costs one ``ContextVar.get()``.
+"""
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_current = ContextVar('request_stats', default=None)
+
+
+class RequestStats:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_queries = 0
+        self.db_ms = 0.0
+        self.spans = Counter()  # name -> ms
+        self.sql_shapes = Counter()
+
+    def db_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_ms += (time.perf_counter() - start) * 1000
+            self.db_queries += 1
+            # Params are passed separately, so the SQL text is already the shape
+            self.sql_shapes[sql] += 1
+
+    def repeated_queries(self, threshold):
+        return [(sql, n) for sql, n in self.sql_shapes.most_common() if n > threshold]
+
+
+def start():
+    stats = RequestStats()
+    return stats, _current.set(stats)
+
+
+def stop(token):
+    _current.reset(token)
+
+
+@contextmanager
+def measure(name):
+    """Add the block's wall time to span ``name`` of the current request"""
+    stats = _current.get()
+    if stats is None:
+        yield
+        return
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.spans[name] += (time.perf_counter() - start_time) * 1000
+
+
+def _timed_property(prop, name):
+    def fget(self):
+        with measure(name):
+            return prop.fget(self)
+    return property(fget)
+
+
+_drf_patched = False
+
+
+def instrument_drf():
+    """Time ``serializer.data`` as the 'serialize' span and response rendering as 'render'"""
+    global _drf_patched
+    if _drf_patched:
+        return
+    from rest_framework import serializers
+    from rest_framework.response import Response
+
+    for cls in (serializers.Serializer, serializers.ListSerializer):
+        cls.data = _timed_property(cls.data, 'serialize')
+    Response.rendered_content = _timed_property(Response.rendered_content, 'render')
+    _drf_patched = True
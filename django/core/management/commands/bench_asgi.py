@@ -0,0 +1,128 @@
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import user_cred
+from accounts.views import generate_jwt_token
+from core.benchmarking import percentile
+
+SERVERS = {
+    'asgi': ['backend_proj.asgi:application'],
+    'wsgi': ['backend_proj.wsgi:application', '--interface', 'wsgi'],
+}
+PATHS = [
+    '/api/core/colleges/?limit=20',
+    '/api/core/colleges/?search=medical&limit=20',
+    '/api/core/careers/?limit=50',
+    '/api/core/quiz/questions/',
+    '/api/core/dashboard/',
+]
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for(port, process, timeout=20):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise CommandError(f"Server exited with {process.returncode}")
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise CommandError(f"Server did not start on port {port}")
+
+
+async def _fetch(reader, writer, request):
+    writer.write(request)
+    await writer.drain()
+    head = await reader.readuntil(b'\r\n\r\n')
+    status = int(head.split(b' ', 2)[1])
+    length = 0
+    for line in head.split(b'\r\n')[1:]:
+        name, _, value = line.partition(b':')
+        if name.strip().lower() == b'content-length':
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def _load(port, path, headers, concurrency, duration):
+    """Keep ``concurrency`` keep-alive connections busy for ``duration`` seconds"""
+    request = (
+        f"GET {path} HTTP/1.1\r\nHost: localhost\r\n{headers}\r\n".encode()
+    )
+    latencies, statuses = [], set()
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        try:
+            while time.perf_counter() < deadline:
+                t0 = time.perf_counter()
+                statuses.add(await _fetch(reader, writer, request))
+                latencies.append((time.perf_counter() - t0) * 1000)
+        finally:
+            writer.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'requests_per_sec': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.50), 2),
+        'p99_ms': round(percentile(latencies, 0.99), 2),
+        'status_codes': sorted(statuses),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Serve the project under uvicorn as ASGI (async views) and as WSGI, hammer the read "
+        "endpoints with concurrent keep-alive clients and compare requests/sec and p50/p99. "
+        "Uses the configured database, so load data first (import_catalogue)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=50)
+        parser.add_argument('--duration', type=float, default=10.0, help="Seconds per endpoint")
+        parser.add_argument('--workers', type=int, default=1, help="uvicorn worker processes")
+        parser.add_argument('--paths', nargs='*', default=PATHS)
+        parser.add_argument('--only', choices=sorted(SERVERS), help="Benchmark one interface only")
+
+    def handle(self, *args, **options):
+        user = user_cred.objects.order_by('id').first()
+        headers = f"Authorization: Bearer {generate_jwt_token(user)}\r\n" if user else ''
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'backend_proj.settings')}
+
+        for interface in [options['only']] if options['only'] else SERVERS:
+            port = _free_port()
+            process = subprocess.Popen(
+                [sys.executable, '-m', 'uvicorn', *SERVERS[interface], '--port', str(port),
+                 '--workers', str(options['workers']), '--log-level', 'warning', '--no-access-log'],
+                cwd=settings.BASE_DIR, env=env,
+            )
+            try:
+                _wait_for(port, process)
+                self.stdout.write(f"{interface} ({options['concurrency']} concurrent clients)")
+                for path in options['paths']:
+                    result = asyncio.run(_load(port, path, headers, options['concurrency'], options['duration']))
+                    self.stdout.write(
+                        f"  {path:<46} {result['requests_per_sec']:>8.1f} req/s  "
+                        f"p50 {result['p50_ms']:>8.2f}ms  p99 {result['p99_ms']:>8.2f}ms  {result['status_codes']}"
+                    )
+            finally:
+                process.terminate()
+                process.wait()
@@ -0,0 +1,39 @@
+import random
+
+from django.core.management.base import BaseCommand
+
+from core.benchmarking import code, make_colleges, scratch_database, summarize, time_calls
+from core.models import College
+from core.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Benchmark college search latency (FTS index vs icontains scan) at growing catalogue sizes"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='1000,10000,100000', help="Comma separated row counts")
+        parser.add_argument('--repeat', type=int, default=50)
+
+    def handle(self, *args, **options):
+        sizes = [int(s) for s in options['sizes'].split(',')]
+        rng = random.Random(42)
+        with scratch_database():
+            backend = get_search_backend()
+            created = 0
+            for size in sizes:
+                College.objects.bulk_create(make_colleges(rng, created, size), batch_size=2000)
+                backend.rebuild()
+                created = size
+
+                # A user looking for one institution: a selective term is the
+                # case where a LIKE '%x%' scan has to read the whole table.
+                wanted = lambda: code(rng.randrange(size))  # noqa: E731
+                fts = summarize(time_calls(lambda: backend.search(wanted(), limit=20), options['repeat']))
+                scan = summarize(time_calls(
+                    lambda: list(College.objects.filter(name__icontains=wanted()).values_list('id', flat=True)[:20]),
+                    options['repeat'],
+                ))
+                self.stdout.write(
+                    f"rows={size:>8}  fts p50={fts['p50_ms']}ms p99={fts['p99_ms']}ms  "
+                    f"icontains p50={scan['p50_ms']}ms p99={scan['p99_ms']}ms"
+                )
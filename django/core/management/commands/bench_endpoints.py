@@ -0,0 +1,164 @@
+import json
+import platform
+import random
+import subprocess
+import time
+from itertools import count
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern
+
+import accounts.urls
+import core.urls
+from accounts.views import generate_jwt_token
+from accounts.models import user_cred
+from core import question_bank
+from core.benchmarking import BENCH_PASSWORD, percentile, populate, scratch_database
+
+FULL_SCALE = {'colleges': 100_000, 'careers': 5_000, 'users': 100_000, 'results': 1_000_000}
+
+
+def _scenarios(user, token, question_ids, staff):
+    """
+    One request factory per URL name; every route in core/accounts must appear here.
+
+    ``staff`` is a client logged in to the admin, for the staff-only endpoints.
+    """
+    auth = {'HTTP_AUTHORIZATION': f"Bearer {token}"}
+    answers = [{'questionId': qid, 'answer': 3} for qid in question_ids]
+    new_user = count()
+    as_json = {'content_type': 'application/json'}
+    return {
+        'colleges-list': lambda c: c.get('/api/core/colleges/', {'search': 'medical chennai', 'limit': 20}),
+        'college-facets': lambda c: c.get('/api/core/colleges/facets/'),
+        'government-colleges': lambda c: c.get('/api/core/colleges/government/', {'limit': 50}),
+        'careers-list': lambda c: c.get('/api/core/careers/', {'limit': 50}),
+        'career-recommendations': lambda c: c.get('/api/core/careers/recommended/', {'limit': 10}, **auth),
+        'quiz-home': lambda c: c.get('/api/core/quiz/home/'),
+        'quiz-questions': lambda c: c.get('/api/core/quiz/questions/'),
+        'submit-quiz': lambda c: c.post('/api/core/quiz/submit/', {'answers': answers}, **as_json, **auth),
+        'quiz-analytics': lambda c: staff.get('/api/core/quiz/analytics/'),
+        'my-results': lambda c: c.get('/api/core/quiz/results/', {'limit': 20}, **auth),
+        'user-dashboard': lambda c: c.get('/api/core/dashboard/', **auth),
+        'batch': lambda c: c.post('/api/core/batch/', {'requests': [
+            {'path': '/api/accounts/verify-token/'}, {'path': '/api/core/dashboard/'},
+            {'path': '/api/core/quiz/home/'}, {'path': '/api/core/quiz/questions/'},
+            {'path': '/api/core/quiz/results/', 'params': {'limit': 20}},
+        ]}, **as_json, **auth),
+        'login': lambda c: c.post('/api/accounts/login/', {'username': user.username, 'password': BENCH_PASSWORD}, **as_json),
+        'createu': lambda c: c.post('/api/accounts/createu/', {'username': f"new{next(new_user)}", 'password': BENCH_PASSWORD}, **as_json),
+        'verify_token': lambda c: c.get('/api/accounts/verify-token/', **auth),
+    }
+
+
+def _route_names():
+    return [p.name for module in (core.urls, accounts.urls) for p in module.urlpatterns if isinstance(p, URLPattern)]
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _measure(client, request, repeat):
+    latencies, queries, statuses = [], 0, set()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as ctx:
+            t0 = time.perf_counter()
+            response = request(client)
+            latencies.append((time.perf_counter() - t0) * 1000)
+        queries += len(ctx.captured_queries)
+        statuses.add(response.status_code)
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'p50_ms': round(percentile(latencies, 0.50), 3),
+        'p99_ms': round(percentile(latencies, 0.99), 3),
+        'requests_per_sec': round(repeat / elapsed, 1),
+        'queries_per_request': round(queries / repeat, 2),
+        'status_codes': sorted(statuses),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill a scratch database with synthetic data and drive every core/accounts URL through the "
+        "test client, reporting p50/p99 latency, queries per request and requests/sec"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=0.01,
+                            help="Fraction of full scale (100k colleges, 5k careers, 100k users, 1M results)")
+        parser.add_argument('--repeat', type=int, default=200, help="Requests per endpoint")
+        parser.add_argument('--only', nargs='*', help="Limit to these URL names")
+        parser.add_argument('--output', help="Write results as JSON to this file")
+        parser.add_argument('--compare', help="Earlier --output file to diff against")
+
+    def handle(self, *args, **options):
+        sizes = {name: max(1, int(n * options['scale'])) for name, n in FULL_SCALE.items()}
+        routes = _route_names()
+        wanted = options['only'] or routes
+        unknown = set(wanted) - set(routes)
+        if unknown:
+            raise CommandError(f"Unknown URL names: {', '.join(sorted(unknown))}")
+
+        report = {
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'database': connection.vendor,
+            'sizes': sizes,
+            'repeat': options['repeat'],
+            'endpoints': {},
+        }
+        with scratch_database():
+            started = time.perf_counter()
+            populate(random.Random(1), **sizes, log=lambda m: self.stdout.write(f"  generated {m}"))
+            self.stdout.write(f"Data ready in {time.perf_counter() - started:.1f}s")
+
+            question_bank.invalidate()
+            user = user_cred.objects.order_by('id').first()
+            staff = Client(HTTP_HOST='localhost')
+            staff.force_login(User.objects.create_superuser('bench-admin', 'admin@example.com', BENCH_PASSWORD))
+            question_ids = question_bank.get_snapshot().engine.question_ids
+            scenarios = _scenarios(user, generate_jwt_token(user), question_ids, staff)
+            missing = set(routes) - set(scenarios)
+            if missing:
+                raise CommandError(f"No benchmark scenario for: {', '.join(sorted(missing))}")
+
+            client = Client(HTTP_HOST='localhost')
+            for name in wanted:
+                result = _measure(client, scenarios[name], options['repeat'])
+                report['endpoints'][name] = result
+                self.stdout.write(
+                    f"{name:<22} p50 {result['p50_ms']:>8.2f}ms  p99 {result['p99_ms']:>8.2f}ms  "
+                    f"{result['requests_per_sec']:>8.1f} req/s  {result['queries_per_request']:>5} q/req  "
+                    f"{result['status_codes']}"
+                )
+
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump(report, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+        if options['compare']:
+            self._compare(report, options['compare'])
+
+    def _compare(self, report, path):
+        with open(path) as fh:
+            before = json.load(fh)
+        self.stdout.write(f"\nvs {before.get('commit') or path}:")
+        for name, now in report['endpoints'].items():
+            old = before.get('endpoints', {}).get(name)
+            if not old:
+                continue
+            change = (now['p50_ms'] - old['p50_ms']) / old['p50_ms'] * 100 if old['p50_ms'] else 0
+            self.stdout.write(
+                f"{name:<22} p50 {old['p50_ms']:>8.2f} -> {now['p50_ms']:>8.2f}ms ({change:+.0f}%)  "
+                f"q/req {old['queries_per_request']} -> {now['queries_per_request']}"
+            )
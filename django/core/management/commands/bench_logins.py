@@ -0,0 +1,69 @@
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import Client, override_settings
+
+from accounts import hashing
+from accounts.models import user_cred
+from core.benchmarking import BENCH_PASSWORD, percentile, scratch_database
+
+
+def _client_loop(requests, results, barrier):
+    client = Client(HTTP_HOST='localhost')
+    body = {'username': 'bench', 'password': BENCH_PASSWORD}
+    barrier.wait()
+    try:
+        for _ in range(requests):
+            t0 = time.perf_counter()
+            status = client.post('/api/accounts/login/', body, content_type='application/json').status_code
+            results.append((status, (time.perf_counter() - t0) * 1000))
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = (
+        "Log in from N concurrent clients against the bounded hashing pool and report "
+        "logins/sec, p50/p99 latency and how many requests were shed with 503"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, nargs='*', default=[1, 4, 16, 64])
+        parser.add_argument('--requests', type=int, default=5, help="Logins per client")
+        parser.add_argument('--workers', type=int, help="Override PASSWORD_HASH_WORKERS")
+        parser.add_argument('--queue', type=int, help="Override PASSWORD_HASH_QUEUE")
+
+    def handle(self, *args, **options):
+        overrides = {}
+        if options['workers'] is not None:
+            overrides['PASSWORD_HASH_WORKERS'] = options['workers']
+        if options['queue'] is not None:
+            overrides['PASSWORD_HASH_QUEUE'] = options['queue']
+        hashing._pool = None  # rebuilt from (overridden) settings on first use
+
+        with override_settings(**overrides), scratch_database():
+            user_cred.objects.create(username='bench', password=hashing.hash_password(BENCH_PASSWORD))
+            for concurrency in options['concurrency']:
+                results = []
+                barrier = threading.Barrier(concurrency + 1)
+                threads = [
+                    threading.Thread(target=_client_loop, args=(options['requests'], results, barrier))
+                    for _ in range(concurrency)
+                ]
+                for thread in threads:
+                    thread.start()
+                barrier.wait()
+                started = time.perf_counter()
+                for thread in threads:
+                    thread.join()
+                elapsed = time.perf_counter() - started
+
+                ok = sorted(ms for status, ms in results if status == 200)
+                shed = sum(1 for status, _ in results if status == 503)
+                self.stdout.write(
+                    f"{concurrency:>4} clients  {len(ok) / elapsed:>7.1f} logins/s  "
+                    f"p50 {percentile(ok, 0.50) if ok else 0:>8.1f}ms  p99 {percentile(ok, 0.99) if ok else 0:>8.1f}ms  "
+                    f"503s {shed}/{len(results)}"
+                )
@@ -0,0 +1,47 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from core.benchmarking import make_careers, make_colleges, scratch_database
+from core.models import Career, College
+from core.renderers import FastJSONRenderer, orjson
+from core.serializers import CareerSerializer, CollegeSerializer, serialize_values
+
+
+def _rate(fn, rows, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return rows / best
+
+
+class Command(BaseCommand):
+    help = "Compare objects/sec of the DRF ModelSerializer path and the values() fast path for catalogue lists"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=20000)
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        rng = random.Random(7)
+        with scratch_database():
+            College.objects.bulk_create(make_colleges(rng, 0, rows), batch_size=2000)
+            Career.objects.bulk_create(make_careers(rng, 0, rows), batch_size=2000)
+
+            for label, model, serializer_class in (
+                ('colleges_list', College, CollegeSerializer),
+                ('careers_list', Career, CareerSerializer),
+            ):
+                qs = model.objects.all
+                drf = _rate(lambda: JSONRenderer().render(serializer_class(qs(), many=True).data), rows, repeat)
+                fast = _rate(lambda: JSONRenderer().render(serialize_values(qs(), serializer_class)), rows, repeat)
+                fast_orjson = _rate(lambda: FastJSONRenderer().render(serialize_values(qs(), serializer_class)), rows, repeat)
+                self.stdout.write(
+                    f"{label:<14} DRF {drf:>10,.0f} obj/s   values() {fast:>10,.0f} obj/s ({fast / drf:.1f}x)   "
+                    f"values()+{'orjson' if orjson else 'json'} {fast_orjson:>10,.0f} obj/s ({fast_orjson / drf:.1f}x)"
+                )
@@ -0,0 +1,78 @@
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import Client
+from django.urls import reverse
+
+from accounts.models import user_cred
+from accounts.views import generate_jwt_token
+from core.benchmarking import percentile, scratch_database
+from core.models import QuizQuestion, QuizResult, QuizRollup, UserProfile
+
+
+def _client_loop(requests, auth, answers, results, barrier):
+    client = Client(HTTP_HOST='localhost', raise_request_exception=False)
+    url = reverse('submit-quiz')
+    barrier.wait()
+    try:
+        for _ in range(requests):
+            t0 = time.perf_counter()
+            status = client.post(url, {'answers': answers},
+                                 content_type='application/json', **auth).status_code
+            results.append((status, (time.perf_counter() - t0) * 1000))
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = (
+        "Submit quizzes for one user from N concurrent clients against a file-backed "
+        "SQLite scratch database; report writes/sec and fail if any update was lost"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, nargs='*', default=[1, 4, 16])
+        parser.add_argument('--requests', type=int, default=20, help="Submits per client")
+
+    def handle(self, *args, **options):
+        lost = failed = 0
+        with tempfile.TemporaryDirectory() as tmp, scratch_database(name=Path(tmp) / 'bench.sqlite3'):
+            self.stdout.write(f"journal_mode={connection.cursor().execute('PRAGMA journal_mode').fetchone()[0]}")
+            answers = [{'questionId': qid, 'answer': 3} for qid in QuizQuestion.objects.values_list('id', flat=True)]
+            for concurrency in options['concurrency']:
+                user = user_cred.objects.create(username=f"bench{concurrency}", password='x')
+                auth = {'HTTP_AUTHORIZATION': f"Bearer {generate_jwt_token(user)}"}
+                results = []
+                barrier = threading.Barrier(concurrency + 1)
+                threads = [
+                    threading.Thread(target=_client_loop, args=(options['requests'], auth, answers, results, barrier))
+                    for _ in range(concurrency)
+                ]
+                rollups_before = sum(QuizRollup.objects.values_list('results', flat=True))
+                for thread in threads:
+                    thread.start()
+                barrier.wait()
+                started = time.perf_counter()
+                for thread in threads:
+                    thread.join()
+                elapsed = time.perf_counter() - started
+
+                ok = sorted(ms for status, ms in results if status == 201)
+                counted = UserProfile.objects.filter(user=user).values_list('completed_quizzes', flat=True).first() or 0
+                stored = QuizResult.objects.filter(user=user).count()
+                rolled = sum(QuizRollup.objects.values_list('results', flat=True)) - rollups_before
+                missing = len(ok) - min(counted, stored, rolled)
+                lost += missing
+                failed += len(results) - len(ok)
+                self.stdout.write(
+                    f"{concurrency:>4} clients  {len(ok) / elapsed:>7.1f} writes/s  "
+                    f"p50 {percentile(ok, 0.50) if ok else 0:>7.1f}ms  p99 {percentile(ok, 0.99) if ok else 0:>7.1f}ms  "
+                    f"failed {len(results) - len(ok)}/{len(results)}  lost {missing}"
+                )
+            connections.close_all()
+        if lost or failed:
+            raise CommandError(f"{failed} submits failed, {lost} missing from profile counts or rollups")
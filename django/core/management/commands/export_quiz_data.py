@@ -0,0 +1,41 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.exports import DATASETS, FORMATS, export_chunks, parse_day
+
+
+class Command(BaseCommand):
+    help = "Stream quiz results or user profiles as CSV/NDJSON (optionally gzipped) with flat memory use"
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=sorted(DATASETS))
+        parser.add_argument('--format', choices=FORMATS, default='csv')
+        parser.add_argument('--from', dest='from', help="First day (YYYY-MM-DD), inclusive")
+        parser.add_argument('--to', help="Last day (YYYY-MM-DD), inclusive")
+        parser.add_argument('--stream', help="Recommended (results) or preferred (profiles) stream")
+        parser.add_argument('--gzip', action='store_true')
+        parser.add_argument('--output', '-o', help="File to write; defaults to stdout")
+
+    def handle(self, *args, **options):
+        try:
+            start, end = parse_day(options, 'from'), parse_day(options, 'to')
+        except ValueError as exc:
+            raise CommandError(exc)
+
+        started = time.perf_counter()
+        written = 0
+        out = open(options['output'], 'wb') if options['output'] else sys.stdout.buffer
+        try:
+            for chunk in export_chunks(options['dataset'], options['format'], start, end,
+                                       options['stream'], options['gzip']):
+                out.write(chunk)
+                written += len(chunk)
+        finally:
+            if options['output']:
+                out.close()
+            else:
+                out.flush()
+        elapsed = time.perf_counter() - started
+        self.stderr.write(f"Wrote {written:,} bytes in {elapsed:.2f}s")
@@ -0,0 +1,46 @@
+import tracemalloc
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.catalogue_import import READERS, TARGETS, CatalogueImporter, open_feed
+
+
+class Command(BaseCommand):
+    help = "Stream a JSON/NDJSON/CSV college or career feed into the catalogue, upserting on the natural key"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Feed file, or '-' for stdin")
+        parser.add_argument('--model', choices=sorted(TARGETS), default='college')
+        parser.add_argument('--format', choices=sorted(READERS), help="Defaults to the file extension")
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--trace-memory', action='store_true', help="Report peak Python memory (slows the import down)")
+
+    def handle(self, *args, **options):
+        try:
+            stream, reader = open_feed(options['path'], options['format'])
+        except (OSError, ValueError) as exc:
+            raise CommandError(exc)
+
+        def progress(read, written, elapsed):
+            if self.verbosity > 1:
+                self.stdout.write(f"  {written} rows upserted, {written / elapsed:,.0f} rows/s")
+
+        self.verbosity = options['verbosity']
+        if options['trace_memory']:
+            tracemalloc.start()
+        importer = CatalogueImporter(options['model'], options['batch_size'], progress)
+        try:
+            with stream:
+                elapsed = importer.run(reader(stream))
+        except ValueError as exc:
+            raise CommandError(f"Bad feed after {importer.read} records: {exc}")
+
+        rate = importer.written / elapsed if elapsed else 0
+        summary = (
+            f"Read {importer.read}, upserted {importer.written}, skipped {importer.skipped} "
+            f"{options['model']} rows in {elapsed:.2f}s ({rate:,.0f} rows/s)"
+        )
+        if options['trace_memory']:
+            summary += f", peak memory {tracemalloc.get_traced_memory()[1] / 2**20:.1f} MiB"
+            tracemalloc.stop()
+        self.stdout.write(self.style.SUCCESS(summary))
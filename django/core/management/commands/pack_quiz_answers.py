@@ -0,0 +1,64 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core import answer_packing, question_bank
+from core.models import QuizResult
+
+
+class Command(BaseCommand):
+    help = "Convert stored quiz answers from client JSON to the packed format and report the space saved"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=5000)
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        question_bank.invalidate()
+        snapshot = question_bank.get_snapshot()
+        if not snapshot.version:
+            raise CommandError("No published question set to pack answers against")
+        started = time.perf_counter()
+        seen = packed = bytes_before = bytes_after = 0
+
+        last_id = 0
+        while True:
+            chunk = list(
+                QuizResult.objects.filter(id__gt=last_id, packed_answers__isnull=True).order_by('id')
+                .only('id', 'answers')[:options['chunk_size']]
+            )
+            if not chunk:
+                break
+            last_id = chunk[-1].id
+            seen += len(chunk)
+
+            updated = []
+            for result in chunk:
+                data = answer_packing.pack(snapshot.question_ids, result.answers or [])
+                if data is None or not result.answers:
+                    continue  # stays as JSON
+                bytes_before += len(json.dumps(result.answers))
+                bytes_after += len(data) + len('[]')
+                result.answers = []
+                result.packed_answers = data
+                result.question_set_version = snapshot.version
+                updated.append(result)
+
+            packed += len(updated)
+            if updated and not options['dry_run']:
+                with transaction.atomic():
+                    QuizResult.objects.bulk_update(
+                        updated, ['answers', 'packed_answers', 'question_set_version'], batch_size=1000
+                    )
+
+        elapsed = time.perf_counter() - started
+        saved = bytes_before - bytes_after
+        self.stdout.write(self.style.SUCCESS(
+            f"Packed {packed} of {seen} unpacked results in {elapsed:.2f}s; answers took {bytes_before:,} bytes, "
+            f"now {bytes_after:,} ({saved:,} saved, {saved / bytes_before * 100 if bytes_before else 0:.0f}%)"
+            + (" [dry run]" if options['dry_run'] else "")
+        ))
+        if packed and not options['dry_run']:
+            self.stdout.write("Run VACUUM (SQLite) or let autovacuum run (PostgreSQL) to return the space to the OS.")
@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core import analytics
+
+
+class Command(BaseCommand):
+    help = "Rebuild the quiz analytics rollups from all stored quiz results"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+
+        def progress(seen):
+            self.stdout.write(f"  {seen} results folded")
+
+        seen = analytics.rebuild(options['chunk_size'], progress=progress if options['verbosity'] > 1 else None)
+        elapsed = time.perf_counter() - started
+        rate = seen / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt rollups from {seen} results in {elapsed:.2f}s, {rate:,.0f} rows/s"))
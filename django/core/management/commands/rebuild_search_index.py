@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from core.models import College
+from core.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuild the college full-text search index from the College table"
+
+    def handle(self, *args, **options):
+        get_search_backend().rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {College.objects.count()} colleges"))
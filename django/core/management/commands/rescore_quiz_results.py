@@ -0,0 +1,64 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core import analytics, answer_packing, question_bank
+from core.models import QuizResult
+
+
+class Command(BaseCommand):
+    help = "Re-score stored quiz results with the current question weights"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=5000)
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        question_bank.invalidate()
+        engine = question_bank.get_snapshot().engine
+        chunk_size = options['chunk_size']
+        started = time.perf_counter()
+        seen = changed = skipped = 0
+
+        last_id = 0
+        while True:
+            chunk = list(
+                QuizResult.objects.filter(id__gt=last_id).order_by('id')
+                .only('id', 'answers', 'packed_answers', 'question_set_version', 'scores', 'recommended_stream')[:chunk_size]
+            )
+            if not chunk:
+                break
+            last_id = chunk[-1].id
+            seen += len(chunk)
+
+            # One matrix product for the whole chunk
+            updated = []
+            answers = [answer_packing.answer_values(r) for r in chunk]
+            for result, scores in zip(chunk, engine.score_many(answers, skip_invalid=True)):
+                if scores is None:
+                    skipped += 1  # legacy answers outside the answer scale; left as stored
+                    continue
+                if not any(scores.values()):
+                    continue  # answers predate question ids; nothing to re-score
+                stream = engine.recommend(scores)
+                if scores != result.scores or stream != result.recommended_stream:
+                    result.scores = scores
+                    result.recommended_stream = stream
+                    updated.append(result)
+
+            changed += len(updated)
+            if updated and not options['dry_run']:
+                with transaction.atomic():
+                    QuizResult.objects.bulk_update(updated, ['scores', 'recommended_stream'], batch_size=1000)
+
+        if changed and not options['dry_run']:
+            analytics.rebuild(chunk_size)  # streams and scores moved between rollups
+
+        elapsed = time.perf_counter() - started
+        rate = seen / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Re-scored {seen} results ({changed} changed, {skipped} skipped as invalid) "
+            f"in {elapsed:.2f}s, {rate:,.0f} rows/s"
+            + (" [dry run]" if options['dry_run'] else "")
+        ))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.models import QuestionSet, QuizQuestion
+from core.quiz_defaults import DEFAULT_QUESTIONS
+
+
+class Command(BaseCommand):
+    help = "Load the default quiz questions (if missing) and publish a new question set version"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--replace', action='store_true', help="Delete existing questions first")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if options['replace']:
+                QuizQuestion.objects.all().delete()
+            if not QuizQuestion.objects.exists():
+                QuizQuestion.objects.bulk_create(QuizQuestion(**q) for q in DEFAULT_QUESTIONS)
+            question_set = QuestionSet.publish()
+        self.stdout.write(self.style.SUCCESS(
+            f"Published question set v{question_set.version} ({len(question_set.question_ids)} questions)"
+        ))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the primary SQLite database over a stand-in replica (online backup), "
+        "for trying DATABASE_REPLICAS locally"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('aliases', nargs='*', default=['replica'], help="Replica aliases to overwrite")
+
+    def handle(self, *args, **options):
+        primary = connections[DEFAULT_DB_ALIAS]
+        for alias in options['aliases']:
+            if alias == DEFAULT_DB_ALIAS or alias not in connections:
+                raise CommandError(f"'{alias}' is not a replica alias in DATABASES")
+            replica = connections[alias]
+            if primary.vendor != 'sqlite' or replica.vendor != 'sqlite':
+                raise CommandError("sync_replica only copies SQLite files; real replicas are fed by the database")
+
+            primary.ensure_connection()
+            replica.ensure_connection()
+            # sqlite3's backup API copies a consistent snapshot while writers carry on
+            primary.connection.backup(replica.connection)
+            replica.close()
+            self.stdout.write(self.style.SUCCESS(f"Copied {primary.settings_dict['NAME']} to {replica.settings_dict['NAME']}"))
@@ -0,0 +1,188 @@
+# core/middleware.py
+import json
+import logging
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.handlers.asgi import ASGIRequest
+from django.db import connections
+from django.utils.cache import patch_vary_headers
+
+from accounts.auth_utils import aget_user_from_token, get_user_from_token
+
+from . import compression, db_routing, instrumentation
+
+logger = logging.getLogger('core.request_timing')
+
+
+class RequestTimingMiddleware:
+    """
+    Record DB queries/time, serializer, render and total time per request.
+
+    Emits a ``Server-Timing`` header and one structured log line, and warns
+    when one SQL shape runs more than ``REQUEST_TIMING_N_PLUS_ONE_THRESHOLD``
+    times. Disabled (``REQUEST_TIMING_ENABLED = False``) it removes itself
+    from the middleware chain at startup.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_TIMING_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.threshold = getattr(settings, 'REQUEST_TIMING_N_PLUS_ONE_THRESHOLD', 5)
+        instrumentation.instrument_drf()
+
+    def __call__(self, request):
+        stats, token = instrumentation.start()
+        try:
+            with ExitStack() as stack:
+                for conn in connections.all():
+                    stack.enter_context(conn.execute_wrapper(stats.db_wrapper))
+                response = self.get_response(request)
+        finally:
+            instrumentation.stop(token)
+
+        total_ms = (time.perf_counter() - stats.started) * 1000
+        repeated = stats.repeated_queries(self.threshold)
+        response['Server-Timing'] = self.server_timing(stats, total_ms, repeated)
+        self.log(request, response, stats, total_ms, repeated)
+        return response
+
+    @staticmethod
+    def server_timing(stats, total_ms, repeated):
+        metrics = [f'db;dur={stats.db_ms:.2f};desc="{stats.db_queries} queries"']
+        metrics += [f'{name};dur={ms:.2f}' for name, ms in sorted(stats.spans.items())]
+        if repeated:
+            metrics.append(f'n-plus-one;desc="{len(repeated)} repeated queries"')
+        metrics.append(f'total;dur={total_ms:.2f}')
+        return ', '.join(metrics)
+
+    @staticmethod
+    def log(request, response, stats, total_ms, repeated):
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'total_ms': round(total_ms, 2),
+            'db_ms': round(stats.db_ms, 2),
+            'db_queries': stats.db_queries,
+            **{f'{name}_ms': round(ms, 2) for name, ms in stats.spans.items()},
+        }
+        if response.has_header('X-Cache'):
+            record['cache'] = response['X-Cache']
+        if repeated:
+            record['n_plus_one'] = [{'sql': sql, 'count': n} for sql, n in repeated]
+            logger.warning(json.dumps(record))
+        else:
+            logger.info(json.dumps(record))
+
+
+class ASGIURLConfMiddleware:
+    """
+    Route ASGI requests through ``ASGI_ROOT_URLCONF`` (the native async views).
+
+    WSGI requests keep ``ROOT_URLCONF``, so the same settings module serves
+    both. Without ``ASGI_ROOT_URLCONF`` it removes itself at startup.
+    """
+
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.urlconf = getattr(settings, 'ASGI_ROOT_URLCONF', None)
+        if not self.urlconf:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if isinstance(request, ASGIRequest):
+            request.urlconf = self.urlconf
+        return self.get_response(request)
+
+
+class PrimaryAfterWriteMiddleware:
+    """
+    Pin the token user to the primary database after a successful write.
+
+    See ``core.db_routing``. Without ``DATABASE_REPLICAS`` it removes itself
+    at startup.
+    """
+
+    async_capable = True
+    sync_capable = True
+
+    SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+    def __init__(self, get_response):
+        if not db_routing.replicas():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def wrote(self, request, response):
+        return request.method not in self.SAFE_METHODS and response.status_code < 400
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        response = self.get_response(request)
+        if self.wrote(request, response):
+            # Usually free: the view already resolved the token onto the request
+            user = get_user_from_token(request)
+            if user is not None:
+                db_routing.pin_to_primary(user)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if self.wrote(request, response):
+            user = await aget_user_from_token(request)
+            if user is not None:
+                db_routing.pin_to_primary(user)
+        return response
+
+
+class CompressionMiddleware:
+    """
+    gzip/brotli-compress large text and JSON responses (see ``core.compression``).
+
+    Responses under ``COMPRESSION_MIN_SIZE`` bytes, streaming responses and
+    ones that are already encoded (e.g. ``@precompressed`` views) pass through.
+    """
+
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.process(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.process(request, await self.get_response(request))
+
+    @staticmethod
+    def process(request, response):
+        if not compression.compressible(response):
+            return response
+        coding = compression.negotiate(request)
+        if coding is None:
+            patch_vary_headers(response, ('Accept-Encoding',))
+            return response
+        body = compression.compress(response.content, coding, compression.DYNAMIC_LEVELS[coding])
+        if len(body) >= len(response.content):
+            return response
+        return compression.encode(response, body, coding)
@@ -0,0 +1,31 @@
+from django.db import migrations
+
+
+def create_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        'CREATE VIRTUAL TABLE IF NOT EXISTS core_college_fts USING fts5('
+        'name, location, college_type, tokenize="unicode61 remove_diacritics 2")'
+    )
+    schema_editor.execute(
+        'INSERT INTO core_college_fts(rowid, name, location, college_type) '
+        'SELECT id, name, location, college_type FROM core_college'
+    )
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute('DROP TABLE IF EXISTS core_college_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_remove_college_type'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts, drop_fts),
+    ]
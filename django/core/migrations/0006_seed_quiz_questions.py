@@ -0,0 +1,25 @@
+from django.db import migrations
+
+from core.quiz_defaults import DEFAULT_QUESTIONS
+
+
+def seed(apps, schema_editor):
+    QuizQuestion = apps.get_model('core', 'QuizQuestion')
+    QuestionSet = apps.get_model('core', 'QuestionSet')
+    db = schema_editor.connection.alias
+    if not QuizQuestion.objects.using(db).exists():
+        QuizQuestion.objects.using(db).bulk_create(QuizQuestion(**q) for q in DEFAULT_QUESTIONS)
+    if not QuestionSet.objects.using(db).exists():
+        ids = list(QuizQuestion.objects.using(db).order_by('id').values_list('id', flat=True))
+        QuestionSet.objects.using(db).create(version=1, question_ids=ids)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_questionset'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed, migrations.RunPython.noop),
+    ]
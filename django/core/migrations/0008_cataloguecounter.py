@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:10
+
+from django.db import migrations, models
+
+
+def count_catalogue(apps, schema_editor):
+    CatalogueCounter = apps.get_model('core', 'CatalogueCounter')
+    db = schema_editor.connection.alias
+    for name, model in (('colleges', 'College'), ('careers', 'Career')):
+        count = apps.get_model('core', model).objects.using(db).count()
+        CatalogueCounter.objects.using(db).update_or_create(name=name, defaults={'value': count})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_quizquestion_weight'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogueCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(count_catalogue, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_dataversion'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='career',
+            constraint=models.UniqueConstraint(fields=('title',), name='career_natural_key'),
+        ),
+        migrations.AddConstraint(
+            model_name='college',
+            constraint=models.UniqueConstraint(fields=('name', 'location'), name='college_natural_key'),
+        ),
+    ]
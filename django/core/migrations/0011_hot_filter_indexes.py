@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:17
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('core', '0010_catalogue_natural_keys'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='college',
+            index=models.Index(django.db.models.functions.text.Lower('college_type'), name='college_type_ci_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quizresult',
+            index=models.Index(fields=['user', 'created_at'], name='quizresult_user_created_idx'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:26
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def fold_history(apps, schema_editor):
+    # Same fold as core.analytics.rebuild, against the historical models
+    QuizResult = apps.get_model('core', 'QuizResult')
+    QuizRollup = apps.get_model('core', 'QuizRollup')
+    db = schema_editor.connection.alias
+    rollups = {}
+    rows = QuizResult.objects.using(db).order_by('id').values_list('created_at', 'recommended_stream', 'scores')
+    for created_at, stream, scores in rows.iterator(chunk_size=5000):
+        key = (timezone.localdate(created_at), stream)
+        rollup = rollups.setdefault(key, QuizRollup(day=key[0], stream=stream, results=0, score_sums={}, score_counts={}))
+        rollup.results += 1
+        for category, value in (scores or {}).items():
+            rollup.score_sums[category] = rollup.score_sums.get(category, 0) + value
+            rollup.score_counts[category] = rollup.score_counts.get(category, 0) + 1
+    QuizRollup.objects.using(db).bulk_create(rollups.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_hot_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuizRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('stream', models.CharField(max_length=100)),
+                ('results', models.BigIntegerField(default=0)),
+                ('score_sums', models.JSONField(default=dict)),
+                ('score_counts', models.JSONField(default=dict)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('day', 'stream'), name='quizrollup_day_stream')],
+            },
+        ),
+        migrations.RunPython(fold_history, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_quizrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='career',
+            name='streams',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
@@ -0,0 +1,101 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:28
+
+import django.db.models.deletion
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def split_and_count(apps, schema_editor):
+    # Same as College.split_location / CollegeFacility.sync / CollegeFacet.rebuild
+    College = apps.get_model('core', 'College')
+    CollegeFacility = apps.get_model('core', 'CollegeFacility')
+    CollegeFacet = apps.get_model('core', 'CollegeFacet')
+    db = schema_editor.connection.alias
+
+    colleges, facilities = [], []
+    for college in College.objects.using(db).only('id', 'location', 'facilities').iterator(chunk_size=2000):
+        city, _, state = (college.location or '').rpartition(',')
+        college.city, college.state = (city.strip(), state.strip()) if city else (state.strip(), '')
+        colleges.append(college)
+        seen = set()
+        for name in college.facilities or ():
+            name = str(name).strip()
+            if name and name not in seen:
+                seen.add(name)
+                facilities.append(CollegeFacility(college_id=college.id, name=name))
+    College.objects.using(db).bulk_update(colleges, ['city', 'state'], batch_size=1000)
+    CollegeFacility.objects.using(db).bulk_create(facilities, batch_size=2000)
+
+    facets = [
+        CollegeFacet(facet=facet, value=value, count=n)
+        for facet, rows in (
+            ('state', College.objects.using(db).exclude(state='').values_list('state')),
+            ('type', College.objects.using(db).exclude(college_type='').values_list('college_type')),
+            ('facility', CollegeFacility.objects.using(db).values_list('name')),
+        )
+        for value, n in rows.annotate(n=Count('id'))
+    ]
+    CollegeFacet.objects.using(db).bulk_create(facets, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_career_streams'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CollegeFacet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('facet', models.CharField(max_length=20)),
+                ('value', models.CharField(max_length=100)),
+                ('count', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CollegeFacility',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='college',
+            name='city',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='college',
+            name='state',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+        migrations.AddIndex(
+            model_name='college',
+            index=models.Index(django.db.models.functions.text.Lower('state'), name='college_state_ci_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='college',
+            index=models.Index(django.db.models.functions.text.Lower('city'), name='college_city_ci_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='collegefacet',
+            constraint=models.UniqueConstraint(fields=('facet', 'value'), name='collegefacet_unique'),
+        ),
+        migrations.AddField(
+            model_name='collegefacility',
+            name='college',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='facility_rows', to='core.college'),
+        ),
+        migrations.AddIndex(
+            model_name='collegefacility',
+            index=models.Index(django.db.models.functions.text.Lower('name'), models.F('college'), name='collegefacility_name_ci_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='collegefacility',
+            constraint=models.UniqueConstraint(fields=('college', 'name'), name='collegefacility_unique'),
+        ),
+        migrations.RunPython(split_and_count, migrations.RunPython.noop),
+    ]
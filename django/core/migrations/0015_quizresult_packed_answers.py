@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_college_facets'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizresult',
+            name='packed_answers',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='quizresult',
+            name='question_set_version',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='quizresult',
+            name='answers',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
@@ -1,4 +1,7 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F
+from django.db.models.functions import Lower
+from django.utils import timezone
 from accounts.models import user_cred
 
 class Career(models.Model):
@@ -6,49 +9,321 @@ class Career(models.Model):
     description = models.TextField()
     demand = models.IntegerField(default=0)
     skills_required = models.JSONField(default=list, blank=True)
+    streams = models.JSONField(default=list, blank=True)  # quiz categories this career fits, e.g. ["medical"]
     salary_range = models.CharField(max_length=100, blank=True)
     growth_prospects = models.TextField(blank=True)
 
+    class Meta:
+        constraints = [
+            # natural key used by the import_catalogue upsert
+            models.UniqueConstraint(fields=['title'], name='career_natural_key'),
+        ]
+
     def __str__(self):
         return self.title
 
+class CollegeQuerySet(models.QuerySet):
+    def _iexact(self, field, value):
+        # Lower(field) = value, so the matching Lower() index can be used
+        return self.alias(**{f'{field}_ci': Lower(field)}).filter(**{f'{field}_ci': value.lower()})
+
+    def of_type(self, college_type):
+        """Case-insensitive type match that can use college_type_ci_idx"""
+        return self._iexact('college_type', college_type)
+
+    def in_state(self, state):
+        return self._iexact('state', state)
+
+    def in_city(self, city):
+        return self._iexact('city', city)
+
+    def with_facility(self, facility):
+        matches = CollegeFacility.objects.alias(name_ci=Lower('name')).filter(name_ci=facility.lower())
+        return self.filter(id__in=matches.values('college_id'))
+
+
 class College(models.Model):
     name = models.CharField(max_length=100)
     location = models.CharField(max_length=100)
+    # "City, State" split out of location on save (see split_location)
+    city = models.CharField(max_length=100, blank=True, default='')
+    state = models.CharField(max_length=100, blank=True, default='')
     website = models.URLField(blank=True)
     college_type = models.CharField(max_length=50, default='Government')
     fees = models.CharField(max_length=100, blank=True)
     facilities = models.JSONField(default=list, blank=True)
     cutoff_marks = models.CharField(max_length=100, blank=True)
     # type =models.CharField(max_length=50,default='Engineeering')
-    
+
+    objects = CollegeQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            # natural key used by the import_catalogue upsert
+            models.UniqueConstraint(fields=['name', 'location'], name='college_natural_key'),
+        ]
+        indexes = [
+            models.Index(Lower('college_type'), name='college_type_ci_idx'),
+            models.Index(Lower('state'), name='college_state_ci_idx'),
+            models.Index(Lower('city'), name='college_city_ci_idx'),
+        ]
+
+    @staticmethod
+    def split_location(location):
+        """'Madurai, Tamil Nadu' -> ('Madurai', 'Tamil Nadu'); no comma means city only"""
+        city, _, state = (location or '').rpartition(',')
+        if not city:
+            return state.strip(), ''
+        return city.strip(), state.strip()
+
+    def facet_keys(self):
+        """``{(facet, value)}`` this college counts towards in CollegeFacet"""
+        keys = {('facility', name) for name in facility_names(self.facilities)}
+        if self.state:
+            keys.add(('state', self.state))
+        if self.college_type:
+            keys.add(('type', self.college_type))
+        return keys
+
     def __str__(self):
         return self.name
 
+
+def facility_names(facilities):
+    """Distinct, stripped facility names from a College.facilities list"""
+    names = []
+    for name in facilities or ():
+        name = str(name).strip()
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+class CollegeFacility(models.Model):
+    """One row per (college, facility): College.facilities as an indexed join table"""
+    college = models.ForeignKey(College, on_delete=models.CASCADE, related_name='facility_rows')
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['college', 'name'], name='collegefacility_unique'),
+        ]
+        indexes = [
+            models.Index(Lower('name'), 'college', name='collegefacility_name_ci_idx'),
+        ]
+
+    @classmethod
+    def sync(cls, colleges):
+        """Replace the rows of ``colleges`` with their current facilities lists"""
+        colleges = list(colleges)
+        cls.objects.filter(college__in=[c.pk for c in colleges]).delete()
+        cls.objects.bulk_create(
+            (cls(college_id=c.pk, name=name) for c in colleges for name in facility_names(c.facilities)),
+            batch_size=2000,
+        )
+
+    def __str__(self):
+        return f"{self.college_id}: {self.name}"
+
+
+class CollegeFacet(models.Model):
+    """Number of colleges per state, type and facility (kept current by core.signals)"""
+    FACETS = ('state', 'type', 'facility')
+
+    facet = models.CharField(max_length=20)
+    value = models.CharField(max_length=100)
+    count = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['facet', 'value'], name='collegefacet_unique'),
+        ]
+
+    @classmethod
+    def apply(cls, removed=(), added=()):
+        """Move counts for a college whose facet keys changed from ``removed`` to ``added``"""
+        removed, added = set(removed), set(added)
+        for delta, keys in ((-1, removed - added), (1, added - removed)):
+            for facet, value in keys:
+                if not cls.objects.filter(facet=facet, value=value).update(count=F('count') + delta):
+                    cls.objects.get_or_create(facet=facet, value=value, defaults={'count': max(delta, 0)})
+
+    @classmethod
+    def rebuild(cls):
+        """Recount from the tables, e.g. after a bulk load that skipped signals"""
+        rows = [
+            cls(facet='state', value=value, count=n)
+            for value, n in College.objects.exclude(state='').values_list('state').annotate(n=Count('id'))
+        ]
+        rows += [
+            cls(facet='type', value=value, count=n)
+            for value, n in College.objects.exclude(college_type='').values_list('college_type').annotate(n=Count('id'))
+        ]
+        rows += [
+            cls(facet='facility', value=value, count=n)
+            for value, n in CollegeFacility.objects.values_list('name').annotate(n=Count('id'))
+        ]
+        with transaction.atomic():
+            cls.objects.all().delete()
+            cls.objects.bulk_create(rows, batch_size=1000)
+
+    @classmethod
+    def counts(cls):
+        """``{facet: {value: count}}``, largest first"""
+        data = {facet: {} for facet in cls.FACETS}
+        rows = cls.objects.filter(count__gt=0).order_by('facet', '-count', 'value')
+        for facet, value, count in rows.values_list('facet', 'value', 'count'):
+            data.setdefault(facet, {})[value] = count
+        return data
+
+    def __str__(self):
+        return f"{self.facet}={self.value}: {self.count}"
+
 class QuizQuestion(models.Model):
     question = models.CharField(max_length=255)
     category = models.CharField(max_length=50)  # medical, engineering, etc.
     subject = models.CharField(max_length=100, blank=True)
+    weight = models.FloatField(default=1.0)  # how much an answer counts towards its category
     
     def __str__(self):
         return self.question
 
+class QuestionSet(models.Model):
+    """An immutable published version of the quiz (question ids in order)"""
+    version = models.PositiveIntegerField(unique=True)
+    question_ids = models.JSONField(default=list)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    @classmethod
+    def publish(cls):
+        """Record the current question table as a new version"""
+        latest = cls.objects.order_by('-version').values_list('version', flat=True).first() or 0
+        ids = list(QuizQuestion.objects.order_by('id').values_list('id', flat=True))
+        return cls.objects.create(version=latest + 1, question_ids=ids)
+
+    def __str__(self):
+        return f"Question set v{self.version}"
+
 class QuizResult(models.Model):
     user = models.ForeignKey(user_cred, on_delete=models.CASCADE)
     scores = models.JSONField()
-    answers = models.JSONField()
+    answers = models.JSONField(default=list, blank=True)  # as submitted; empty when packed
+    # One byte per question of QuestionSet version question_set_version (see core.answer_packing)
+    packed_answers = models.BinaryField(null=True, blank=True)
+    question_set_version = models.PositiveIntegerField(null=True, blank=True)
     recommended_stream = models.CharField(max_length=100)
     created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # my_results / user_dashboard: WHERE user_id = ? ORDER BY created_at DESC, id DESC
+            models.Index(fields=['user', 'created_at'], name='quizresult_user_created_idx'),
+            # Admin and export date ranges
+            models.Index(fields=['created_at'], name='quizresult_created_idx'),
+        ]
     
     def __str__(self):
         return f"Result for {self.user.username} - {self.recommended_stream}"
 
+class QuizRollup(models.Model):
+    """Quiz results per day x recommended stream, with per-category score sums (see core.analytics)"""
+    day = models.DateField()
+    stream = models.CharField(max_length=100)
+    results = models.BigIntegerField(default=0)
+    score_sums = models.JSONField(default=dict)  # category -> sum of scores
+    score_counts = models.JSONField(default=dict)  # category -> results that scored it
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'stream'], name='quizrollup_day_stream'),
+        ]
+
+    def add(self, scores):
+        """Fold one result's ``{category: score}`` into the sums (not saved)"""
+        self.results += 1
+        for category, value in scores.items():
+            self.score_sums[category] = self.score_sums.get(category, 0) + value
+            self.score_counts[category] = self.score_counts.get(category, 0) + 1
+
+    def __str__(self):
+        return f"{self.day} {self.stream}: {self.results}"
+
 class UserProfile(models.Model):
     user = models.OneToOneField(user_cred, on_delete=models.CASCADE)
     preferred_stream = models.CharField(max_length=100, blank=True)
     interests = models.JSONField(default=list, blank=True)
     completed_quizzes = models.IntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Admin and export date ranges
+            models.Index(fields=['created_at'], name='userprofile_created_idx'),
+        ]
     
     def __str__(self):
-        return f"Profile for {self.user.username}"
\ No newline at end of file
+        return f"Profile for {self.user.username}"
+
+class CatalogueCounter(models.Model):
+    """Maintained row counts for catalogue tables (kept current by core.signals)"""
+    name = models.CharField(max_length=50, unique=True)
+    value = models.BigIntegerField(default=0)
+
+    COUNTED = {'colleges': College, 'careers': Career}
+
+    @classmethod
+    def bump(cls, name, delta):
+        if not cls.objects.filter(name=name).update(value=F('value') + delta):
+            cls.recount(name)
+
+    @classmethod
+    def recount(cls, *names):
+        """Recompute from the tables, e.g. after a bulk load that skipped signals"""
+        for name in names or cls.COUNTED:
+            cls.objects.update_or_create(name=name, defaults={'value': cls.COUNTED[name].objects.count()})
+
+    @classmethod
+    def totals(cls):
+        values = dict(cls.objects.filter(name__in=cls.COUNTED).values_list('name', 'value'))
+        return {name: values.get(name, 0) for name in cls.COUNTED}
+
+    @classmethod
+    async def atotals(cls):
+        values = {name: value async for name, value in cls.objects.filter(name__in=cls.COUNTED).values_list('name', 'value')}
+        return {name: values.get(name, 0) for name in cls.COUNTED}
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
+
+
+class DataVersion(models.Model):
+    """Change counter per table, used as the ETag/Last-Modified of its endpoints"""
+    name = models.CharField(max_length=50, unique=True)
+    version = models.BigIntegerField(default=1)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    @classmethod
+    def bump(cls, name):
+        now = timezone.now()
+        if not cls.objects.filter(name=name).update(version=F('version') + 1, changed_at=now):
+            cls.objects.get_or_create(name=name, defaults={'changed_at': now})
+
+    @classmethod
+    def current(cls, name):
+        """Return ``(version, changed_at)``, creating the row on first use"""
+        row = cls.objects.filter(name=name).values_list('version', 'changed_at').first()
+        if row is None:
+            obj, _ = cls.objects.get_or_create(name=name)
+            row = (obj.version, obj.changed_at)
+        return row
+
+    @classmethod
+    async def acurrent(cls, name):
+        row = await cls.objects.filter(name=name).values_list('version', 'changed_at').afirst()
+        if row is None:
+            obj, _ = await cls.objects.aget_or_create(name=name)
+            row = (obj.version, obj.changed_at)
+        return row
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
@@ -0,0 +1,146 @@
+# core/pagination.py
+"""Opt-in keyset (cursor) pagination for the list endpoints.
+
+A request is paginated when it carries ``limit`` or ``cursor``; otherwise the
+view keeps returning the bare list the frontend already expects. Cursors hold
+the sort key of the last row served, so page N costs the same as page 1
+(no OFFSET scan).
+"""
+import base64
+import datetime
+import json
+
+from django.db.models import Q
+from rest_framework.exceptions import ParseError
+from rest_framework.response import Response
+
+from .serializers import aserialize_values, serialize_values
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def _encode_key(value):
+    # Full isoformat: DjangoJSONEncoder drops microseconds, which would make
+    # rows created in the same millisecond fall between two pages.
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_cursor(position):
+    raw = json.dumps(position, default=_encode_key, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return the decoded cursor position, or None if it is malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        return json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        return None
+
+
+def wants_page(request):
+    return 'limit' in request.GET or 'cursor' in request.GET
+
+
+def page_params(request, width):
+    """Parse ``limit``/``cursor``; the cursor must hold ``width`` key values"""
+    try:
+        limit = min(max(int(request.GET.get('limit', DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+    except ValueError:
+        raise ParseError('Invalid limit')
+
+    position = None
+    cursor = request.GET.get('cursor')
+    if cursor:
+        position = decode_cursor(cursor)
+        if not isinstance(position, list) or len(position) != width:
+            raise ParseError('Invalid cursor')
+    return limit, position
+
+
+def next_link(request, position):
+    query = request.GET.copy()
+    query['cursor'] = encode_cursor(position)
+    return request.build_absolute_uri(f"{request.path}?{query.urlencode()}")
+
+
+def page_body(request, data, next_position):
+    next_url = next_link(request, next_position) if next_position is not None else None
+    return {'results': data, 'next': next_url}
+
+
+def page_response(request, data, next_position):
+    return Response(page_body(request, data, next_position))
+
+
+def _after(queryset, ordering, position):
+    """Filter to rows strictly after ``position`` in ``ordering``"""
+    model = queryset.model
+    condition = Q()
+    equal = {}
+    for key, raw in zip(ordering, position):
+        name = key.lstrip('-')
+        try:
+            value = model._meta.get_field(name).to_python(raw)
+        except Exception:
+            raise ParseError('Invalid cursor')
+        op = 'lt' if key.startswith('-') else 'gt'
+        condition |= Q(**equal, **{f'{name}__{op}': value})
+        equal[name] = value
+    return queryset.filter(condition)
+
+
+def _page_window(request, queryset, ordering):
+    """Return ``(limit, queryset)`` sliced to one row past the requested page"""
+    limit, position = page_params(request, len(ordering))
+    queryset = queryset.order_by(*ordering)
+    if position is not None:
+        queryset = _after(queryset, ordering, position)
+    return limit, queryset[:limit + 1]
+
+
+def _trim(rows, limit, ordering, key_of):
+    next_position = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_position = [key_of(rows[-1], key.lstrip('-')) for key in ordering]
+    return rows, next_position
+
+
+def keyset_page(request, queryset, ordering, serializer_class, fast=False):
+    """
+    Serve one page of ``queryset`` sorted by ``ordering``.
+
+    ``ordering`` must end in a unique column (``id``) so the key is stable.
+    ``fast`` serializes through ``serialize_values`` (read-only endpoints).
+    """
+    limit, window = _page_window(request, queryset, ordering)
+    if fast:
+        rows, next_position = _trim(serialize_values(window, serializer_class), limit, ordering, dict.__getitem__)
+        data = rows
+    else:
+        rows, next_position = _trim(list(window), limit, ordering, getattr)
+        data = serializer_class(rows, many=True).data
+    return page_response(request, data, next_position)
+
+
+async def akeyset_page_body(request, queryset, ordering, serializer_class, fast=False, prepare=None):
+    """
+    Async twin of keyset_page for the ASGI views; returns the body dict.
+
+    ``prepare(rows)`` is awaited for the serializer context when its fields
+    need data that must be loaded asynchronously first.
+    """
+    limit, window = _page_window(request, queryset, ordering)
+    if fast:
+        rows, next_position = _trim(await aserialize_values(window, serializer_class), limit, ordering, dict.__getitem__)
+        data = rows
+    else:
+        rows, next_position = _trim([obj async for obj in window], limit, ordering, getattr)
+        context = await prepare(rows) if prepare else {}
+        data = serializer_class(rows, many=True, context=context).data
+    return page_body(request, data, next_position)
@@ -0,0 +1,110 @@
+# core/question_bank.py
+"""In-process snapshot of the published quiz.
+
+The snapshot (questions, their rendered JSON and the scoring engine) is
+built once per ``QuestionSet`` version and shared by every request in the
+process. Edits in this process invalidate it straight away; other processes
+notice the new version within ``QUESTION_SET_RECHECK_SECONDS``.
+"""
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.renderers import JSONRenderer
+
+from .models import QuestionSet, QuizQuestion
+from .scoring import ScoringEngine
+
+
+@dataclass(frozen=True)
+class QuestionSnapshot:
+    version: int
+    published_at: object  # datetime of the QuestionSet, None before the first one
+    question_ids: tuple
+    categories: dict  # question id -> category, as shown to the client
+    payload: bytes
+    engine: ScoringEngine
+
+
+_lock = threading.Lock()
+_snapshot = None
+_checked_at = 0.0
+
+
+def _compile(version, published_at):
+    from .serializers import QuizQuestionSerializer
+
+    questions = list(QuizQuestion.objects.using(DEFAULT_DB_ALIAS).order_by('id'))
+    return QuestionSnapshot(
+        version=version,
+        published_at=published_at,
+        question_ids=tuple(q.id for q in questions),
+        categories={q.id: q.category for q in questions},
+        payload=JSONRenderer().render(QuizQuestionSerializer(questions, many=True).data),
+        engine=ScoringEngine.from_questions(questions),
+    )
+
+
+def _latest_version():
+    # Always the primary: a lagging replica would pin the old quiz for a whole
+    # recheck interval, or compile a snapshot that misses a just-published set
+    return QuestionSet.objects.using(DEFAULT_DB_ALIAS).order_by('-version').values_list('version', 'created_at').first() or (0, None)
+
+
+def get_snapshot():
+    global _snapshot, _checked_at
+    interval = getattr(settings, 'QUESTION_SET_RECHECK_SECONDS', 5)
+    snapshot = _snapshot
+    if snapshot is not None and time.monotonic() - _checked_at < interval:
+        return snapshot
+
+    with _lock:
+        if _snapshot is not None and time.monotonic() - _checked_at < interval:
+            return _snapshot
+        version, published_at = _latest_version()
+        if _snapshot is None or _snapshot.version != version:
+            _snapshot = _compile(version, published_at)
+        _checked_at = time.monotonic()
+        return _snapshot
+
+
+async def aget_snapshot():
+    """get_snapshot() for async views; only leaves the event loop to re-check"""
+    interval = getattr(settings, 'QUESTION_SET_RECHECK_SECONDS', 5)
+    snapshot = _snapshot
+    if snapshot is not None and time.monotonic() - _checked_at < interval:
+        return snapshot
+    return await sync_to_async(get_snapshot)()
+
+
+@lru_cache(maxsize=64)
+def _published_ids(version):
+    # QuestionSet rows never change once published, so this never goes stale;
+    # read the primary so a replica miss is not cached as "unknown"
+    ids = QuestionSet.objects.using(DEFAULT_DB_ALIAS).filter(version=version).values_list('question_ids', flat=True).first()
+    return tuple(ids) if ids is not None else None
+
+
+def question_ids(version, snapshot=None):
+    """Question ids, in order, of published version ``version`` (None if unknown)"""
+    snapshot = snapshot or get_snapshot()
+    if snapshot.version == version:
+        return snapshot.question_ids
+    return _published_ids(version)
+
+
+async def aquestion_ids(version, snapshot=None):
+    snapshot = snapshot or await aget_snapshot()
+    if snapshot.version == version:
+        return snapshot.question_ids
+    return await sync_to_async(_published_ids)(version)
+
+
+def invalidate():
+    global _snapshot
+    with _lock:
+        _snapshot = None
@@ -0,0 +1,39 @@
+# core/quiz_defaults.py
+"""The stock 25-question quiz, seeded by migration 0006 / ``seed_quiz_questions``."""
+
+DEFAULT_QUESTIONS = [
+    # Medical
+    {"question": "I enjoy understanding how living organisms function and interact with their environment.", "category": "medical", "subject": "Biology"},
+    {"question": "I am curious about the human body, diseases, and medical treatments.", "category": "medical", "subject": "Medical Science"},
+    {"question": "I find it interesting to study anatomy, physiology, and how medications work.", "category": "medical", "subject": "Health Sciences"},
+    {"question": "I am passionate about helping people recover from illnesses and maintaining good health.", "category": "medical", "subject": "Healthcare"},
+    {"question": "I enjoy studying genetics, microbiology, and biochemical processes.", "category": "medical", "subject": "Life Sciences"},
+
+    # Engineering
+    {"question": "I am interested in understanding the laws of motion, energy, and matter.", "category": "engineering", "subject": "Physics"},
+    {"question": "I enjoy solving mathematical problems and working with numbers and formulas.", "category": "engineering", "subject": "Mathematics"},
+    {"question": "I find it fascinating to conduct experiments and observe chemical reactions.", "category": "engineering", "subject": "Chemistry"},
+    {"question": "I am interested in building and designing mechanical systems or structures.", "category": "engineering", "subject": "Engineering Design"},
+    {"question": "I enjoy understanding how machines work and solving technical problems.", "category": "engineering", "subject": "Applied Sciences"},
+
+    # Technology
+    {"question": "I enjoy working with computers and learning about new software applications.", "category": "technology", "subject": "Computer Science"},
+    {"question": "I like creating websites, mobile apps, or digital solutions to problems.", "category": "technology", "subject": "Information Technology"},
+    {"question": "I am fascinated by robotics, artificial intelligence, and automation.", "category": "technology", "subject": "Advanced Technology"},
+    {"question": "I enjoy analyzing data and finding patterns in large datasets.", "category": "technology", "subject": "Data Science"},
+    {"question": "I am interested in cybersecurity, networks, and protecting digital information.", "category": "technology", "subject": "Information Security"},
+
+    # Arts
+    {"question": "I enjoy reading literature, writing stories, or analyzing texts.", "category": "arts", "subject": "Literature/Language"},
+    {"question": "I am interested in understanding different cultures, societies, and human behavior.", "category": "arts", "subject": "Social Studies"},
+    {"question": "I enjoy learning about historical events and their impact on the present.", "category": "arts", "subject": "History"},
+    {"question": "I am interested in geography, maps, and understanding different places.", "category": "arts", "subject": "Geography"},
+    {"question": "I enjoy creative activities like drawing, painting, music, or performing arts.", "category": "arts", "subject": "Creative Arts"},
+
+    # Commerce
+    {"question": "I am interested in understanding how businesses operate and make decisions.", "category": "commerce", "subject": "Business Studies"},
+    {"question": "I enjoy working with financial data, budgets, and accounting principles.", "category": "commerce", "subject": "Accounting"},
+    {"question": "I am interested in economic trends, market behavior, and financial systems.", "category": "commerce", "subject": "Economics"},
+    {"question": "I enjoy planning events, managing teams, and organizing projects.", "category": "commerce", "subject": "Management"},
+    {"question": "I am interested in marketing, sales, and understanding consumer behavior.", "category": "commerce", "subject": "Marketing"},
+]
@@ -0,0 +1,135 @@
+# core/recommendations.py
+"""Career recommendations as a nearest-neighbour lookup over quiz categories.
+
+Every career gets a unit vector over the quiz categories, built from its
+explicit ``streams`` tags (full weight) and its ``skills_required`` mapped
+through ``SKILL_STREAMS`` (half weight). A user's quiz scores become a unit
+vector over the same categories, so ranking all careers is one matrix-vector
+product and a partial sort for the top k.
+
+The matrix is built once per (careers data version, question set version)
+and shared by the process like the question snapshot; answers for repeated
+score vectors come from a small per-index LRU.
+"""
+import threading
+import time
+from functools import lru_cache
+
+import numpy as np
+from django.conf import settings
+
+from . import question_bank
+from .models import Career, DataVersion
+
+# Skill keyword -> quiz categories it points towards
+SKILL_STREAMS = {
+    'mathematics': ('engineering', 'commerce'),
+    'physics': ('engineering',),
+    'chemistry': ('medical', 'engineering'),
+    'biology': ('medical',),
+    'anatomy': ('medical',),
+    'research': ('medical', 'technology'),
+    'programming': ('technology',),
+    'python': ('technology',),
+    'statistics': ('technology', 'commerce'),
+    'electronics': ('engineering', 'technology'),
+    'drawing': ('arts',),
+    'design': ('arts',),
+    'writing': ('arts',),
+    'communication': ('arts', 'commerce'),
+    'finance': ('commerce',),
+    'accounting': ('commerce',),
+    'economics': ('commerce',),
+}
+SKILL_WEIGHT = 0.5
+
+
+def career_vector(categories, streams, skills):
+    """Unit vector over ``categories`` for one career (all zeros if nothing matches)"""
+    index = {c: i for i, c in enumerate(categories)}
+    vector = np.zeros(len(categories))
+    for stream in streams or ():
+        if str(stream).lower() in index:
+            vector[index[str(stream).lower()]] += 1.0
+    for skill in skills or ():
+        for word in str(skill).lower().split():
+            for stream in SKILL_STREAMS.get(word, (word,) if word in index else ()):
+                if stream in index:
+                    vector[index[stream]] += SKILL_WEIGHT
+    return _unit(vector)
+
+
+def _unit(vector):
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class CareerIndex:
+    def __init__(self, version, categories, career_ids, vectors, cache_size=512):
+        self.version = version  # (careers data version, question set version)
+        self.categories = tuple(categories)
+        self.career_ids = np.asarray(career_ids, dtype=np.int64)
+        self.vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, len(self.categories))
+        self.vectors.setflags(write=False)
+        self._top = lru_cache(maxsize=cache_size)(self._rank)
+
+    @classmethod
+    def build(cls, version, categories):
+        """Vectorize every ``Career``; careers matching no category are left out"""
+        rows = Career.objects.order_by('id').values_list('id', 'streams', 'skills_required')
+        ids, vectors = [], []
+        for career_id, streams, skills in rows.iterator(chunk_size=5000):
+            vector = career_vector(categories, streams, skills)
+            if vector.any():
+                ids.append(career_id)
+                vectors.append(vector)
+        cache_size = getattr(settings, 'CAREER_RECOMMENDATION_CACHE_SIZE', 512)
+        return cls(version, categories, ids, vectors, cache_size)
+
+    def user_vector(self, scores):
+        return _unit(np.array([float(scores.get(c, 0) or 0) for c in self.categories]))
+
+    def top(self, scores, k):
+        """``[(career_id, match)]`` best first for a ``{category: score}`` dict"""
+        vector = self.user_vector(scores)
+        if not vector.any() or not len(self.career_ids):
+            return []
+        # Scores are small integers, so rounding makes repeat vectors hit the cache
+        return self._top(tuple(np.round(vector, 6)), k)
+
+    def _rank(self, vector, k):
+        similarity = self.vectors @ np.asarray(vector, dtype=np.float32)
+        k = min(k, len(similarity))
+        # Partial selection of the k best (O(n)), then order just those
+        best = np.argpartition(-similarity, k - 1)[:k]
+        best = best[np.lexsort((self.career_ids[best], -similarity[best]))]
+        return [(int(self.career_ids[i]), round(float(similarity[i]), 4)) for i in best if similarity[i] > 0]
+
+
+_lock = threading.Lock()
+_index = None
+_checked_at = 0.0
+
+
+def get_index():
+    global _index, _checked_at
+    interval = getattr(settings, 'QUESTION_SET_RECHECK_SECONDS', 5)
+    index = _index
+    if index is not None and time.monotonic() - _checked_at < interval:
+        return index
+
+    with _lock:
+        if _index is not None and time.monotonic() - _checked_at < interval:
+            return _index
+        snapshot = question_bank.get_snapshot()
+        version = (DataVersion.current('careers')[0], snapshot.version)
+        if _index is None or _index.version != version:
+            _index = CareerIndex.build(version, snapshot.engine.categories)
+        _checked_at = time.monotonic()
+        return _index
+
+
+def invalidate():
+    global _index
+    with _lock:
+        _index = None
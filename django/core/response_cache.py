@@ -0,0 +1,219 @@
+# core/response_cache.py
+"""Two-tier cache for the data of expensive GET responses.
+
+Tier 1 is a per-process LRU; tier 2 is the shared Django cache named by
+``RESPONSE_CACHE_ALIAS`` (file-based by default, Redis in production). Keys
+combine the view name, the normalised query string and the ``DataVersion`` of
+the tables the view reads, so a catalogue change never serves old data; TTLs
+only bound how long an entry lives.
+
+Expired entries are rebuilt single-flight: one caller (per key, across
+threads and processes via ``cache.add``) recomputes while everyone else keeps
+serving the stale copy for up to ``stale`` more seconds. Async views use
+``acached_response``: fresh local hits are served on the event loop, anything
+else goes through the same single-flight path on a worker thread.
+"""
+import hashlib
+import threading
+import time
+from collections import Counter, OrderedDict, namedtuple
+from urllib.parse import urlencode
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.response import Response
+
+from .conditional import atable_versions, table_versions
+
+Entry = namedtuple('Entry', 'data fresh_until stale_until')
+
+DEFAULT_POLICY = {'ttl': 60, 'stale': 30}
+
+
+class TieredCache:
+    def __init__(self, alias, local_size, lock_timeout=10.0, wait=0.05):
+        self.alias = alias
+        self.local_size = local_size
+        self.lock_timeout = lock_timeout
+        self.wait = wait
+        self._local = OrderedDict()
+        self._building = set()
+        self._mutex = threading.Lock()
+        self._built = threading.Condition(self._mutex)
+        self.counters = Counter()  # (name, outcome) -> requests in this process
+
+    @property
+    def shared(self):
+        return caches[self.alias]
+
+    def _local_get(self, key):
+        with self._mutex:
+            entry = self._local.get(key)
+            if entry is not None:
+                self._local.move_to_end(key)
+            return entry
+
+    def _store(self, key, entry, shared=True):
+        with self._mutex:
+            self._local[key] = entry
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_size:
+                self._local.popitem(last=False)
+        if shared:
+            self.shared.set(key, entry, timeout=max(1, int(entry.stale_until - time.time())))
+
+    def _lookup(self, key):
+        """Freshest entry from either tier, as ``(entry, tier)``"""
+        entry = self._local_get(key)
+        if entry is not None and entry.fresh_until > time.time():
+            return entry, 'local'
+        shared = self.shared.get(key)
+        if shared is not None and (entry is None or shared.fresh_until > entry.fresh_until):
+            self._store(key, shared, shared=False)
+            return shared, 'shared'
+        return entry, 'local'
+
+    def _claim(self, key):
+        with self._mutex:
+            if key in self._building:
+                return False
+            self._building.add(key)
+        if self.shared.add(f'{key}:lock', 1, timeout=self.lock_timeout):
+            return True
+        self._finish(key, release=False)
+        return False
+
+    def _finish(self, key, release=True):
+        if release:
+            self.shared.delete(f'{key}:lock')
+        with self._mutex:
+            self._building.discard(key)
+            self._built.notify_all()
+
+    def _build(self, key, build, ttl, stale):
+        data, cacheable = build()
+        if cacheable:
+            now = time.time()
+            self._store(key, Entry(data, now + ttl, now + ttl + stale))
+        return data
+
+    def get_or_build(self, key, build, ttl, stale):
+        """
+        Return ``(data, outcome)``; ``build()`` returns ``(data, cacheable)``.
+
+        outcome is hit-local, hit-shared, stale, refresh, wait or miss.
+        """
+        entry, tier = self._lookup(key)
+        now = time.time()
+        if entry is not None and entry.fresh_until > now:
+            return entry.data, f'hit-{tier}'
+
+        if entry is not None and entry.stale_until > now:
+            if not self._claim(key):
+                return entry.data, 'stale'
+            try:
+                return self._build(key, build, ttl, stale), 'refresh'
+            finally:
+                self._finish(key)
+
+        # Nothing usable: wait for whoever is building it, up to lock_timeout
+        deadline = now + self.lock_timeout
+        while not self._claim(key):
+            with self._mutex:
+                self._built.wait(self.wait)
+            entry, _ = self._lookup(key)
+            if entry is not None and entry.fresh_until > time.time():
+                return entry.data, 'wait'
+            if time.time() > deadline:
+                return self._build(key, build, ttl, stale), 'miss'
+        try:
+            return self._build(key, build, ttl, stale), 'miss'
+        finally:
+            self._finish(key)
+
+    def clear_local(self):
+        with self._mutex:
+            self._local.clear()
+
+    def reset(self):
+        """Drop this process's tier and counters (the shared tier is left alone)"""
+        self.clear_local()
+        self.counters.clear()
+
+    def stats(self):
+        """``{name: {outcome: count}}`` for this process"""
+        data = {}
+        for (name, outcome), count in self.counters.items():
+            data.setdefault(name, {})[outcome] = count
+        return data
+
+
+response_cache = TieredCache(
+    alias=getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default'),
+    local_size=getattr(settings, 'RESPONSE_CACHE_LOCAL_SIZE', 256),
+)
+
+
+def cache_key(name, request, tables):
+    versions, changed = table_versions(request, tables)
+    # Host/scheme too: paged bodies carry absolute "next" links
+    params = urlencode(sorted(request.GET.lists()), doseq=True)
+    raw = f'{request.scheme}://{request.get_host()}|{params}'
+    version = '.'.join(map(str, versions)) + f'@{changed.timestamp() if changed else 0}'
+    return f'resp:{name}:{version}:{hashlib.sha1(raw.encode()).hexdigest()}'
+
+
+def _policy(name):
+    return {**DEFAULT_POLICY, **getattr(settings, 'RESPONSE_CACHE_POLICIES', {}).get(name, {})}
+
+
+def cached_response(request, name, tables, view):
+    """
+    Serve ``view()`` (a Response) through the cache as ``name``.
+
+    Only 200 responses are stored; TTLs come from ``RESPONSE_CACHE_POLICIES``.
+    """
+    policy = _policy(name)
+    if not policy['ttl']:
+        return view()
+    http_request = getattr(request, '_request', request)
+    uncached = []
+
+    def build():
+        response = view()
+        if response.status_code != 200:
+            uncached.append(response)
+        return response.data, response.status_code == 200
+
+    data, outcome = response_cache.get_or_build(
+        cache_key(name, http_request, tables), build, policy['ttl'], policy['stale']
+    )
+    response_cache.counters[name, outcome] += 1
+    response = uncached[0] if uncached else Response(data)
+    response['X-Cache'] = outcome
+    return response
+
+
+async def acached_response(request, name, tables, view, *args):
+    """
+    Async twin of cached_response: ``await view(*args)`` returns the data.
+
+    Returns ``(data, outcome)``; outcome is None when ``name`` isn't cached.
+    Errors are raised by ``view`` rather than returned, so they never get stored.
+    """
+    policy = _policy(name)
+    if not policy['ttl']:
+        return await view(*args), None
+    await atable_versions(request, tables)  # cache_key() then reads the memo
+    key = cache_key(name, request, tables)
+
+    entry = response_cache._local_get(key)
+    if entry is not None and entry.fresh_until > time.time():
+        data, outcome = entry.data, 'hit-local'
+    else:
+        def build():
+            return async_to_sync(view)(*args), True
+        data, outcome = await sync_to_async(response_cache.get_or_build)(key, build, policy['ttl'], policy['stale'])
+    response_cache.counters[name, outcome] += 1
+    return data, outcome
@@ -0,0 +1,111 @@
+# core/scoring.py
+"""Quiz scoring as a single matrix product.
+
+Each question contributes ``weight * answer`` to its own category, so the
+whole question table collapses into a (questions x categories) weight matrix.
+A submission is a vector of answers in question order, and a batch of
+submissions is just a matrix: ``answers @ weights`` scores all of them at once.
+Categories come from the question table, so adding one needs no code change.
+"""
+import math
+
+import numpy as np
+
+ANSWER_SCALE = (1, 5)  # Likert range an answer must fall in
+
+
+class ScoringEngine:
+    def __init__(self, question_ids, categories, weights):
+        self.question_ids = tuple(question_ids)
+        self.categories = tuple(categories)
+        self.weights = weights
+        self.weights.setflags(write=False)
+        self._column = {qid: i for i, qid in enumerate(self.question_ids)}
+
+    @classmethod
+    def from_questions(cls, questions):
+        """Build from ``QuizQuestion`` rows (categories in first-seen order)"""
+        questions = list(questions)
+        categories = []
+        for q in questions:
+            category = q.category.lower()
+            if category not in categories:
+                categories.append(category)
+        index = {c: i for i, c in enumerate(categories)}
+
+        weights = np.zeros((len(questions), len(categories)))
+        for row, q in enumerate(questions):
+            weights[row, index[q.category.lower()]] = q.weight
+        return cls([q.id for q in questions], categories, weights)
+
+    def vectorize(self, answers):
+        """
+        Turn one submission into an answer vector in question order.
+
+        ``answers`` is either ``{question_id: value}`` or the frontend's list of
+        ``{"questionId": ..., "answer": ...}``. Unknown and unanswered questions
+        are ignored. Raises ValueError for answers that aren't a number within
+        ``ANSWER_SCALE``.
+        """
+        low, high = ANSWER_SCALE
+        vector = np.zeros(len(self.question_ids))
+        for question_id, value in answer_pairs(answers):
+            try:
+                column = self._column.get(int(question_id))
+            except (TypeError, ValueError):
+                continue
+            if column is None or value is None:
+                continue
+            value = float(value)
+            # float() accepts "nan"/"inf", which no DB column or mean survives
+            if not math.isfinite(value) or not low <= value <= high:
+                raise ValueError(f"Answer {value!r} for question {question_id} is outside {low}-{high}")
+            vector[column] = value
+        return vector
+
+    def score_matrix(self, answer_matrix):
+        """(submissions x questions) -> (submissions x categories)"""
+        return answer_matrix @ self.weights
+
+    def score(self, answers):
+        """Score one submission; returns ``{category: score}``"""
+        return self.as_dict(self.score_matrix(self.vectorize(answers)))
+
+    def score_many(self, submissions, skip_invalid=False):
+        """
+        Score many submissions; returns a list of ``{category: score}``.
+
+        With ``skip_invalid``, a submission ``vectorize`` rejects scores None
+        instead of raising.
+        """
+        vectors = []
+        for answers in submissions:
+            try:
+                vectors.append(self.vectorize(answers))
+            except (TypeError, ValueError):
+                if not skip_invalid:
+                    raise
+                vectors.append(None)
+        valid = [v for v in vectors if v is not None]
+        scored = iter(self.score_matrix(np.array(valid).reshape(-1, len(self.question_ids))))
+        return [None if v is None else self.as_dict(next(scored)) for v in vectors]
+
+    def as_dict(self, row):
+        return {c: _plain(v) for c, v in zip(self.categories, row)}
+
+    @staticmethod
+    def recommend(scores):
+        # First category wins ties, matching dict order
+        return max(scores, key=scores.get)
+
+
+def answer_pairs(answers):
+    """``(question_id, value)`` pairs from either submission format"""
+    if isinstance(answers, dict):
+        return answers.items()
+    return ((a.get('questionId'), a.get('answer')) for a in answers if isinstance(a, dict))
+
+
+def _plain(value):
+    value = float(value)
+    return int(value) if value.is_integer() else round(value, 4)
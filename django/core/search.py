@@ -0,0 +1,146 @@
+# core/search.py
+"""Ranked full-text search over the college catalogue.
+
+The view layer only talks to ``get_search_backend()``; the concrete backend is
+picked with the ``COLLEGE_SEARCH_BACKEND`` setting so a Postgres/Elastic
+backend can be dropped in later without touching ``core.views``.
+"""
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connection, connections, router
+from django.db.models import Q
+from django.utils.module_loading import import_string
+
+from .models import College
+
+FTS_TABLE = 'core_college_fts'
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+class BaseSearchBackend:
+    """Interface every college search backend implements"""
+
+    def index(self, colleges, using=DEFAULT_DB_ALIAS):
+        """Add or refresh ``colleges`` in the index on database ``using``"""
+        raise NotImplementedError
+
+    def remove(self, college_ids, using=DEFAULT_DB_ALIAS):
+        raise NotImplementedError
+
+    def rebuild(self):
+        raise NotImplementedError
+
+    def search(self, text, college_type=None, limit=None, after=None):
+        """
+        Return ``[(college_id, score), ...]`` best match first.
+
+        ``after`` is the last ``(college_id, score)`` hit of the previous page,
+        so deep pages cost the same as the first one.
+        """
+        raise NotImplementedError
+
+
+class ORMSearchBackend(BaseSearchBackend):
+    """Fallback for databases without FTS: plain icontains, ordered by id"""
+
+    def index(self, colleges, using=DEFAULT_DB_ALIAS):
+        pass
+
+    def remove(self, college_ids, using=DEFAULT_DB_ALIAS):
+        pass
+
+    def rebuild(self):
+        pass
+
+    def search(self, text, college_type=None, limit=None, after=None):
+        qs = College.objects.filter(Q(name__icontains=text) | Q(location__icontains=text))
+        if college_type:
+            qs = qs.of_type(college_type)
+        if after:
+            qs = qs.filter(id__gt=after[0])
+        qs = qs.order_by('id').values_list('id', flat=True)
+        if limit:
+            qs = qs[:limit]
+        return [(pk, 0.0) for pk in qs]
+
+
+class SQLiteFTS5Backend(BaseSearchBackend):
+    """SQLite FTS5 index ranked with bm25 (name > location > type)"""
+
+    weights = (10.0, 4.0, 1.0)
+
+    def index(self, colleges, using=DEFAULT_DB_ALIAS):
+        rows = [(c.pk, c.name, c.location, c.college_type) for c in colleges]
+        if not rows:
+            return
+        with connections[using].cursor() as cursor:
+            cursor.executemany(
+                f'INSERT OR REPLACE INTO {FTS_TABLE}(rowid, name, location, college_type) '
+                'VALUES (%s, %s, %s, %s)',
+                rows,
+            )
+
+    def remove(self, college_ids, using=DEFAULT_DB_ALIAS):
+        ids = [(pk,) for pk in college_ids]
+        if not ids:
+            return
+        with connections[using].cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', ids)
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE}(rowid, name, location, college_type) '
+                f'SELECT id, name, location, college_type FROM {College._meta.db_table}'
+            )
+
+    @staticmethod
+    def build_match(text):
+        # Quote every token so user input can never be parsed as FTS syntax,
+        # and prefix-match so "chenn" still finds "Chennai".
+        tokens = _TOKEN_RE.findall(text)
+        return ' '.join('"%s"*' % token for token in tokens)
+
+    def search(self, text, college_type=None, limit=None, after=None):
+        match = self.build_match(text)
+        if not match:
+            return []
+
+        bm25 = 'bm25(%s, %s)' % (FTS_TABLE, ', '.join(str(w) for w in self.weights))
+        inner = (
+            f'SELECT {FTS_TABLE}.rowid AS id, {bm25} AS score '
+            f'FROM {FTS_TABLE} JOIN {College._meta.db_table} c ON c.id = {FTS_TABLE}.rowid '
+            f'WHERE {FTS_TABLE} MATCH %s'
+        )
+        params = [match]
+        if college_type:
+            inner += ' AND lower(c.college_type) = %s'
+            params.append(college_type.lower())
+
+        # MATERIALIZED stops SQLite pushing the keyset filter into the FTS
+        # scan, where bm25() cannot be evaluated.
+        sql = f'WITH hits AS MATERIALIZED ({inner}) SELECT id, score FROM hits'
+        if after:
+            sql += ' WHERE score > %s OR (score = %s AND id > %s)'
+            params += [after[1], after[1], after[0]]
+        sql += ' ORDER BY score, id'
+        if limit:
+            sql += ' LIMIT %s'
+            params.append(limit)
+
+        # Same database the College rows will be read from (a replica, maybe)
+        with connections[router.db_for_read(College)].cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+
+@lru_cache(maxsize=None)
+def get_search_backend():
+    path = getattr(settings, 'COLLEGE_SEARCH_BACKEND', 'core.search.SQLiteFTS5Backend')
+    backend_cls = import_string(path)
+    if issubclass(backend_cls, SQLiteFTS5Backend) and connection.vendor != 'sqlite':
+        backend_cls = ORMSearchBackend
+    return backend_cls()
@@ -1,4 +1,6 @@
 from rest_framework import serializers
+from . import answer_packing
+from .instrumentation import measure
 from .models import QuizQuestion, QuizResult, College, Career, UserProfile
 
 class QuizQuestionSerializer(serializers.ModelSerializer):
@@ -8,10 +10,15 @@ class QuizQuestionSerializer(serializers.ModelSerializer):
 
 class QuizResultSerializer(serializers.ModelSerializer):
     username = serializers.CharField(source='user.username', read_only=True)
-    
+    # Packed rows are decoded back to the submitted list only when serialized
+    answers = serializers.SerializerMethodField()
+
     class Meta:
         model = QuizResult
-        fields = "__all__"
+        exclude = ("packed_answers", "question_set_version")
+
+    def get_answers(self, obj):
+        return answer_packing.expand(obj, self.context.get('question_snapshot'))
 
 class CollegeSerializer(serializers.ModelSerializer):
     class Meta:
@@ -28,4 +35,74 @@ class UserProfileSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = UserProfile
-        fields = "__all__"
\ No newline at end of file
+        fields = "__all__"
+
+# Field types whose to_representation() is a no-op for values straight from the DB
+_PASSTHROUGH = (
+    serializers.CharField, serializers.IntegerField, serializers.FloatField,
+    serializers.BooleanField, serializers.JSONField, serializers.PrimaryKeyRelatedField,
+)
+
+
+class ValuesPlan:
+    """
+    Precompiled read-only plan for a ModelSerializer.
+
+    Resolves the serializer's fields once into ``values_list()`` lookups plus
+    the few converters that actually change a value, so list endpoints can
+    skip building model instances and per-row serializer fields while
+    producing the same JSON as ``serializer_class(qs, many=True).data``.
+    """
+
+    def __init__(self, serializer_class):
+        self.names = []
+        self.lookups = []
+        self.converters = []
+        for name, field in serializer_class().fields.items():
+            if field.write_only:
+                continue
+            if field.source == '*' or isinstance(field, serializers.SerializerMethodField):
+                raise TypeError(f"{serializer_class.__name__}.{name} can't be read from values()")
+            self.names.append(name)
+            self.lookups.append('__'.join(field.source_attrs))
+            self.converters.append(None if isinstance(field, _PASSTHROUGH) else field.to_representation)
+        self.passthrough = not any(self.converters)
+
+    def serialize(self, queryset):
+        return self.serialize_rows(queryset.values_list(*self.lookups))
+
+    async def aserialize(self, queryset):
+        return self.serialize_rows([row async for row in queryset.values_list(*self.lookups)])
+
+    def serialize_rows(self, rows):
+        names = self.names
+        if self.passthrough:
+            return [dict(zip(names, row)) for row in rows]
+        converters = self.converters
+        return [
+            {
+                name: (value if convert is None or value is None else convert(value))
+                for name, convert, value in zip(names, converters, row)
+            }
+            for row in rows
+        ]
+
+
+_plans = {}
+
+
+def _plan(serializer_class):
+    plan = _plans.get(serializer_class)
+    if plan is None:
+        plan = _plans[serializer_class] = ValuesPlan(serializer_class)
+    return plan
+
+
+def serialize_values(queryset, serializer_class):
+    """Fast read-only equivalent of ``serializer_class(queryset, many=True).data``"""
+    with measure('serialize'):
+        return _plan(serializer_class).serialize(queryset)
+
+
+async def aserialize_values(queryset, serializer_class):
+    return await _plan(serializer_class).aserialize(queryset)
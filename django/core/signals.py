@@ -0,0 +1,82 @@
+# core/signals.py
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import question_bank, recommendations
+from .models import (
+    Career, CatalogueCounter, College, CollegeFacet, CollegeFacility, DataVersion, QuestionSet, QuizQuestion,
+)
+from .search import get_search_backend
+
+
+@receiver(post_save, sender=College)
+def index_college(sender, instance, using, **kwargs):
+    # Runs for loaddata too (raw=True), so fixtures land in the index
+    get_search_backend().index([instance], using=using)
+
+
+@receiver(post_delete, sender=College)
+def unindex_college(sender, instance, using, **kwargs):
+    get_search_backend().remove([instance.pk], using=using)
+
+
+@receiver(pre_save, sender=College)
+def split_college_location(sender, instance, **kwargs):
+    instance.city, instance.state = College.split_location(instance.location)
+    before = None
+    if instance.pk:
+        before = College.objects.filter(pk=instance.pk).only('state', 'college_type', 'facilities').first()
+    instance._facets_before = before.facet_keys() if before else set()
+    instance._facilities_before = before.facilities if before else None
+
+
+@receiver(post_save, sender=College)
+def update_college_facets(sender, instance, created, **kwargs):
+    if created or instance.facilities != getattr(instance, '_facilities_before', None):
+        CollegeFacility.sync([instance])
+    CollegeFacet.apply(getattr(instance, '_facets_before', set()), instance.facet_keys())
+
+
+@receiver(post_delete, sender=College)
+def remove_college_facets(sender, instance, **kwargs):
+    CollegeFacet.apply(removed=instance.facet_keys())
+
+
+_COUNTER_NAMES = {College: 'colleges', Career: 'careers'}
+
+
+@receiver(post_save, sender=College)
+@receiver(post_save, sender=Career)
+def count_created(sender, instance, created, **kwargs):
+    if created:
+        CatalogueCounter.bump(_COUNTER_NAMES[sender], 1)
+
+
+@receiver(post_delete, sender=College)
+@receiver(post_delete, sender=Career)
+def count_deleted(sender, instance, **kwargs):
+    CatalogueCounter.bump(_COUNTER_NAMES[sender], -1)
+
+
+@receiver(post_save, sender=College)
+@receiver(post_save, sender=Career)
+@receiver(post_delete, sender=College)
+@receiver(post_delete, sender=Career)
+def bump_data_version(sender, **kwargs):
+    # Invalidates ETags of the list endpoints (core.conditional)
+    DataVersion.bump(_COUNTER_NAMES[sender])
+    if sender is Career:
+        transaction.on_commit(recommendations.invalidate)
+
+
+def _publish_question_set():
+    QuestionSet.publish()
+    question_bank.invalidate()
+    recommendations.invalidate()  # career vectors follow the categories
+
+
+@receiver(post_save, sender=QuizQuestion)
+@receiver(post_delete, sender=QuizQuestion)
+def question_changed(sender, **kwargs):
+    transaction.on_commit(_publish_question_set)
@@ -1,3 +1,1310 @@
-from django.test import TestCase
+import csv
+import gzip
+import json
+import re
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+import jwt
+from asgiref.sync import async_to_sync, sync_to_async
+
+from django.conf import settings
+from django.contrib.auth.models import Permission, User
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection, connections
+from django.http import HttpResponse
+from django.test import AsyncClient, Client, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import path, reverse
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from accounts.auth_utils import token_cache
+from accounts.models import user_cred
+from accounts.views import generate_jwt_token
+
+from . import answer_packing, async_views, compression, db_routing, question_bank, recommendations
+from .catalogue_import import CatalogueImporter, iter_csv, iter_json_array
+from .compression import negotiate, precompressed_cache
+from .models import (
+    CatalogueCounter, Career, College, CollegeFacet, DataVersion, QuestionSet, QuizQuestion, QuizResult, QuizRollup,
+    UserProfile,
+)
+from .renderers import FastJSONRenderer
+from .response_cache import TieredCache, response_cache
+from .scoring import ScoringEngine
+from .search import get_search_backend
+from .serializers import CareerSerializer, CollegeSerializer, serialize_values
+
+# For tests whose requests go through the response cache: keeps its shared
+# tier off the project's on-disk cache (CACHES['responses'])
+LOCMEM_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'responses': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'responses'},
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CollegeSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.anna = College.objects.create(name="Anna University", location="Chennai, Tamil Nadu", college_type="University")
+        cls.madras = College.objects.create(name="Madras Medical College", location="Chennai, Tamil Nadu", college_type="Government")
+        cls.pune = College.objects.create(name="College of Engineering Pune", location="Pune, Maharashtra", college_type="Government")
+
+    def test_index_follows_save_and_delete(self):
+        self.assertEqual([pk for pk, _ in get_search_backend().search("pune")], [self.pune.pk])
+        self.pune.name = "COEP Technological University"
+        self.pune.location = "Shivajinagar, Maharashtra"
+        self.pune.save()
+        self.assertEqual(get_search_backend().search("pune"), [])
+        self.assertEqual([pk for pk, _ in get_search_backend().search("coep")], [self.pune.pk])
+        self.pune.delete()
+        self.assertEqual(get_search_backend().search("coep"), [])
+
+    def test_name_matches_rank_above_location_matches(self):
+        College.objects.create(name="Chennai Institute of Technology", location="Kundrathur, Tamil Nadu")
+        response = self.client.get(reverse('colleges-list'), {'search': 'chennai'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]['name'], "Chennai Institute of Technology")
+        self.assertEqual(len(response.json()), 3)
+
+    def test_search_with_type_filter(self):
+        response = self.client.get(reverse('colleges-list'), {'search': 'chennai', 'type': 'government'})
+        self.assertEqual([c['id'] for c in response.json()], [self.madras.pk])
+
+    def test_search_is_not_fts_syntax(self):
+        response = self.client.get(reverse('colleges-list'), {'search': 'anna" OR NEAR(*'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_search_pagination_walks_every_match_once(self):
+        url = reverse('colleges-list')
+        response = self.client.get(url, {'search': 'college', 'limit': 1})
+        page = response.json()
+        seen = [c['id'] for c in page['results']]
+        while page['next']:
+            page = self.client.get(page['next']).json()
+            seen += [c['id'] for c in page['results']]
+        self.assertEqual(sorted(seen), sorted([self.madras.pk, self.pune.pk]))
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse('colleges-list'), {'search': 'anna', 'cursor': '!!'})
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(COLLEGE_SEARCH_MAX_RESULTS=5000)
+    def test_unpaged_search_with_more_hits_than_sql_variables(self):
+        College.objects.bulk_create(College(name=f"Vellore College {i}", location="Vellore") for i in range(1200))
+        get_search_backend().rebuild()
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.get(reverse('colleges-list'), {'search': 'vellore'}).json()
+        self.assertEqual(len(data), 1200)
+        lookups = [q for q in queries if q['sql'].startswith('SELECT') and ' IN (' in q['sql']]
+        self.assertEqual(len(lookups), 2)
+        asgi = async_to_sync(AsyncClient().get)(reverse('colleges-list'), {'search': 'vellore'})
+        self.assertEqual(asgi.json(), data)
+
+    @override_settings(COLLEGE_SEARCH_MAX_RESULTS=2)
+    def test_unpaged_search_returns_the_best_hits_only(self):
+        College.objects.create(name="Chennai Institute of Technology", location="Kundrathur, Tamil Nadu")
+        sync = self.client.get(reverse('colleges-list'), {'search': 'chennai'}).json()
+        self.assertEqual(len(sync), 2)
+        self.assertEqual(sync[0]['name'], "Chennai Institute of Technology")
+        asgi = async_to_sync(AsyncClient().get)(reverse('colleges-list'), {'search': 'chennai'})
+        self.assertEqual(asgi.json(), sync)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        College.objects.bulk_create(
+            College(name=f"College {i}", location="Pune", college_type="Government" if i % 2 else "Private")
+            for i in range(7)
+        )
+        Career.objects.bulk_create(Career(title=f"Engineer {i}", description="") for i in range(3))
+        cls.user = user_cred.objects.create(username="asha", password="x")
+        for i in range(5):
+            QuizResult.objects.create(user=cls.user, scores={}, answers=[], recommended_stream="arts")
+
+    def walk(self, url, **extra):
+        page = self.client.get(url, {'limit': 2}, **extra).json()
+        pages = [page]
+        while page['next']:
+            page = self.client.get(page['next'], **extra).json()
+            pages.append(page)
+        return pages
+
+    def test_unpaged_requests_keep_returning_a_list(self):
+        self.assertIsInstance(self.client.get(reverse('colleges-list')).json(), list)
+
+    def test_colleges_pages_cover_table_in_id_order(self):
+        pages = self.walk(reverse('colleges-list'))
+        ids = [c['id'] for p in pages for c in p['results']]
+        self.assertEqual(ids, list(College.objects.order_by('id').values_list('id', flat=True)))
+        self.assertTrue(all(len(p['results']) <= 2 for p in pages))
+
+    def test_government_and_career_pages(self):
+        gov = [c['college_type'] for p in self.walk(reverse('government-colleges')) for c in p['results']]
+        self.assertEqual(gov, ["Government"] * 3)
+        careers = [c['id'] for p in self.walk(reverse('careers-list')) for c in p['results']]
+        self.assertEqual(len(careers), 3)
+
+    def test_my_results_newest_first_by_created_at_then_id(self):
+        auth = {'HTTP_AUTHORIZATION': f"Bearer {generate_jwt_token(self.user)}"}
+        ids = [r['id'] for p in self.walk(reverse('my-results'), **auth) for r in p['results']]
+        expected = QuizResult.objects.order_by('-created_at', '-id').values_list('id', flat=True)
+        self.assertEqual(ids, list(expected))
+
+    def test_bad_limit_and_cursor(self):
+        self.assertEqual(self.client.get(reverse('colleges-list'), {'limit': 'x'}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('careers-list'), {'cursor': 'bm9wZQ'}).status_code, 400)
+
+
+class QuestionSetSnapshotTests(TestCase):
+    def setUp(self):
+        question_bank.invalidate()
+        self.addCleanup(question_bank.invalidate)
+
+    def test_questions_are_seeded_by_migration(self):
+        self.assertEqual(QuizQuestion.objects.count(), 25)
+        self.assertTrue(QuestionSet.objects.exists())
+
+    def test_questions_served_without_queries_once_compiled(self):
+        first = self.client.get(reverse('quiz-questions'))
+        self.assertEqual(len(first.json()), 25)
+        with self.assertNumQueries(0):
+            second = self.client.get(reverse('quiz-questions'))
+        self.assertEqual(first.content, second.content)
+
+    def test_question_edit_publishes_new_version(self):
+        self.client.get(reverse('quiz-questions'))
+        question = QuizQuestion.objects.order_by('id').first()
+        question.question = "Edited question"
+        with self.captureOnCommitCallbacks(execute=True):
+            question.save()
+        data = self.client.get(reverse('quiz-questions')).json()
+        self.assertEqual(data[0]['question'], "Edited question")
+
+    def test_quiz_home_counts_snapshot(self):
+        self.assertEqual(self.client.get(reverse('quiz-home')).json()['total_questions'], 25)
+
+
+class QuizUserMixin:
+    """A fresh question snapshot and a signed-in quiz taker"""
+    username = "student"
+
+    def setUp(self):
+        super().setUp()
+        question_bank.invalidate()
+        self.addCleanup(question_bank.invalidate)
+        self.user = user_cred.objects.create(username=self.username, password="x")
+        self.auth = {'HTTP_AUTHORIZATION': f"Bearer {generate_jwt_token(self.user)}"}
+        self.questions = list(QuizQuestion.objects.order_by('id'))
+
+    def submit(self, answers):
+        return self.client.post(reverse('submit-quiz'), {'answers': answers}, content_type='application/json', **self.auth)
+
+
+class ScoringEngineTests(QuizUserMixin, TestCase):
+    username = "ravi"
+
+    def test_scores_by_question_id_ignoring_client_category(self):
+        answers = [{'questionId': q.id, 'answer': 5 if q.category == 'arts' else 1, 'category': 'medical'}
+                   for q in self.questions]
+        response = self.submit(answers)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['scores'], {'medical': 5, 'engineering': 5, 'technology': 5, 'arts': 25, 'commerce': 5})
+        self.assertEqual(response.json()['recommended_stream'], 'arts')
+
+    def test_weights_and_new_categories_come_from_question_table(self):
+        questions = [
+            QuizQuestion(id=1, question="a", category="medical", weight=2.0),
+            QuizQuestion(id=2, question="b", category="law", weight=0.5),
+        ]
+        engine = ScoringEngine.from_questions(questions)
+        self.assertEqual(engine.score({1: 3, 2: 4}), {'medical': 6, 'law': 2})
+        self.assertEqual(
+            engine.score_many([{1: 1, 2: 5}, [{'questionId': 2, 'answer': 3}], {99: 5}]),
+            [{'medical': 2, 'law': 2.5}, {'medical': 0, 'law': 1.5}, {'medical': 0, 'law': 0}],
+        )
+
+    def test_invalid_answer_value(self):
+        response = self.submit([{'questionId': self.questions[0].id, 'answer': 'lots'}])
+        self.assertEqual(response.status_code, 400)
+
+    def test_answers_must_be_a_list_matching_published_questions(self):
+        question_id = self.questions[0].id
+        for answers in ({str(question_id): 3}, "3,3,3", [{'questionId': 99999, 'answer': 3}], [{'answer': 3}], [3, 4]):
+            with self.subTest(answers=answers):
+                self.assertEqual(self.submit(answers).status_code, 400)
+        self.assertFalse(QuizResult.objects.exists())
+        self.assertFalse(UserProfile.objects.exists())
+        self.assertEqual(self.submit([{'questionId': question_id, 'answer': 3}]).status_code, 201)
+
+    def test_non_finite_and_out_of_scale_answers_are_rejected(self):
+        for value in ('nan', 'inf', '-Infinity', 1e6, -5, 0, 5.5):
+            with self.subTest(value=value):
+                answers = [{'questionId': q.id, 'answer': 3} for q in self.questions]
+                answers[0]['answer'] = value
+                self.assertEqual(self.submit(answers).status_code, 400)
+        self.assertFalse(QuizResult.objects.exists())
+        self.assertFalse(QuizRollup.objects.exists())
+
+    def test_rescore_applies_new_weights(self):
+        answers = [{'questionId': q.id, 'answer': 3} for q in self.questions]
+        result_id = self.submit(answers).json()['id']
+        QuizQuestion.objects.filter(category='commerce').update(weight=2.0)
+        QuestionSet.publish()
+        call_command('rescore_quiz_results', stdout=StringIO())
+        result = QuizResult.objects.get(id=result_id)
+        self.assertEqual(result.scores['commerce'], 30)
+        self.assertEqual(result.recommended_stream, 'commerce')
+
+    def test_rescore_skips_legacy_rows_outside_the_answer_scale(self):
+        answers = [{'questionId': q.id, 'answer': 3} for q in self.questions]
+        legacy = QuizResult.objects.create(user=self.user, scores={'arts': 1}, recommended_stream="arts",
+                                           answers=[{'questionId': self.questions[0].id, 'answer': 1e6}])
+        result_id = self.submit(answers).json()['id']
+        QuizQuestion.objects.filter(category='commerce').update(weight=2.0)
+        QuestionSet.publish()
+        out = StringIO()
+        call_command('rescore_quiz_results', '--chunk-size', '5', stdout=out)
+        self.assertIn("1 skipped as invalid", out.getvalue())
+        self.assertEqual(QuizResult.objects.get(id=result_id).recommended_stream, 'commerce')
+        self.assertEqual(QuizResult.objects.get(id=legacy.id).scores, {'arts': 1})
+
+
+class ConcurrentSubmitTests(QuizUserMixin, TestCase):
+    username = "karthik"
+
+    def setUp(self):
+        super().setUp()
+        self.answers = [{'questionId': q.id, 'answer': 3} for q in self.questions]
+
+    def test_profile_counter_is_incremented_in_sql(self):
+        self.submit(self.answers)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.submit(self.answers).status_code, 201)
+        update = next(q['sql'] for q in queries if q['sql'].startswith('UPDATE "core_userprofile"'))
+        self.assertIn('"completed_quizzes" + 1', update)
+        self.assertEqual(UserProfile.objects.get(user=self.user).completed_quizzes, 2)
+
+    def test_failed_rollup_rolls_back_the_result(self):
+        with mock.patch('core.analytics.record', side_effect=RuntimeError), self.assertRaises(RuntimeError):
+            self.submit(self.answers)
+        self.assertFalse(QuizResult.objects.exists())
+        self.assertFalse(UserProfile.objects.exists())
+
+
+class OverlappingSubmitTests(TransactionTestCase):
+    """Real concurrent transactions, one connection per thread to the file-backed test database"""
+    serialized_rollback = True  # keep the migration-seeded questions for later tests
+
+    def setUp(self):
+        question_bank.invalidate()
+        self.addCleanup(question_bank.invalidate)
+
+    def test_overlapping_submits_lose_no_updates(self):
+        user = user_cred.objects.create(username="karthik", password="x")
+        auth = {'HTTP_AUTHORIZATION': f"Bearer {generate_jwt_token(user)}"}
+        answers = [{'questionId': q.id, 'answer': 3} for q in QuizQuestion.objects.all()]
+        clients, submits = 8, 5
+        statuses = []
+        barrier = threading.Barrier(clients)
+
+        def submit_loop():
+            client = Client()
+            barrier.wait()
+            try:
+                for _ in range(submits):
+                    statuses.append(client.post(reverse('submit-quiz'), {'answers': answers},
+                                                content_type='application/json', **auth).status_code)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=submit_loop) for _ in range(clients)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        total = clients * submits
+        self.assertEqual(statuses, [201] * total)
+        self.assertEqual(UserProfile.objects.get(user=user).completed_quizzes, total)
+        self.assertEqual(QuizResult.objects.filter(user=user).count(), total)
+        self.assertEqual(sum(QuizRollup.objects.values_list('results', flat=True)), total)
+
+
+class AnswerPackingTests(QuizUserMixin, TestCase):
+    username = "sana"
+
+    def setUp(self):
+        super().setUp()
+        self.answers = [{'questionId': q.id, 'answer': i % 5 + 1, 'category': q.category}
+                        for i, q in enumerate(self.questions)]
+
+    def test_submissions_are_stored_packed(self):
+        response = self.submit(self.answers)
+        self.assertEqual(response.json()['answers'], self.answers)
+        result = QuizResult.objects.get()
+        self.assertEqual((result.answers, len(result.packed_answers)), ([], len(self.questions)))
+        self.assertEqual(result.question_set_version, question_bank.get_snapshot().version)
+        history = self.client.get(reverse('my-results'), **self.auth).json()
+        self.assertEqual(history[0]['answers'], self.answers)
+        self.assertNotIn('packed_answers', history[0])
+
+    def test_unpackable_answers_stay_json(self):
+        answers = [{'questionId': self.questions[0].id, 'answer': 2.5}]
+        self.submit(answers)
+        result = QuizResult.objects.get()
+        self.assertIsNone(result.packed_answers)
+        self.assertEqual(result.answers, answers)
+
+    def test_command_packs_existing_rows(self):
+        legacy = QuizResult.objects.create(user=self.user, scores={'arts': 1}, answers=self.answers, recommended_stream="arts")
+        old_format = QuizResult.objects.create(user=self.user, scores={}, answers=[{'category': "arts", 'answer': 3}],
+                                               recommended_stream="arts")
+        before = self.client.get(reverse('my-results'), **self.auth).json()
+        out = StringIO()
+        call_command('pack_quiz_answers', '--chunk-size', '1', stdout=out)
+        self.assertIn("Packed 1 of 2", out.getvalue())
+        legacy.refresh_from_db()
+        old_format.refresh_from_db()
+        self.assertIsNotNone(legacy.packed_answers)
+        self.assertIsNone(old_format.packed_answers)
+        self.assertEqual(self.client.get(reverse('my-results'), **self.auth).json(), before)
+
+
+class StreamingExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = user_cred.objects.create(username="isha", password="x")
+        questions = list(QuizQuestion.objects.order_by('id')[:2])
+        snapshot = question_bank.get_snapshot()
+        QuizResult.objects.create(
+            user=cls.user, scores={'arts': 9}, recommended_stream="arts", answers=[],
+            packed_answers=answer_packing.pack(snapshot.question_ids, {questions[0].id: 4, questions[1].id: 2}),
+            question_set_version=snapshot.version,
+        )
+        cls.old = QuizResult.objects.create(user=cls.user, scores={'medical': 3}, recommended_stream="medical",
+                                            answers=[{'questionId': questions[0].id, 'answer': 3}])
+        QuizResult.objects.filter(pk=cls.old.pk).update(created_at=timezone.now() - timedelta(days=30))
+        cls.answers = {str(questions[0].id): 4, str(questions[1].id): 2}
+
+    def setUp(self):
+        question_bank.invalidate()
+        self.addCleanup(question_bank.invalidate)
+        self.client.force_login(User.objects.create_superuser("analyst", "a@example.com", "pw"))
+
+    def export(self, url_name='admin:core_quizresult_export', **params):
+        response = self.client.get(reverse(url_name), params)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content)
+
+    def test_csv_with_decoded_answers(self):
+        response, body = self.export()
+        rows = list(csv.DictReader(StringIO(body.decode())))
+        self.assertEqual([r['recommended_stream'] for r in rows], ["arts", "medical"])
+        self.assertEqual(json.loads(rows[0]['answers']), self.answers)
+        self.assertEqual(rows[0]['username'], "isha")
+        self.assertIn('attachment; filename="quiz-results.csv"', response['Content-Disposition'])
+
+    def test_filters_ndjson_and_gzip(self):
+        today = timezone.localdate().isoformat()
+        _, body = self.export(format='ndjson', gzip='1', **{'from': today})
+        lines = [json.loads(line) for line in gzip.decompress(body).splitlines()]
+        self.assertEqual([line['recommended_stream'] for line in lines], ["arts"])
+        _, body = self.export(format='ndjson', stream='MEDICAL')
+        self.assertEqual(json.loads(body)['id'], self.old.id)
+        self.assertEqual(self.client.get(reverse('admin:core_quizresult_export'), {'to': 'soon'}).status_code, 400)
+
+    def test_profiles_and_command(self):
+        UserProfile.objects.create(user=self.user, preferred_stream="arts", interests=["music"])
+        _, body = self.export('admin:core_userprofile_export')
+        self.assertIn(b'isha,arts,0,"[""music""]"', body)
+        with tempfile.NamedTemporaryFile(suffix='.ndjson') as out:
+            call_command('export_quiz_data', 'quiz-results', '--format', 'ndjson', '--stream', 'arts',
+                         '--output', out.name, stderr=StringIO())
+            self.assertEqual(len(open(out.name, 'rb').read().splitlines()), 1)
+
+    def test_requires_staff(self):
+        self.client.logout()
+        self.assertEqual(self.client.get(reverse('admin:core_quizresult_export')).status_code, 302)
+
+    def test_requires_view_permission(self):
+        staff = User.objects.create_user("intern", "i@example.com", "pw", is_staff=True)
+        self.client.force_login(staff)
+        for url_name in ('admin:core_quizresult_export', 'admin:core_userprofile_export'):
+            self.assertEqual(self.client.get(reverse(url_name)).status_code, 403)
+        staff.user_permissions.add(Permission.objects.get(codename='view_quizresult'))
+        self.assertEqual(self.client.get(reverse('admin:core_quizresult_export')).status_code, 200)
+        self.assertEqual(self.client.get(reverse('admin:core_userprofile_export')).status_code, 403)
+
+
+class LargeTableAdminTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        users = user_cred.objects.bulk_create(user_cred(username=f"{name}{i}", password="x")
+                                              for name in ("priya", "rahul") for i in range(60))
+        QuizResult.objects.bulk_create(
+            QuizResult(user=u, scores={}, answers=[], recommended_stream="arts" if i % 3 else "medical")
+            for i, u in enumerate(users)
+        )
+        UserProfile.objects.bulk_create(UserProfile(user=u, preferred_stream="arts") for u in users)
+        QuizRollup.objects.create(day=timezone.localdate(), stream="arts", results=80)
+        QuizRollup.objects.create(day=timezone.localdate(), stream="medical", results=40)
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser("admin", "a@example.com", "pw"))
+
+    def changelist(self, model='quizresult', **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(f'admin:core_{model}_changelist'), params)
+        self.assertEqual(response.status_code, 200)
+        return response, [q['sql'] for q in queries]
+
+    def test_queries_per_page_are_capped(self):
+        for model in ('quizresult', 'userprofile'):
+            response, queries = self.changelist(model)
+            # session + user, page rows (user joined), estimated count, stream choices
+            self.assertLessEqual(len(queries), 6, queries)
+            self.assertFalse([q for q in queries if 'COUNT(' in q.upper()])
+            self.assertEqual(len(response.context['cl'].result_list), 100)
+            self.assertContains(response, "~120")
+
+    def test_cursor_pages_walk_newest_first(self):
+        response, _ = self.changelist()
+        first = response.context['cl'].result_list
+        self.assertEqual([r.id for r in first], sorted((r.id for r in first), reverse=True))
+        next_url = response.context['cl'].next_url()
+        self.assertIn('cursor=', next_url)
+
+        response = self.client.get(reverse('admin:core_quizresult_changelist') + next_url)
+        rest = response.context['cl'].result_list
+        self.assertEqual(len(rest), 20)
+        self.assertLess(rest[0].id, first[-1].id)
+        self.assertIsNone(response.context['cl'].next_url())
+        self.assertEqual(self.client.get(reverse('admin:core_quizresult_changelist'), {'cursor': 'x'}).status_code, 302)
+
+    def test_username_prefix_search_and_stream_filter(self):
+        response, queries = self.changelist(q='priya1')
+        self.assertEqual({r.user.username for r in response.context['cl'].result_list},
+                         {"priya1"} | {f"priya1{i}" for i in range(10)})
+        self.assertFalse([q for q in queries if 'LIKE' in q.upper()])
+
+        response, _ = self.changelist(recommended_stream='medical')
+        self.assertEqual(response.context['cl'].result_count, 40)
+        self.assertContains(response, "?recommended_stream=arts")
+
+
+class QuizAnalyticsTests(QuizUserMixin, TestCase):
+    username = "divya"
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(User.objects.create_user("analyst", "a@example.com", "pw", is_staff=True))
+
+    def submit_favouring(self, favourite):
+        return self.submit([{'questionId': q.id, 'answer': 5 if q.category == favourite else 1} for q in self.questions])
+
+    def test_submissions_update_rollups(self):
+        for favourite in ("arts", "arts", "medical"):
+            self.assertEqual(self.submit_favouring(favourite).status_code, 201)
+        # Session + staff user, then one rollup read however many results there are
+        with self.assertNumQueries(3):
+            data = self.client.get(reverse('quiz-analytics')).json()
+        self.assertEqual(data['total_results'], 3)
+        self.assertEqual(data['streams'], {'arts': 2, 'medical': 1})
+        self.assertEqual(data['mean_scores']['arts'], round(55 / 3, 4))
+        self.assertEqual([(d['stream'], d['results']) for d in data['days']], [("arts", 2), ("medical", 1)])
+        self.assertEqual(data['days'][0]['mean_scores']['arts'], 25)
+
+    def test_rebuild_matches_incremental_rollups(self):
+        for favourite in ("commerce", "technology", "commerce"):
+            self.submit_favouring(favourite)
+        incremental = self.client.get(reverse('quiz-analytics')).json()
+        QuizRollup.objects.all().delete()
+        call_command('rebuild_quiz_rollups', '--chunk-size', '2', stdout=StringIO())
+        self.assertEqual(self.client.get(reverse('quiz-analytics')).json(), incremental)
+
+    def test_filters(self):
+        self.submit_favouring("arts")
+        today = timezone.localdate()
+        data = self.client.get(reverse('quiz-analytics'), {'from': today, 'stream': 'ARTS'}).json()
+        self.assertEqual(data['total_results'], 1)
+        data = self.client.get(reverse('quiz-analytics'), {'to': today - timedelta(days=1)}).json()
+        self.assertEqual(data['total_results'], 0)
+        self.assertEqual(self.client.get(reverse('quiz-analytics'), {'from': '18/10/2026'}).status_code, 400)
+
+    def test_requires_staff(self):
+        url = reverse('quiz-analytics')
+        self.client.logout()
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.assertEqual(self.client.get(url, **self.auth).status_code, 403)
+        self.client.force_login(User.objects.create_user("student", "s@example.com", "pw"))
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+
+class CareerRecommendationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.surgeon = Career.objects.create(title="Surgeon", description="", streams=["medical"], skills_required=["Biology"])
+        cls.analyst = Career.objects.create(title="Data Analyst", description="", skills_required=["Statistics", "Python"])
+        cls.designer = Career.objects.create(title="Designer", description="", streams=["arts"])
+        Career.objects.create(title="Juggler", description="", skills_required=["Juggling"])
+        cls.user = user_cred.objects.create(username="nila", password="x")
+
+    def setUp(self):
+        recommendations.invalidate()
+        self.addCleanup(recommendations.invalidate)
+        token_cache.clear()
+        self.addCleanup(token_cache.clear)
+        self.auth = {'HTTP_AUTHORIZATION': f"Bearer {generate_jwt_token(self.user)}"}
+
+    def recommend(self, scores, **params):
+        QuizResult.objects.create(user=self.user, scores=scores, answers=[], recommended_stream="x")
+        return self.client.get(reverse('career-recommendations'), params, **self.auth)
+
+    def test_ranks_by_latest_scores(self):
+        response = self.recommend({'medical': 25, 'technology': 5, 'arts': 10})
+        titles = [c['title'] for c in response.json()['results']]
+        self.assertEqual(titles, ["Surgeon", "Designer", "Data Analyst"])  # Juggler matches nothing
+        response = self.recommend({'technology': 20, 'commerce': 20}, limit=1)
+        self.assertEqual([c['title'] for c in response.json()['results']], ["Data Analyst"])
+
+    def test_repeat_score_vectors_hit_the_cache(self):
+        index = recommendations.get_index()
+        index.top({'medical': 10, 'arts': 5}, 5)
+        index.top({'medical': 20, 'arts': 10}, 5)  # same direction
+        self.assertEqual(index._top.cache_info().hits, 1)
+
+    def test_career_edits_rebuild_the_index(self):
+        before = recommendations.get_index()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.designer.streams = ["medical"]
+            self.designer.save()
+        self.assertIsNot(recommendations.get_index(), before)
+        results = self.recommend({'medical': 1}).json()['results']
+        self.assertEqual([(c['title'], c['match']) for c in results], [("Surgeon", 1.0), ("Designer", 1.0)])
+
+    def test_requires_a_quiz_result(self):
+        self.assertEqual(self.client.get(reverse('career-recommendations'), **self.auth).status_code, 404)
+        self.assertEqual(self.client.get(reverse('career-recommendations')).status_code, 401)
+
+
+@override_settings(DATABASE_REPLICAS=['replica'], CACHES=LOCMEM_CACHES)
+class ReplicaRoutingTests(TestCase):
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        question_bank.invalidate()
+        self.addCleanup(question_bank.invalidate)
+        self.pins = caches[settings.REPLICA_PIN_CACHE_ALIAS]
+        self.pins.clear()
+        self.addCleanup(self.pins.clear)
+        self.user = user_cred.objects.create(username="nila", password="x")
+        self.auth = {'HTTP_AUTHORIZATION': f"Bearer {generate_jwt_token(self.user)}"}
+
+    def test_catalogue_lists_read_from_replica(self):
+        College.objects.create(name="Primary College", location="Chennai, Tamil Nadu", college_type="Government")
+        College.objects.using('replica').bulk_create([College(name="Replica College", college_type="Government")])
+        names = lambda url: [c['name'] for c in self.client.get(url).json()]
+        self.assertEqual(names(reverse('colleges-list')), ["Replica College"])
+        self.assertEqual(names(reverse('government-colleges')), ["Replica College"])
+        # Views that don't opt in stay on the primary
+        self.assertEqual(self.client.get(reverse('college-facets')).json()['state'], {"Tamil Nadu": 1})
+
+    async def test_async_views_read_from_replica(self):
+        await College.objects.using('replica').abulk_create([College(name="Replica College", college_type="Private")])
+        response = await AsyncClient().get(reverse('colleges-list'))
+        self.assertEqual([c['name'] for c in response.json()], ["Replica College"])
+
+    def test_question_set_is_read_from_primary(self):
+        question = QuizQuestion.objects.order_by('id').first()
+        question.question = "Edited question"
+        with self.captureOnCommitCallbacks(execute=True):
+            question.save()
+        latest = QuestionSet.objects.order_by('-version').first()
+        self.assertFalse(QuestionSet.objects.using('replica').filter(version=latest.version).exists())
+        response = self.client.get(reverse('quiz-questions'))
+        self.assertEqual(response['ETag'], f'"quiz-{latest.version}"')
+        self.assertEqual(response.json()[0]['question'], "Edited question")
+        self.assertEqual(question_bank.question_ids(latest.version), tuple(latest.question_ids))
+
+    def test_search_index_follows_the_write_alias(self):
+        college = College.objects.using('replica').create(name="Replica Institute", college_type="Private")
+        search = lambda: [c['name'] for c in self.client.get(reverse('colleges-list'), {'search': "institute"}).json()]
+        self.assertEqual(search(), ["Replica Institute"])
+        self.assertEqual(get_search_backend().search("institute"), [])  # primary index untouched
+        college.delete()
+        self.assertEqual(search(), [])
+
+    def test_user_reads_primary_after_own_write(self):
+        answers = [{'questionId': q.id, 'answer': 3} for q in QuizQuestion.objects.all()]
+        results = lambda: self.client.get(reverse('my-results'), **self.auth).json()
+        self.assertEqual(results(), [])
+        self.client.post(reverse('submit-quiz'), {'answers': answers}, content_type='application/json', **self.auth)
+        self.assertEqual(len(results()), 1)
+        # Once the pin expires the (lagging) replica is read again
+        self.pins.clear()
+        self.assertEqual(results(), [])
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas_everything_reads_primary(self):
+        College.objects.create(name="Primary College", location="Chennai, Tamil Nadu", college_type="Government")
+        with mock.patch('core.db_routing.get_user_from_token') as lookup:
+            response = self.client.get(reverse('colleges-list'), **self.auth)
+        self.assertEqual([c['name'] for c in response.json()], ["Primary College"])
+        lookup.assert_not_called()
+
+    def test_pin_cache_must_be_shared(self):
+        self.assertEqual([w.id for w in db_routing.check_pin_cache()], ['core.W001'])  # locmem here
+        with override_settings(REPLICA_PIN_CACHE_ALIAS='nowhere'):
+            self.assertEqual([e.id for e in db_routing.check_pin_cache()], ['core.E001'])
+        redis = {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://cache:6379'}
+        with override_settings(CACHES={**LOCMEM_CACHES, 'responses': redis}):
+            self.assertEqual(db_routing.check_pin_cache(), [])
+        with override_settings(DATABASE_REPLICAS=[]):
+            self.assertEqual(db_routing.check_pin_cache(), [])
+
+
+class BatchRequestTests(TestCase):
+    def setUp(self):
+        token_cache.clear()
+        self.addCleanup(token_cache.clear)
+        self.user = user_cred.objects.create(username="arun", password="x")
+        self.auth = {'HTTP_AUTHORIZATION': f"Bearer {generate_jwt_token(self.user)}"}
+        QuizResult.objects.create(user=self.user, scores={'arts': 3}, answers=[], recommended_stream="arts")
+        College.objects.create(name="Govt Arts College", location="Madurai", college_type="Government")
+
+    def batch(self, requests, **extra):
+        return self.client.post(reverse('batch'), {'requests': requests}, content_type='application/json', **extra)
+
+    def test_page_loads_in_one_round_trip(self):
+        paths = ['/api/accounts/verify-token/', '/api/core/dashboard/', '/api/core/quiz/home/',
+                 '/api/core/quiz/questions/', '/api/core/quiz/results/']
+        with mock.patch('accounts.auth_utils.jwt.decode', wraps=jwt.decode) as decode:
+            response = self.batch([{'id': p, 'path': p} for p in paths], **self.auth)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(decode.call_count, 1)
+        items = response.json()['responses']
+        self.assertEqual([(i['id'], i['status']) for i in items], [(p, 200) for p in paths])
+        for item, path in zip(items, paths):
+            self.assertEqual(item['body'], self.client.get(path, **self.auth).json())
+
+    def test_items_are_not_compressed_inside_the_batch(self):
+        for i in range(40):
+            College.objects.create(name=f"Government College {i}", location="Salem, Tamil Nadu", college_type="Government")
+        paths = ['/api/core/quiz/questions/', '/api/core/colleges/', '/api/core/quiz/results/']
+        response = self.batch([{'path': p} for p in paths], HTTP_ACCEPT_ENCODING='gzip, br', **self.auth)
+        self.assertEqual(response.status_code, 200)
+        coding = response['Content-Encoding']
+        self.assertEqual(coding, negotiate(response.wsgi_request))
+        body = compression.brotli.decompress(response.content) if coding == 'br' else gzip.decompress(response.content)
+        items = json.loads(body)['responses']
+        self.assertEqual([i['status'] for i in items], [200, 200, 200])
+        for item, path in zip(items, paths):
+            self.assertEqual(item['body'], self.client.get(path, **self.auth).json())
+
+    def test_params_and_per_item_status(self):
+        items = self.batch([
+            {'path': '/api/core/colleges/', 'params': {'type': 'government'}},
+            {'path': '/api/core/colleges/?type=private'},
+            {'path': '/api/core/quiz/results/'},
+            {'path': '/api/core/nowhere/'},
+            {'path': '/api/core/quiz/submit/', 'method': 'POST'},
+            {'path': '/api/core/batch/'},
+            {'path': '/admin/'},
+        ]).json()['responses']
+        self.assertEqual([i['id'] for i in items], list(range(7)))
+        self.assertEqual([i['status'] for i in items], [200, 200, 401, 404, 405, 400, 404])
+        self.assertEqual([c['name'] for c in items[0]['body']], ["Govt Arts College"])
+        self.assertEqual(items[1]['body'], [])
+
+    @override_settings(BATCH_MAX_REQUESTS=2)
+    def test_malformed_batches_are_rejected(self):
+        self.assertEqual(self.batch([]).status_code, 400)
+        self.assertEqual(self.batch([{'id': 1}]).status_code, 400)
+        self.assertEqual(self.batch([{'path': '/api/core/quiz/home/'}] * 3).status_code, 400)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CompressionTests(TestCase):
+    def setUp(self):
+        precompressed_cache.clear()
+        self.addCleanup(precompressed_cache.clear)
+        for i in range(40):
+            College.objects.create(name=f"Government Arts College {i}", location="Coimbatore, Tamil Nadu",
+                                   college_type="Government", facilities=["Library", "Hostel", "Sports Complex"])
+
+    def get(self, name, **extra):
+        return self.client.get(reverse(name), HTTP_ACCEPT_ENCODING='gzip, deflate', **extra)
+
+    def test_negotiation(self):
+        request = lambda value: type('R', (), {'META': {'HTTP_ACCEPT_ENCODING': value}})
+        self.assertEqual(negotiate(request('gzip, deflate')), 'gzip')
+        self.assertEqual(negotiate(request('*')), 'gzip')
+        self.assertIsNone(negotiate(request('gzip;q=0, deflate')))
+        self.assertIsNone(negotiate(request('')))
+
+    def test_large_json_is_compressed(self):
+        plain = self.client.get(reverse('colleges-list'))
+        self.assertFalse(plain.has_header('Content-Encoding'))
+        self.assertIn('Accept-Encoding', plain['Vary'])
+        response = self.get('colleges-list')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertLess(len(response.content), len(plain.content) / 5)
+        self.assertEqual(response['ETag'], 'W/' + plain['ETag'])
+        # The weak validator still revalidates
+        self.assertEqual(self.get('colleges-list', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+    def test_small_bodies_are_sent_as_is(self):
+        with override_settings(COMPRESSION_MIN_SIZE=10 ** 6):
+            self.assertFalse(self.get('colleges-list').has_header('Content-Encoding'))
+        self.assertFalse(self.get('college-facets').has_header('Content-Encoding'))
+
+    def test_other_views_are_compressed_per_request(self):
+        user = user_cred.objects.create(username="gokul", password="x")
+        QuizResult.objects.bulk_create(
+            QuizResult(user=user, scores={'arts': i}, answers=[], recommended_stream="arts") for i in range(30)
+        )
+        response = self.get('my-results', HTTP_AUTHORIZATION=f"Bearer {generate_jwt_token(user)}")
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(len(json.loads(gzip.decompress(response.content))), 30)
+
+    async def test_async_views_share_the_precompressed_cache(self):
+        response = await AsyncClient().get(reverse('careers-list'), headers={'Accept-Encoding': 'gzip'})
+        self.assertFalse(response.has_header('Content-Encoding'))  # under the threshold
+        response = await AsyncClient().get(reverse('colleges-list'), headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(len(json.loads(gzip.decompress(response.content))), 40)
+
+    def test_precompressed_bytes_are_reused_per_data_version(self):
+        with mock.patch('core.compression.compress', wraps=compression.compress) as compress:
+            first = self.get('colleges-list')
+            with CaptureQueriesContext(connection) as queries:
+                second = self.get('colleges-list')
+            self.assertEqual(compress.call_count, 1)
+            self.assertEqual(second.content, first.content)
+            self.assertEqual(second['ETag'], first['ETag'])
+            # Only the data version is looked up; the view doesn't run
+            self.assertFalse(any('core_college"' in q['sql'] for q in queries))
+
+            College.objects.create(name="New College", location="Salem", college_type="Government")
+            third = self.get('colleges-list')
+            self.assertEqual(compress.call_count, 2)
+            self.assertEqual(len(json.loads(gzip.decompress(third.content))), 41)
+
+
+class DashboardTests(TestCase):
+    def setUp(self):
+        token_cache.clear()
+        self.addCleanup(token_cache.clear)
+        self.user = user_cred.objects.create(username="kavya", password="x")
+        self.auth = {'HTTP_AUTHORIZATION': f"Bearer {generate_jwt_token(self.user)}"}
+        for stream in ("arts", "commerce", "medical", "arts"):
+            QuizResult.objects.create(user=self.user, scores={}, answers=[], recommended_stream=stream)
+
+    def test_counters_follow_catalogue_changes(self):
+        college = College.objects.create(name="New College", location="Goa")
+        Career.objects.create(title="Actuary", description="")
+        self.assertEqual(CatalogueCounter.totals(), {'colleges': College.objects.count(), 'careers': Career.objects.count()})
+        college.delete()
+        self.assertEqual(CatalogueCounter.totals()['colleges'], College.objects.count())
+
+    def test_dashboard_query_count_is_fixed(self):
+        self.client.get(reverse('user-dashboard'), **self.auth)  # creates the profile, warms auth cache
+        # profile + recent results + counters, however many results exist
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('user-dashboard'), **self.auth)
+        data = response.json()
+        self.assertEqual([r['recommended_stream'] for r in data['recent_results']], ["arts", "medical", "commerce"])
+        self.assertEqual(data['recent_results'][0]['username'], "kavya")
+        self.assertEqual(data['recommendations']['colleges_count'], College.objects.count())
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        response_cache.reset()
+        caches[settings.RESPONSE_CACHE_ALIAS].clear()
+        self.addCleanup(response_cache.reset)
+        Career.objects.create(title="Pilot", description="")
+
+    def get(self, **params):
+        return self.client.get(reverse('careers-list'), params)
+
+    def test_hits_after_first_request_until_data_changes(self):
+        self.assertEqual(self.get(limit=5)['X-Cache'], 'miss')
+        with self.assertNumQueries(1):  # data version only
+            response = self.get(limit=5)
+        self.assertEqual(response['X-Cache'], 'hit-local')
+        self.assertEqual(response.json()['results'][0]['title'], "Pilot")
+
+        response_cache.clear_local()
+        self.assertEqual(self.get(limit=5)['X-Cache'], 'hit-shared')
+        Career.objects.create(title="Sailor", description="")
+        response = self.get(limit=5)
+        self.assertEqual((response['X-Cache'], len(response.json()['results'])), ('miss', 2))
+        self.assertEqual(response_cache.stats()['careers-list'], {'miss': 2, 'hit-local': 1, 'hit-shared': 1})
+
+    def test_query_params_are_normalised(self):
+        self.client.get(reverse('careers-list') + '?limit=5&category=pi')
+        self.assertEqual(self.client.get(reverse('careers-list') + '?category=pi&limit=5')['X-Cache'], 'hit-local')
+        self.assertEqual(self.get(limit=6)['X-Cache'], 'miss')
+
+    def test_errors_are_not_cached(self):
+        self.assertEqual(self.get(cursor='bad').status_code, 400)
+        self.assertEqual(self.get(cursor='bad').status_code, 400)
+        self.assertEqual(response_cache.stats(), {})
+
+    def test_expired_entry_served_stale_while_one_caller_rebuilds(self):
+        cache = TieredCache('default', local_size=8)
+        builds = []
+
+        def build():
+            builds.append(1)
+            return len(builds), True
+
+        with mock.patch('core.response_cache.time.time', return_value=1000.0):
+            self.assertEqual(cache.get_or_build('k', build, ttl=10, stale=5), (1, 'miss'))
+        with mock.patch('core.response_cache.time.time', return_value=1012.0):
+            self.assertTrue(cache._claim('k'))  # someone else is rebuilding
+            self.assertEqual(cache.get_or_build('k', build, ttl=10, stale=5), (1, 'stale'))
+            cache._finish('k')
+            self.assertEqual(cache.get_or_build('k', build, ttl=10, stale=5), (2, 'refresh'))
+        with mock.patch('core.response_cache.time.time', return_value=1100.0):
+            self.assertEqual(cache.get_or_build('k', build, ttl=10, stale=5), (3, 'miss'))
+
+    def test_cold_key_is_built_once(self):
+        cache = TieredCache('default', local_size=8)
+        builds, outcomes = [], []
+
+        def build():
+            builds.append(1)
+            time.sleep(0.1)
+            return 'data', True
+
+        threads = [threading.Thread(target=lambda: outcomes.append(cache.get_or_build('cold', build, 60, 10)[1]))
+                   for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(builds), 1)
+        self.assertEqual(sorted(outcomes), ['miss'] + ['wait'] * 5)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class FastSerializationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        College.objects.create(name="IIT Madras", location="Chennai, Tamil Nadu", website="https://www.iitm.ac.in",
+                               facilities=["Library", "Hostel"], cutoff_marks="")
+        Career.objects.create(title="Data Scientist", description="Builds models", demand=87,
+                              skills_required=["Statistics", "Python"], salary_range="8-30 LPA")
+
+    def test_values_path_matches_model_serializer(self):
+        for model, serializer_class in ((College, CollegeSerializer), (Career, CareerSerializer)):
+            queryset = model.objects.order_by('id')
+            expected = JSONRenderer().render(serializer_class(queryset, many=True).data)
+            fast = serialize_values(queryset, serializer_class)
+            self.assertEqual(JSONRenderer().render(fast), expected)
+            self.assertEqual(FastJSONRenderer().render(fast), expected)
+
+    def test_list_endpoints_use_values_path(self):
+        with self.assertNumQueries(2):  # DataVersion (ETag) + one values() query
+            response = self.client.get(reverse('careers-list'))
+        self.assertEqual(response.json()[0]['skills_required'], ["Statistics", "Python"])
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        question_bank.invalidate()
+        self.addCleanup(question_bank.invalidate)
+        College.objects.create(name="Loyola College", location="Chennai, Tamil Nadu")
+
+    def test_matching_etag_gets_304_without_touching_colleges(self):
+        first = self.client.get(reverse('colleges-list'))
+        self.assertEqual(first.status_code, 200)
+        self.assertIn('max-age=', first['Cache-Control'])
+        self.assertTrue(first.has_header('Last-Modified'))
+        with self.assertNumQueries(1):  # the DataVersion lookup only
+            second = self.client.get(reverse('colleges-list'), HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_catalogue_change_invalidates_etag(self):
+        etag = self.client.get(reverse('government-colleges'))['ETag']
+        College.objects.create(name="Presidency College", location="Chennai, Tamil Nadu")
+        response = self.client.get(reverse('government-colleges'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        # careers are versioned separately
+        careers_etag = self.client.get(reverse('careers-list'))['ETag']
+        College.objects.create(name="Stella Maris", location="Chennai, Tamil Nadu")
+        self.assertEqual(self.client.get(reverse('careers-list'), HTTP_IF_NONE_MATCH=careers_etag).status_code, 304)
+
+    def test_quiz_endpoints_304_with_no_queries(self):
+        etag = self.client.get(reverse('quiz-questions'))['ETag']
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(reverse('quiz-questions'), HTTP_IF_NONE_MATCH=etag).status_code, 304)
+            home = self.client.get(reverse('quiz-home'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(home.status_code, 304)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CollegeFacetTests(TestCase):
+    def setUp(self):
+        self.iit = College.objects.create(name="IIT Madras", location="Chennai, Tamil Nadu", college_type="Engineering",
+                                          facilities=["Hostel", "Labs", "Hostel"])
+        self.mmc = College.objects.create(name="Madras Medical College", location="Chennai, Tamil Nadu",
+                                          college_type="Medical", facilities=["Hospital", "Hostel"])
+        self.coep = College.objects.create(name="COEP", location="Pune, Maharashtra", college_type="Engineering")
+
+    def facets(self):
+        return self.client.get(reverse('college-facets')).json()
+
+    def test_location_is_split(self):
+        self.assertEqual((self.iit.city, self.iit.state), ("Chennai", "Tamil Nadu"))
+        self.assertEqual(College.split_location("Goa"), ("Goa", ""))
+
+    def test_counts_follow_edits(self):
+        self.assertEqual(self.facets(), {
+            'state': {"Tamil Nadu": 2, "Maharashtra": 1},
+            'type': {"Engineering": 2, "Medical": 1},
+            'facility': {"Hostel": 2, "Hospital": 1, "Labs": 1},
+        })
+        self.coep.location = "Chennai, Tamil Nadu"
+        self.coep.facilities = ["Hostel"]
+        self.coep.save()
+        self.mmc.delete()
+        data = self.facets()
+        self.assertEqual(data['state'], {"Tamil Nadu": 2})
+        self.assertEqual(data['type'], {"Engineering": 2})
+        self.assertEqual(data['facility'], {"Hostel": 2, "Labs": 1})
+        # The incremental counts agree with a full recount
+        CollegeFacet.rebuild()
+        self.assertEqual(self.facets(), data)
+
+    def test_filtered_listing(self):
+        names = lambda params: sorted(c['name'] for c in self.client.get(reverse('colleges-list'), params).json())
+        self.assertEqual(names({'state': "tamil nadu"}), ["IIT Madras", "Madras Medical College"])
+        self.assertEqual(names({'state': "Tamil Nadu", 'facility': "hospital"}), ["Madras Medical College"])
+        self.assertEqual(names({'city': "pune", 'type': "engineering"}), ["COEP"])
+        self.assertEqual(names({'search': "madras", 'facility': "labs"}), ["IIT Madras"])
+        page = self.client.get(reverse('colleges-list'), {'facility': "Hostel", 'limit': 1}).json()
+        self.assertEqual(len(page['results']), 1)
+        self.assertEqual(len(self.client.get(page['next']).json()['results']), 1)
+
+    def test_import_rebuilds_facets(self):
+        CatalogueImporter('college').run([
+            {'name': "NIT Trichy", 'location': "Tiruchirappalli, Tamil Nadu", 'college_type': "Engineering",
+             'facilities': "Hostel; Library"},
+        ])
+        self.assertEqual(self.facets()['state']["Tamil Nadu"], 3)
+        self.assertEqual(self.facets()['facility']["Library"], 1)
+        self.assertEqual(list(College.objects.with_facility("library").values_list('name', flat=True)), ["NIT Trichy"])
+
+
+class CatalogueImportTests(TestCase):
+    def test_json_array_is_read_incrementally(self):
+        feed = '[ {"a": "x,]}"},\n {"b": [1, 2]} , {"c": {"d": null}} ]'
+        items = list(iter_json_array(StringIO(feed), chunk_size=4))
+        self.assertEqual(items, [{"a": "x,]}"}, {"b": [1, 2]}, {"c": {"d": None}}])
+        with self.assertRaises(ValueError):
+            list(iter_json_array(StringIO('[{"a": 1}, {"b"'), chunk_size=4))
+
+    def test_upsert_on_natural_key_keeps_index_and_counters_current(self):
+        College.objects.create(name="PSG Tech", location="Coimbatore, Tamil Nadu", fees="old")
+        feed = StringIO(
+            "name,location,college_type,fees,facilities\n"
+            "PSG Tech,\"Coimbatore, Tamil Nadu\",Private,new,Library;Hostel\n"
+            "Kumaraguru College,\"Coimbatore, Tamil Nadu\",Private,,\n"
+            ",Nowhere,,,\n"
+        )
+        importer = CatalogueImporter('college', batch_size=1)
+        importer.run(iter_csv(feed))
+        self.assertEqual((importer.read, importer.written, importer.skipped), (3, 2, 1))
+
+        psg = College.objects.get(name="PSG Tech")
+        self.assertEqual((psg.fees, psg.facilities), ("new", ["Library", "Hostel"]))
+        self.assertEqual(CatalogueCounter.totals()['colleges'], College.objects.count())
+        self.assertEqual([pk for pk, _ in get_search_backend().search("kumaraguru")],
+                         [College.objects.get(name="Kumaraguru College").pk])
+
+    def test_columns_missing_from_the_feed_are_kept(self):
+        College.objects.create(name="PSG Tech", location="Coimbatore, Tamil Nadu", college_type="Private",
+                               fees="old", facilities=["Library"])
+        Career.objects.create(title="Pilot", description="Flies", streams=["engineering"])
+        CatalogueImporter('college').run([{'name': "PSG Tech", 'location': "Coimbatore, Tamil Nadu", 'fees': "new"}])
+        CatalogueImporter('career').run([{'title': "Pilot", 'description': "Flies planes"}, {'title': "Sailor"}])
+
+        psg = College.objects.get(name="PSG Tech")
+        self.assertEqual((psg.fees, psg.college_type, psg.facilities), ("new", "Private", ["Library"]))
+        self.assertEqual(list(College.objects.with_facility("library").values_list('name', flat=True)), ["PSG Tech"])
+        self.assertEqual([pk for pk, _ in get_search_backend().search("psg", college_type="private")], [psg.pk])
+        pilot = Career.objects.get(title="Pilot")
+        self.assertEqual((pilot.description, pilot.streams), ("Flies planes", ["engineering"]))
+        self.assertTrue(Career.objects.filter(title="Sailor").exists())
+
+    def test_batches_committed_before_a_bad_record_are_resynced(self):
+        def feed():
+            yield {'name': "NIT Trichy", 'location': "Tiruchirappalli, Tamil Nadu", 'facilities': "Hostel"}
+            raise ValueError("Unterminated JSON array")
+
+        version = DataVersion.current('colleges')[0]
+        with self.assertRaises(ValueError):
+            CatalogueImporter('college', batch_size=1).run(feed())
+        self.assertEqual(CatalogueCounter.totals()['colleges'], College.objects.count())
+        self.assertEqual(CollegeFacet.counts()['facility'], {"Hostel": 1})
+        self.assertGreater(DataVersion.current('colleges')[0], version)
+
+    def test_career_fixture_style_records(self):
+        records = [{"model": "core.career", "pk": 9, "fields": {"title": "Pilot", "description": "Flies",
+                                                                 "skills_required": ["Physics"]}}]
+        CatalogueImporter('career').run(records)
+        CatalogueImporter('career').run(records)
+        self.assertEqual(Career.objects.filter(title="Pilot").count(), 1)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class QueryPlanTests(TestCase):
+    """EXPLAIN every SELECT a view issues and fail on unbounded full table scans"""
+
+    SCAN_RE = re.compile(r'^SCAN (\w+)')
+
+    @classmethod
+    def setUpTestData(cls):
+        College.objects.bulk_create(
+            College(name=f"College {i}", location="Pune", college_type="Government" if i % 3 else "Private")
+            for i in range(300)
+        )
+        Career.objects.bulk_create(Career(title=f"Role {i}", description="") for i in range(50))
+        cls.user = user_cred.objects.create(username="plan", password="x")
+        QuizResult.objects.bulk_create(
+            QuizResult(user=cls.user, scores={}, answers=[], recommended_stream="arts") for _ in range(20)
+        )
+
+    def setUp(self):
+        token_cache.clear()
+        self.auth = {'HTTP_AUTHORIZATION': f"Bearer {generate_jwt_token(self.user)}"}
+
+    def full_scans(self, sql):
+        tables = set(connection.introspection.table_names())
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            plan = [row[-1] for row in cursor.fetchall()]
+        # A rowid/index-ordered scan under LIMIT stops early; anything else reads the table
+        bounded = ' LIMIT ' in sql and not any('TEMP B-TREE' in step for step in plan)
+        return [
+            step for step in plan
+            if (m := self.SCAN_RE.match(step)) and m.group(1) in tables
+            and 'VIRTUAL TABLE' not in step and not bounded
+        ]
+
+    def assertNoFullScans(self, url, params=None, **extra):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, params or {}, **extra)
+        self.assertEqual(response.status_code, 200, response.content)
+        selects = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('SELECT')]
+        self.assertTrue(selects)
+        for sql in selects:
+            self.assertEqual(self.full_scans(sql), [], sql)
+        return response
+
+    def test_harness_flags_unindexed_filters(self):
+        sql = str(Career.objects.filter(demand=5).query)
+        self.assertTrue(self.full_scans(sql))
+
+    def test_catalogue_filters_use_indexes(self):
+        self.assertNoFullScans(reverse('government-colleges'))
+        self.assertNoFullScans(reverse('colleges-list'), {'type': 'private'})
+        self.assertNoFullScans(reverse('colleges-list'), {'type': 'Government', 'limit': 10})
+        self.assertNoFullScans(reverse('colleges-list'), {'search': 'college 12', 'limit': 10})
+        self.assertNoFullScans(reverse('colleges-list'), {'state': 'maharashtra'})
+        self.assertNoFullScans(reverse('colleges-list'), {'city': 'Pune', 'facility': 'hostel'})
+
+    def test_keyset_pages_seek(self):
+        for name in ('colleges-list', 'careers-list'):
+            page = self.assertNoFullScans(reverse(name), {'limit': 10}).json()
+            self.assertNoFullScans(page['next'])
+
+    def test_user_history_uses_user_created_index(self):
+        page = self.assertNoFullScans(reverse('my-results'), {'limit': 5}, **self.auth).json()
+        self.assertNoFullScans(page['next'], **self.auth)
+        self.assertNoFullScans(reverse('my-results'), **self.auth)
+        self.assertNoFullScans(reverse('user-dashboard'), **self.auth)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class AsyncViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(7):
+            College.objects.create(name=f"College {i}", location="Chennai", college_type="Government" if i % 2 else "Private")
+        Career.objects.create(title="Data Analyst", description="")
+        cls.user = user_cred.objects.create(username="meera", password="x")
+        QuizResult.objects.create(user=cls.user, scores={}, answers=[], recommended_stream="science")
+
+    def setUp(self):
+        token_cache.clear()
+        self.addCleanup(token_cache.clear)
+        self.aclient = AsyncClient()
+        self.auth = {'AUTHORIZATION': f"Bearer {generate_jwt_token(self.user)}"}
+
+    async def test_asgi_requests_resolve_to_async_views(self):
+        response = await self.aclient.get(reverse('colleges-list'))
+        self.assertIs(response.resolver_match.func, async_views.colleges_list)
+        # WSGI (test client) keeps the DRF views
+        response = await sync_to_async(self.client.get)(reverse('colleges-list'))
+        self.assertIsNot(response.resolver_match.func, async_views.colleges_list)
+
+    async def test_read_endpoints_match_sync_views(self):
+        cases = [
+            (reverse('colleges-list'), {}),
+            (reverse('colleges-list'), {'type': 'government', 'limit': 2}),
+            (reverse('colleges-list'), {'search': 'college', 'limit': 3}),
+            (reverse('careers-list'), {'limit': 1}),
+            (reverse('quiz-home'), {}),
+            (reverse('quiz-questions'), {}),
+        ]
+        for url, params in cases:
+            with self.subTest(url=url, params=params):
+                expected = await sync_to_async(self.client.get)(url, params)
+                response = await self.aclient.get(url, params)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json(), expected.json())
+
+    async def test_authenticated_endpoints(self):
+        response = await self.aclient.get(reverse('user-dashboard'))
+        self.assertEqual(response.status_code, 401)
+        response = await self.aclient.get(reverse('user-dashboard'), headers=self.auth)
+        data = response.json()
+        self.assertEqual(data['username'], "meera")
+        self.assertEqual(data['recommendations']['colleges_count'], 7)
+        response = await self.aclient.get(reverse('my-results'), {'limit': 5}, headers=self.auth)
+        self.assertEqual([r['recommended_stream'] for r in response.json()['results']], ["science"])
+
+    async def test_bad_bearer_token_rejected_like_sync_views(self):
+        expired = jwt.encode({'user_id': self.user.id, 'exp': timezone.now() - timedelta(minutes=1)},
+                             settings.JWT_SECRET_KEY, algorithm='HS256')
+        names = ('quiz-home', 'quiz-questions', 'colleges-list', 'careers-list', 'my-results', 'user-dashboard')
+        for token, detail in (('junk', "Invalid token"), (expired, "Token has expired")):
+            for name in names:
+                with self.subTest(name=name, detail=detail):
+                    headers = {'Authorization': f"Bearer {token}"}
+                    expected = await sync_to_async(self.client.get)(reverse(name), headers=headers)
+                    response = await self.aclient.get(reverse(name), headers=headers)
+                    self.assertEqual(response.status_code, 403)
+                    self.assertEqual(response.status_code, expected.status_code)
+                    self.assertEqual(response.json(), {'detail': detail})
+                    self.assertEqual(response.json(), expected.json())
+
+    async def test_validators_and_304_match_sync_views(self):
+        for name in ('quiz-home', 'quiz-questions', 'colleges-list', 'careers-list'):
+            with self.subTest(name=name):
+                expected = await sync_to_async(self.client.get)(reverse(name))
+                response = await self.aclient.get(reverse(name))
+                self.assertEqual(response['ETag'], expected['ETag'])
+                self.assertEqual(response['Last-Modified'], expected['Last-Modified'])
+                self.assertEqual(response['Cache-Control'], 'public, max-age=60, must-revalidate')
+                response = await self.aclient.get(reverse(name), headers={'If-None-Match': response['ETag']})
+                self.assertEqual(response.status_code, 304)
+        version = (await question_bank.aget_snapshot()).version
+        self.assertEqual((await self.aclient.get(reverse('quiz-home')))['ETag'], f'"quiz-{version}"')
+
+    async def test_response_cache_is_shared_with_sync_views(self):
+        response_cache.reset()
+        await caches[settings.RESPONSE_CACHE_ALIAS].aclear()
+        self.addCleanup(response_cache.reset)
+        response = await self.aclient.get(reverse('careers-list'), {'limit': 1})
+        self.assertEqual(response['X-Cache'], 'miss')
+        response = await self.aclient.get(reverse('careers-list'), {'limit': 1})
+        self.assertEqual(response['X-Cache'], 'hit-local')
+        expected = await sync_to_async(self.client.get)(reverse('careers-list'), {'limit': 1})
+        self.assertEqual(expected['X-Cache'], 'hit-local')
+        self.assertEqual(response.json(), expected.json())
+        response = await self.aclient.get(reverse('colleges-list'), {'search': 'college'})
+        self.assertEqual((response['X-Cache'], len(response.json())), ('miss', 7))
+
+    async def test_packed_answers_when_the_snapshot_recheck_is_due(self):
+        def submit_then_republish():
+            question_bank.invalidate()
+            snapshot = question_bank.get_snapshot()
+            ids = snapshot.question_ids
+            QuizResult.objects.create(user=self.user, scores={}, recommended_stream="arts", answers=[],
+                                      packed_answers=answer_packing.pack(ids, {ids[0]: 4, ids[1]: 2}),
+                                      question_set_version=snapshot.version)
+            QuestionSet.publish()  # the result is now from an older version
+            return ids
+
+        ids = await sync_to_async(submit_then_republish)()
+        self.addCleanup(question_bank.invalidate)
+        expected = [{'questionId': ids[0], 'answer': 4, 'category': 'medical'},
+                    {'questionId': ids[1], 'answer': 2, 'category': 'medical'}]
+        cases = [('my-results', {}, None), ('my-results', {'limit': 5}, 'results'), ('user-dashboard', {}, 'recent_results')]
+        for name, params, key in cases:
+            with self.subTest(name=name, params=params):
+                question_bank._checked_at = 0.0  # QUESTION_SET_RECHECK_SECONDS has passed
+                question_bank._published_ids.cache_clear()
+                response = await self.aclient.get(reverse(name), params, headers=self.auth)
+                self.assertEqual(response.status_code, 200)
+                results = response.json()[key] if key else response.json()
+                self.assertEqual(results[0]['answers'], expected)
+
+    async def test_bad_cursor_is_a_client_error(self):
+        response = await self.aclient.get(reverse('careers-list'), {'cursor': 'nope'})
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(REQUEST_TIMING_ENABLED=True, REQUEST_TIMING_N_PLUS_ONE_THRESHOLD=2)
+class RequestTimingMiddlewareTests(TestCase):
+    def setUp(self):
+        token_cache.clear()
+        self.user = user_cred.objects.create(username="timing", password="x")
+        self.auth = {'HTTP_AUTHORIZATION': f"Bearer {generate_jwt_token(self.user)}"}
+
+    def test_server_timing_header_and_log_line(self):
+        College.objects.create(name="Loyola College", location="Chennai")
+        with self.assertLogs('core.request_timing', 'INFO') as logs:
+            response = self.client.get(reverse('colleges-list'))
+        timing = response['Server-Timing']
+        for metric in ('db;dur=', 'serialize;dur=', 'render;dur=', 'total;dur='):
+            self.assertIn(metric, timing)
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual((record['path'], record['status']), ('/api/core/colleges/', 200))
+        self.assertEqual(record['db_queries'], 2)
+
+    @override_settings(ROOT_URLCONF='core.tests')
+    def test_repeated_sql_shape_is_flagged(self):
+        for _ in range(4):
+            QuizResult.objects.create(user=self.user, scores={}, answers=[], recommended_stream="arts")
+        with self.assertLogs('core.request_timing', 'WARNING') as logs:
+            response = self.client.get('/n-plus-one/')
+        self.assertIn('n-plus-one;desc="1 repeated queries"', response['Server-Timing'])
+        flagged = json.loads(logs.records[0].getMessage())['n_plus_one']
+        self.assertEqual(flagged[0]['count'], 4)
+        self.assertIn('accounts_user_cred', flagged[0]['sql'])
+
+
+def _n_plus_one_view(request):
+    names = [r.user.username for r in QuizResult.objects.all()]
+    return HttpResponse(','.join(names))
+
+
+urlpatterns = [path('n-plus-one/', _n_plus_one_view)]
+
+
+@override_settings(REQUEST_TIMING_ENABLED=False)
+class RequestTimingDisabledTests(TestCase):
+    def test_disabled_middleware_is_not_in_the_chain(self):
+        response = self.client.get(reverse('quiz-home'))
+        self.assertFalse(response.has_header('Server-Timing'))
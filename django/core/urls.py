@@ -3,11 +3,15 @@ from . import views
 
 urlpatterns = [
     path('colleges/', views.colleges_list, name='colleges-list'),
+    path('colleges/facets/', views.college_facets, name='college-facets'),
     path('colleges/government/', views.government_colleges, name='government-colleges'),  # ✅ new
     path('careers/', views.careers_list, name='careers-list'),
+    path('careers/recommended/', views.career_recommendations, name='career-recommendations'),
     path('quiz/home/', views.quiz_home, name='quiz-home'),
     path('quiz/questions/', views.quiz_questions, name='quiz-questions'),
     path('quiz/submit/', views.submit_quiz, name='submit-quiz'),
     path('quiz/results/', views.my_results, name='my-results'),
+    path('quiz/analytics/', views.quiz_analytics, name='quiz-analytics'),
     path('dashboard/', views.user_dashboard, name='user-dashboard'),
+    path('batch/', views.batch_requests, name='batch'),
 ]
@@ -0,0 +1,19 @@
+from django.urls import path
+from . import async_views, views
+
+# Same routes and names as core.urls, with the read endpoints served by
+# native async views. Selected for ASGI requests by ASGI_ROOT_URLCONF.
+urlpatterns = [
+    path('colleges/', async_views.colleges_list, name='colleges-list'),
+    path('colleges/facets/', views.college_facets, name='college-facets'),
+    path('colleges/government/', views.government_colleges, name='government-colleges'),
+    path('careers/', async_views.careers_list, name='careers-list'),
+    path('careers/recommended/', views.career_recommendations, name='career-recommendations'),
+    path('quiz/home/', async_views.quiz_home, name='quiz-home'),
+    path('quiz/questions/', async_views.quiz_questions, name='quiz-questions'),
+    path('quiz/submit/', views.submit_quiz, name='submit-quiz'),
+    path('quiz/results/', async_views.my_results, name='my-results'),
+    path('quiz/analytics/', views.quiz_analytics, name='quiz-analytics'),
+    path('dashboard/', async_views.user_dashboard, name='user-dashboard'),
+    path('batch/', views.batch_requests, name='batch'),
+]
@@ -1,16 +1,29 @@
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, renderer_classes
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
-from .models import QuizQuestion, QuizResult, College, Career, UserProfile
-from .serializers import QuizQuestionSerializer, QuizResultSerializer, CollegeSerializer, CareerSerializer
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import F
+from django.http import HttpResponse
+from .models import QuizResult, College, CollegeFacet, Career, UserProfile, CatalogueCounter
+from .serializers import QuizResultSerializer, CollegeSerializer, CareerSerializer, serialize_values
+from .renderers import FastJSONRenderer
+from .compression import precompressed
+from .conditional import versioned
+from .db_routing import replica_reads
+from .response_cache import cached_response
 from accounts.auth_utils import get_user_from_token
-from django.db.models import Q
+from .search import get_search_backend
+from django.utils.dateparse import parse_date
+from . import analytics, answer_packing, batch, question_bank, recommendations
+from .pagination import MAX_PAGE_SIZE, wants_page, page_params, page_response, keyset_page
 
-@api_view(['GET'])
-def quiz_home(request):
-    data = {
+def quiz_home_data(total_questions):
+    return {
         "title": "Career Guidance Quiz",
         "subtitle": "Discover your interests and aptitudes to make informed decisions about your academic future.",
-        "total_questions": QuizQuestion.objects.count(),
+        "total_questions": total_questions,
         "estimated_time": "15-20 minutes",
         "guidelines": [
             "Answer honestly based on your interests",
@@ -24,58 +37,42 @@ def quiz_home(request):
             {"title": "Informed Decisions", "desc": "Make confident academic choices with data-driven insights"},
         ]
     }
+
+
+@versioned('quiz')
+@api_view(['GET'])
+def quiz_home(request):
+    data = quiz_home_data(len(question_bank.get_snapshot().question_ids))
     return Response(data)
+
+
+@replica_reads
+@precompressed('quiz')
+@versioned('quiz')
 @api_view(['GET'])
 def quiz_questions(request):
-    """Get all quiz questions or create default ones if none exist"""
-    questions = QuizQuestion.objects.all()
-    
-    # If no questions exist, create default ones
-    if not questions.exists():
-        default_questions = [
-            # Medical
-            {"question": "I enjoy understanding how living organisms function and interact with their environment.", "category": "medical", "subject": "Biology"},
-            {"question": "I am curious about the human body, diseases, and medical treatments.", "category": "medical", "subject": "Medical Science"},
-            {"question": "I find it interesting to study anatomy, physiology, and how medications work.", "category": "medical", "subject": "Health Sciences"},
-            {"question": "I am passionate about helping people recover from illnesses and maintaining good health.", "category": "medical", "subject": "Healthcare"},
-            {"question": "I enjoy studying genetics, microbiology, and biochemical processes.", "category": "medical", "subject": "Life Sciences"},
-
-            # Engineering
-            {"question": "I am interested in understanding the laws of motion, energy, and matter.", "category": "engineering", "subject": "Physics"},
-            {"question": "I enjoy solving mathematical problems and working with numbers and formulas.", "category": "engineering", "subject": "Mathematics"},
-            {"question": "I find it fascinating to conduct experiments and observe chemical reactions.", "category": "engineering", "subject": "Chemistry"},
-            {"question": "I am interested in building and designing mechanical systems or structures.", "category": "engineering", "subject": "Engineering Design"},
-            {"question": "I enjoy understanding how machines work and solving technical problems.", "category": "engineering", "subject": "Applied Sciences"},
-
-            # Technology
-            {"question": "I enjoy working with computers and learning about new software applications.", "category": "technology", "subject": "Computer Science"},
-            {"question": "I like creating websites, mobile apps, or digital solutions to problems.", "category": "technology", "subject": "Information Technology"},
-            {"question": "I am fascinated by robotics, artificial intelligence, and automation.", "category": "technology", "subject": "Advanced Technology"},
-            {"question": "I enjoy analyzing data and finding patterns in large datasets.", "category": "technology", "subject": "Data Science"},
-            {"question": "I am interested in cybersecurity, networks, and protecting digital information.", "category": "technology", "subject": "Information Security"},
-
-            # Arts
-            {"question": "I enjoy reading literature, writing stories, or analyzing texts.", "category": "arts", "subject": "Literature/Language"},
-            {"question": "I am interested in understanding different cultures, societies, and human behavior.", "category": "arts", "subject": "Social Studies"},
-            {"question": "I enjoy learning about historical events and their impact on the present.", "category": "arts", "subject": "History"},
-            {"question": "I am interested in geography, maps, and understanding different places.", "category": "arts", "subject": "Geography"},
-            {"question": "I enjoy creative activities like drawing, painting, music, or performing arts.", "category": "arts", "subject": "Creative Arts"},
-
-            # Commerce
-            {"question": "I am interested in understanding how businesses operate and make decisions.", "category": "commerce", "subject": "Business Studies"},
-            {"question": "I enjoy working with financial data, budgets, and accounting principles.", "category": "commerce", "subject": "Accounting"},
-            {"question": "I am interested in economic trends, market behavior, and financial systems.", "category": "commerce", "subject": "Economics"},
-            {"question": "I enjoy planning events, managing teams, and organizing projects.", "category": "commerce", "subject": "Management"},
-            {"question": "I am interested in marketing, sales, and understanding consumer behavior.", "category": "commerce", "subject": "Marketing"},
-        ]
-        
-        for q_data in default_questions:
-            QuizQuestion.objects.create(**q_data)
-        
-        questions = QuizQuestion.objects.all()
-    
-    serializer = QuizQuestionSerializer(questions, many=True)
-    return Response(serializer.data)
+    """Get the published quiz questions (pre-rendered once per question set version)"""
+    snapshot = question_bank.get_snapshot()
+    return HttpResponse(snapshot.payload, content_type='application/json')
+
+
+def record_submission(user, result):
+    """
+    Save ``result``, its rollup and the user's profile in one transaction.
+
+    The quiz counter is incremented in SQL (``F()``) so overlapping submits
+    can't overwrite each other's count.
+    """
+    stream = result.recommended_stream
+    with transaction.atomic():
+        result.save(force_insert=True)
+        analytics.record(result)
+        UserProfile.objects.update_or_create(
+            user=user,
+            defaults={'completed_quizzes': F('completed_quizzes') + 1, 'preferred_stream': stream},
+            create_defaults={'completed_quizzes': 1, 'preferred_stream': stream},
+        )
+    return result
 
 
 @api_view(['POST'])
@@ -89,85 +86,202 @@ def submit_quiz(request):
     
     if not answers:
         return Response({'detail': 'No answers provided'}, status=400)
+    if not isinstance(answers, list):
+        return Response({'detail': 'answers must be a list of {questionId, answer}'}, status=400)
     
-    # Calculate scores
-    totals = {"engineering": 0, "medical": 0, "arts": 0, "commerce": 0, "technology": 0}
-    for answer in answers:
-        category = answer.get("category", "").lower()
-        value = int(answer.get("answer", 0))
-        if category in totals:
-            totals[category] += value
+    # Calculate scores from the question table's weights, keyed by question id
+    snapshot = question_bank.get_snapshot()
+    engine = snapshot.engine
+    if not engine.question_ids:
+        return Response({'detail': 'No quiz questions published'}, status=400)
+    try:
+        vector = engine.vectorize(answers)
+    except (TypeError, ValueError, AttributeError):
+        return Response({'detail': 'Invalid answers'}, status=400)
+    # Answers are 1-5, so an all-zero vector means nothing matched a published question
+    if not vector.any():
+        return Response({'detail': 'No answers match the published questions'}, status=400)
+    totals = engine.as_dict(engine.score_matrix(vector))
 
     # Find recommended stream
-    recommended_stream = max(totals, key=totals.get)
+    recommended_stream = engine.recommend(totals)
     
-    # Save result
-    result = QuizResult.objects.create(
+    # Save result (packed against the published question set when possible)
+    packed = answer_packing.pack(snapshot.question_ids, answers) if snapshot.version else None
+    result = record_submission(user, QuizResult(
         user=user,
         scores=totals,
-        answers=answers,
+        answers=[] if packed is not None else answers,
+        packed_answers=packed,
+        question_set_version=snapshot.version if packed is not None else None,
         recommended_stream=recommended_stream
-    )
-    
-    # Update user profile
-    profile, created = UserProfile.objects.get_or_create(user=user)
-    profile.completed_quizzes += 1
-    profile.preferred_stream = recommended_stream
-    profile.save()
+    ))
     
     serializer = QuizResultSerializer(result)
     return Response(serializer.data, status=201)
 
+@replica_reads
 @api_view(['GET'])
 def my_results(request):
     user = get_user_from_token(request)
     if not user:
         return Response({'detail': 'Authentication required'}, status=401)
         
-    results = QuizResult.objects.filter(user=user).order_by('-created_at')
+    results = QuizResult.objects.filter(user=user).select_related('user').order_by('-created_at')
+    if wants_page(request):
+        return keyset_page(request, results, ('-created_at', '-id'), QuizResultSerializer)
     serializer = QuizResultSerializer(results, many=True)
     return Response(serializer.data)
 
+@replica_reads
+@precompressed('colleges')
+@versioned('colleges')
 @api_view(['GET'])
+@renderer_classes([FastJSONRenderer, BrowsableAPIRenderer])
 def colleges_list(request):
     """Get colleges with optional filtering"""
-    colleges = College.objects.all()
-    
-    # Filter by type if provided
     college_type = request.GET.get('type')
-    if college_type:
-        colleges = colleges.filter(college_type__icontains=college_type)
-    
-    # Search by name or location
+
+    # Search by name or location (ranked, served from the search index)
     search = request.GET.get('search')
     if search:
-        colleges = colleges.filter(
-            Q(name__icontains=search) | Q(location__icontains=search)
-        )
-    
-    serializer = CollegeSerializer(colleges, many=True)
-    return Response(serializer.data)
+        return cached_response(request, 'colleges-search', ('colleges',),
+                               lambda: _search_colleges(request, search, college_type))
+
+    colleges = filter_facets(request, College.objects.all())
+
+    # Filter by type if provided
+    if college_type:
+        colleges = colleges.of_type(college_type)
+
+    if wants_page(request):
+        return keyset_page(request, colleges, ('id',), CollegeSerializer, fast=True)
+    return Response(serialize_values(colleges, CollegeSerializer))
+
+
+def filter_facets(request, colleges):
+    """Apply the state/city/facility facet filters from the query string"""
+    if request.GET.get('state'):
+        colleges = colleges.in_state(request.GET['state'])
+    if request.GET.get('city'):
+        colleges = colleges.in_city(request.GET['city'])
+    if request.GET.get('facility'):
+        colleges = colleges.with_facility(request.GET['facility'])
+    return colleges
+
 
+def search_params(request):
+    """
+    ``(paged, limit, after)`` for a college search.
+
+    Unpaged searches (no `limit` or `cursor`) still return a bare list, cut
+    at the best ``COLLEGE_SEARCH_MAX_RESULTS`` hits.
+    """
+    if wants_page(request):
+        limit, after = page_params(request, 2)
+        return True, limit, after
+    return False, getattr(settings, 'COLLEGE_SEARCH_MAX_RESULTS', MAX_PAGE_SIZE), None
+
+
+def hit_chunks(hits):
+    """Ids of ``hits`` in lists small enough to bind in one ``id IN (...)`` query"""
+    limit = connections[router.db_for_read(College)].features.max_query_params
+    # Leave room for the state/city/facility filter parameters
+    size = max(limit - 10, 1) if limit else len(hits) or 1
+    ids = [pk for pk, _ in hits]
+    return [ids[start:start + size] for start in range(0, len(ids), size)]
+
+
+def _search_colleges(request, search, college_type):
+    """Ranked search; paginated when `limit` or `cursor` is given"""
+    paged, limit, after = search_params(request)
+
+    hits = get_search_backend().search(
+        search, college_type=college_type, limit=limit + 1 if paged else limit, after=after
+    )
+    next_position = None
+    if paged and len(hits) > limit:
+        hits = hits[:limit]
+        next_position = list(hits[-1])
+
+    # Facet filters drop hits after ranking, so a filtered page can come up short
+    by_id = {}
+    for ids in hit_chunks(hits):
+        colleges = filter_facets(request, College.objects.filter(id__in=ids))
+        by_id.update((row['id'], row) for row in serialize_values(colleges, CollegeSerializer))
+    data = [by_id[pk] for pk, _ in hits if pk in by_id]
+    if not paged:
+        return Response(data)
+    return page_response(request, data, next_position)
+
+
+@versioned('colleges')
 @api_view(['GET'])
+def college_facets(request):
+    """College counts per state, type and facility, from the facet index"""
+    return Response(CollegeFacet.counts())
+
+
+@replica_reads
+@precompressed('colleges')
+@versioned('colleges')
+@api_view(['GET'])
+@renderer_classes([FastJSONRenderer, BrowsableAPIRenderer])
 def government_colleges(request):
     """Get all government colleges"""
-    colleges = College.objects.filter(college_type__iexact="Government")
-    serializer = CollegeSerializer(colleges, many=True)
-    return Response(serializer.data)
+    colleges = College.objects.of_type("Government")
+    if wants_page(request):
+        return keyset_page(request, colleges, ('id',), CollegeSerializer, fast=True)
+    return Response(serialize_values(colleges, CollegeSerializer))
 
 
+@replica_reads
+@precompressed('careers')
+@versioned('careers')
 @api_view(['GET'])
+@renderer_classes([FastJSONRenderer, BrowsableAPIRenderer])
 def careers_list(request):
     """Get career information"""
+    return cached_response(request, 'careers-list', ('careers',), lambda: _careers(request))
+
+
+def _careers(request):
     careers = Career.objects.all()
     
     # Filter by stream/category if provided
     category = request.GET.get('category')
     if category:
         careers = careers.filter(title__icontains=category)
-    
-    serializer = CareerSerializer(careers, many=True)
-    return Response(serializer.data)
+
+    if wants_page(request):
+        return keyset_page(request, careers, ('id',), CareerSerializer, fast=True)
+    return Response(serialize_values(careers, CareerSerializer))
+
+@api_view(['GET'])
+@renderer_classes([FastJSONRenderer, BrowsableAPIRenderer])
+def career_recommendations(request):
+    """Top careers for the user's latest quiz scores, best match first"""
+    user = get_user_from_token(request)
+    if not user:
+        return Response({'detail': 'Authentication required'}, status=401)
+
+    latest = QuizResult.objects.filter(user=user).order_by('-created_at', '-id').only('id', 'scores').first()
+    if latest is None:
+        return Response({'detail': 'Take the quiz to get recommendations'}, status=404)
+    try:
+        limit = min(int(request.GET.get('limit', 10)), MAX_PAGE_SIZE)
+    except ValueError:
+        limit = 0
+    if limit < 1:
+        raise ParseError("'limit' must be a positive integer")
+
+    hits = recommendations.get_index().top(latest.scores, limit)
+    rows = serialize_values(Career.objects.filter(id__in=[pk for pk, _ in hits]), CareerSerializer)
+    by_id = {row['id']: row for row in rows}
+    return Response({
+        'quiz_result': latest.id,
+        'results': [{**by_id[pk], 'match': match} for pk, match in hits if pk in by_id],
+    })
 
 @api_view(['GET'])
 def user_dashboard(request):
@@ -176,8 +290,17 @@ def user_dashboard(request):
     if not user:
         return Response({'detail': 'Authentication required'}, status=401)
     
-    profile, created = UserProfile.objects.get_or_create(user=user)
-    recent_results = QuizResult.objects.filter(user=user).order_by('-created_at')[:3]
+    profile, created = UserProfile.objects.only(
+        'preferred_stream', 'completed_quizzes', 'interests'
+    ).get_or_create(user=user)
+    recent_results = (
+        QuizResult.objects.filter(user=user)
+        .select_related('user')
+        .only('id', 'scores', 'answers', 'packed_answers', 'question_set_version', 'recommended_stream',
+              'created_at', 'user__username')
+        .order_by('-created_at')[:3]
+    )
+    totals = CatalogueCounter.totals()
     
     data = {
         'username': user.username,
@@ -188,9 +311,43 @@ def user_dashboard(request):
         },
         'recent_results': QuizResultSerializer(recent_results, many=True).data,
         'recommendations': {
-            'colleges_count': College.objects.count(),
-            'careers_count': Career.objects.count(),
+            'colleges_count': totals['colleges'],
+            'careers_count': totals['careers'],
         }
     }
     
     return Response(data)
+
+
+
+def _query_date(request, name):
+    value = request.GET.get(name)
+    if not value:
+        return None
+    try:
+        day = parse_date(value)
+    except ValueError:
+        day = None
+    if day is None:
+        raise ParseError(f"'{name}' must be a YYYY-MM-DD date")
+    return day
+
+
+@api_view(['GET'])
+def quiz_analytics(request):
+    """Results per day x recommended stream and mean category scores, from the rollups"""
+    # Platform-wide figures: staff only (Django admin session), like the admin exports
+    if not getattr(request.user, 'is_staff', False):
+        return Response({'detail': 'Staff access required'}, status=403)
+    start, end = _query_date(request, 'from'), _query_date(request, 'to')
+    return Response(analytics.report(start, end, request.GET.get('stream')))
+
+
+@api_view(['POST'])
+def batch_requests(request):
+    """Run several GET API requests in-process and return every result in one response"""
+    try:
+        items = batch.parse(request.data)
+    except batch.BatchError as exc:
+        return Response({'detail': str(exc)}, status=400)
+    return HttpResponse(batch.execute(request, items), content_type='application/json')
@@ -99,3 +99,19 @@ export const dashboardAPI = {
     return handleResponse(response);
   },
 };
+
+// Several GET calls in one round trip: requests = [{ id, path, params }],
+// paths as above (e.g. '/core/dashboard/'). Resolves to { [id]: { status, body } }.
+export const batchAPI = {
+  load: async (requests) => {
+    const response = await fetch(`${API_BASE_URL}/core/batch/`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json', ...getAuthHeaders() },
+      body: JSON.stringify({
+        requests: requests.map(({ path, ...rest }) => ({ ...rest, path: `/api${path}` })),
+      }),
+    });
+    const data = await handleResponse(response);
+    return Object.fromEntries(data.responses.map(({ id, status, body }) => [id, { status, body }]));
+  },
+};